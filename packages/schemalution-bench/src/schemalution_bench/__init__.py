@@ -0,0 +1,35 @@
+"""Public API for schemalution-bench."""
+
+from __future__ import annotations
+
+from .cli import main
+from .runner import (
+    REPORT_FORMAT,
+    BenchResult,
+    Comparison,
+    build_report,
+    compare_reports,
+    load_report,
+    run_case,
+    run_cases,
+    write_report,
+)
+from .suites import BenchCase, build_cases
+
+__all__ = [
+    "REPORT_FORMAT",
+    "BenchCase",
+    "BenchResult",
+    "Comparison",
+    "build_cases",
+    "build_report",
+    "compare_reports",
+    "load_report",
+    "main",
+    "run_case",
+    "run_cases",
+    "write_report",
+    "__version__",
+]
+
+__version__ = "0.0.1"
@@ -0,0 +1,77 @@
+"""Command-line entrypoint: run benchmarks or compare a report with a baseline."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from .runner import (
+    build_report,
+    compare_reports,
+    format_comparisons,
+    load_report,
+    run_cases,
+    write_report,
+)
+from .suites import build_cases
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.command == "run":
+        return _handle_run(args)
+    return _handle_compare(args)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="schemalution-bench")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Run benchmarks and write a JSON report.")
+    run.add_argument("--out", help="Write the report to this file (default: stdout).")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--records", type=int, default=200, help="Records per case.")
+    run.add_argument("--filter", help="Only run cases whose name matches this regex.")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--min-time", type=float, default=0.2, help="Seconds per repeat.")
+    run.add_argument("--baseline", help="Compare against this report after running.")
+    run.add_argument("--threshold", type=float, default=0.1)
+
+    compare = subparsers.add_parser("compare", help="Compare a report with a baseline.")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.1, help="Allowed slowdown.")
+    return parser
+
+
+def _handle_run(args: argparse.Namespace) -> int:
+    cases = build_cases(args.seed, records=args.records)
+    results = run_cases(cases, pattern=args.filter, repeat=args.repeat, min_time=args.min_time)
+    report = build_report(results, seed=args.seed, records=args.records)
+    if args.out:
+        write_report(report, args.out)
+    else:
+        sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    if args.baseline:
+        return _report_comparison(load_report(args.baseline), report, args.threshold)
+    return 0
+
+
+def _handle_compare(args: argparse.Namespace) -> int:
+    return _report_comparison(load_report(args.baseline), load_report(args.current), args.threshold)
+
+
+def _report_comparison(
+    baseline: Mapping[str, Any], current: Mapping[str, Any], threshold: float
+) -> int:
+    comparisons = compare_reports(baseline, current, threshold=threshold)
+    # Keep stdout for the JSON report; the table is for humans.
+    sys.stderr.write(format_comparisons(comparisons) + "\n")
+    return 1 if any(item.regressed for item in comparisons) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""Seeded synthetic records and fragments for benchmarks."""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+NESTED_DEPTH = 6
+NESTED_PREFIX = ".".join(f"n{level}" for level in range(NESTED_DEPTH))
+
+
+def _word(rng: random.Random, size: int = 8) -> str:
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(size))
+
+
+def crm_record(rng: random.Random, version: int) -> dict[str, Any]:
+    """Return an example CRM customer record at version 1, 2, or 3."""
+    customer_id = f"c-{rng.randrange(10**9):09d}"
+    name = f"{_word(rng).title()} {_word(rng).title()}"
+    email = f"{_word(rng)}@example.com"
+    age = rng.randrange(18, 90)
+    if version == 1:
+        return {
+            "schema_version": 1,
+            "customerId": customer_id,
+            "name": name,
+            "email": email,
+            "age": str(age),
+        }
+    if version == 2:
+        return {
+            "schema_version": 2,
+            "customer_id": customer_id,
+            "name": name,
+            "contact": {"email": email},
+            "age": age,
+        }
+    if version == 3:
+        return {
+            "schema_version": 3,
+            "customer_id": customer_id,
+            "full_name": name,
+            "contact": {"primary": {"email": email, "verified": rng.random() < 0.5}},
+            "age": age,
+        }
+    raise ValueError(f"unsupported example CRM version {version}.")
+
+
+def _leaf(rng: random.Random, width: int) -> dict[str, Any]:
+    leaf: dict[str, Any] = {f"f{index}": _word(rng) for index in range(width)}
+    leaf["src"] = _word(rng)
+    leaf["num"] = str(rng.randrange(10**6))
+    return leaf
+
+
+def flat_record(rng: random.Random, width: int = 16) -> dict[str, Any]:
+    """Return a single-level record with src/num fields and width filler fields."""
+    return {"schema_version": 1, **_leaf(rng, width)}
+
+
+def nested_record(rng: random.Random, width: int = 16, depth: int = NESTED_DEPTH) -> dict[str, Any]:
+    """Return a record whose src/num fields sit depth levels down (n0.n1...), with siblings."""
+    node = _leaf(rng, width)
+    for level in reversed(range(depth)):
+        siblings: dict[str, Any] = {f"s{index}": _word(rng) for index in range(4)}
+        node = {**siblings, f"n{level}": node}
+    return {"schema_version": 1, **node}
+
+
+def payload(rng: random.Random, index: int, width: int = 8) -> dict[str, Any]:
+    """Return a nested fragment payload that overlaps with its neighbours' keys."""
+    shared = {f"k{key}": _word(rng) for key in rng.sample(range(width * 2), width)}
+    return {
+        "profile": {"name": _word(rng), "tags": [_word(rng) for _ in range(3)], **shared},
+        "settings": {"theme": rng.choice(["light", "dark"]), "level": index},
+        f"part{index}": {"value": rng.random()},
+    }
+
+
+def keyed_items(rng: random.Random, count: int, key: str = "id") -> list[dict[str, Any]]:
+    """Return count dicts keyed by key; ids are a shuffled range so patches hit and miss."""
+    ids = list(range(count * 2))
+    rng.shuffle(ids)
+    return [{key: item_id, "value": _word(rng), "meta": {"n": item_id}} for item_id in ids[:count]]
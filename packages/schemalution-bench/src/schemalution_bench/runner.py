@@ -0,0 +1,161 @@
+"""Run benchmark cases, write JSON reports, and compare them against a baseline."""
+
+from __future__ import annotations
+
+import json
+import platform
+import re
+import statistics
+import sys
+import timeit
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .suites import BenchCase
+
+REPORT_FORMAT = "schemalution-bench/v1"
+
+
+@dataclass(frozen=True, slots=True)
+class BenchResult:
+    name: str
+    group: str
+    items: int
+    number: int
+    repeat: int
+    best_seconds: float
+    median_seconds: float
+
+    @property
+    def per_item_seconds(self) -> float:
+        return self.best_seconds / self.items if self.items else self.best_seconds
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    name: str
+    baseline_seconds: float | None
+    current_seconds: float | None
+    regressed: bool
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.baseline_seconds or self.current_seconds is None:
+            return None
+        return self.current_seconds / self.baseline_seconds
+
+
+def run_case(case: BenchCase, *, repeat: int = 5, min_time: float = 0.2) -> BenchResult:
+    """Time case.fn, calibrating loops so one repeat takes at least min_time seconds.
+
+    best_seconds is the fastest per-call time over repeat runs; it is the least noisy
+    estimate and the figure compare_reports uses.
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be positive.")
+    timer = timeit.Timer(case.fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    timings = [timer.timeit(number) / number for _ in range(repeat)]
+    return BenchResult(
+        name=case.name,
+        group=case.group,
+        items=case.items,
+        number=number,
+        repeat=repeat,
+        best_seconds=min(timings),
+        median_seconds=statistics.median(timings),
+    )
+
+
+def run_cases(
+    cases: Iterable[BenchCase],
+    *,
+    pattern: str | None = None,
+    repeat: int = 5,
+    min_time: float = 0.2,
+) -> list[BenchResult]:
+    """Run cases whose name matches the regular expression pattern (all when None)."""
+    selector = re.compile(pattern) if pattern is not None else None
+    return [
+        run_case(case, repeat=repeat, min_time=min_time)
+        for case in cases
+        if selector is None or selector.search(case.name)
+    ]
+
+
+def build_report(results: Iterable[BenchResult], *, seed: int, records: int) -> dict[str, Any]:
+    return {
+        "format": REPORT_FORMAT,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "records": records,
+        "results": {
+            result.name: {**asdict(result), "per_item_seconds": result.per_item_seconds}
+            for result in results
+        },
+    }
+
+
+def write_report(report: Mapping[str, Any], path: str | Path) -> None:
+    Path(path).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+def load_report(path: str | Path) -> dict[str, Any]:
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(report, dict) or report.get("format") != REPORT_FORMAT:
+        raise ValueError(f"{path} is not a {REPORT_FORMAT} report.")
+    return report
+
+
+def compare_reports(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    *,
+    threshold: float = 0.1,
+) -> list[Comparison]:
+    """Compare best_seconds per case; a case regresses when current > baseline * (1 + threshold).
+
+    Cases present in only one report are listed with the missing side as None and never
+    count as regressions. Raises ValueError when the reports were built from a different
+    seed or record count, since their timings then measure different inputs.
+    """
+    if threshold < 0:
+        raise ValueError("threshold must be >= 0.")
+    for key in ("seed", "records"):
+        if baseline.get(key) != current.get(key):
+            raise ValueError(
+                f"reports differ in {key} ({baseline.get(key)!r} vs {current.get(key)!r}); "
+                "rerun both with the same inputs."
+            )
+    base_results: Mapping[str, Any] = baseline["results"]
+    current_results: Mapping[str, Any] = current["results"]
+    comparisons = []
+    names = [*current_results, *(name for name in base_results if name not in current_results)]
+    for name in names:
+        before = base_results.get(name, {}).get("best_seconds")
+        after = current_results.get(name, {}).get("best_seconds")
+        regressed = before is not None and after is not None and after > before * (1 + threshold)
+        comparisons.append(Comparison(name, before, after, regressed))
+    return comparisons
+
+
+def format_comparisons(comparisons: Iterable[Comparison]) -> str:
+    lines = [f"{'case':<40} {'baseline':>12} {'current':>12} {'ratio':>8}"]
+    for item in comparisons:
+        before = "-" if item.baseline_seconds is None else f"{item.baseline_seconds * 1e3:.3f}ms"
+        after = "-" if item.current_seconds is None else f"{item.current_seconds * 1e3:.3f}ms"
+        ratio = "-" if item.ratio is None else f"{item.ratio:.2f}x"
+        flag = "  REGRESSION" if item.regressed else ""
+        lines.append(f"{item.name:<40} {before:>12} {after:>12} {ratio:>8}{flag}")
+    return "\n".join(lines)
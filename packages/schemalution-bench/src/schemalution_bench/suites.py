@@ -0,0 +1,219 @@
+"""Benchmark cases: pack upcasts, single ops, compiled pipelines, and composition."""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import reduce
+from typing import Any
+
+from schemalution_compose import Fragment, compose_root, deep_merge, merge_arrays_by_key
+from schemalution_core import (
+    MigrationRegistry,
+    RecordBatch,
+    compile_ops,
+    upcast_batch,
+    upcast_many,
+    upcast_to_latest,
+)
+from schemalution_core.ops import Cast, Coalesce, Drop, Move, Op, Rename, SetDefault
+from schemalution_pack_example_crm import SCHEMA_ID, register
+
+from .data import NESTED_PREFIX, crm_record, flat_record, keyed_items, nested_record, payload
+
+PIPELINE_LENGTHS: tuple[int, ...] = (1, 4, 16, 64)
+FRAGMENT_COUNTS: tuple[int, ...] = (2, 8, 32, 128)
+ARRAY_SIZES: tuple[int, ...] = (10, 100, 1000)
+COLUMNAR_LENGTHS: tuple[int, ...] = (4, 16)
+
+
+@dataclass(frozen=True, slots=True)
+class BenchCase:
+    """A named zero-argument callable that processes items records (or fragments) per call."""
+
+    name: str
+    group: str
+    fn: Callable[[], Any]
+    items: int
+
+
+def _each(
+    fn: Callable[[dict[str, Any]], Any], records: Sequence[dict[str, Any]]
+) -> Callable[[], Any]:
+    def run() -> None:
+        for record in records:
+            fn(record)
+
+    return run
+
+
+def upcast_cases(rng: random.Random, records: int) -> list[BenchCase]:
+    registry = MigrationRegistry()
+    register(registry)
+    cases = []
+    batches = {version: [crm_record(rng, version) for _ in range(records)] for version in (1, 2, 3)}
+    for version, batch in batches.items():
+        cases.append(
+            BenchCase(
+                name=f"upcast_to_latest/crm/v{version}",
+                group="upcast",
+                fn=_each(lambda record: upcast_to_latest(record, SCHEMA_ID, registry), batch),
+                items=records,
+            )
+        )
+    # Typical read path: a handful of latest-shape fields from a v1 record.
+    fields = ("customer_id", "contact.primary.email")
+    cases.append(
+        BenchCase(
+            name="upcast_to_latest/crm/v1/fields",
+            group="upcast",
+            fn=_each(
+                lambda record: upcast_to_latest(record, SCHEMA_ID, registry, fields=fields),
+                batches[1],
+            ),
+            items=records,
+        )
+    )
+    return cases
+
+
+def _single_ops(prefix: str) -> dict[str, Op]:
+    return {
+        "Rename": Rename(f"{prefix}src", f"{prefix}dst"),
+        "SetDefault": SetDefault(f"{prefix}missing", 0),
+        "Drop": Drop(f"{prefix}src"),
+        "Move": Move(f"{prefix}src", f"{prefix}moved.value"),
+        "Coalesce": Coalesce(f"{prefix}dst", [f"{prefix}absent", f"{prefix}src"]),
+        "Cast": Cast(f"{prefix}num", int),
+    }
+
+
+def op_cases(rng: random.Random, records: int) -> list[BenchCase]:
+    shapes = {
+        "flat": ("", [flat_record(rng) for _ in range(records)]),
+        "nested": (f"{NESTED_PREFIX}.", [nested_record(rng) for _ in range(records)]),
+    }
+    cases = []
+    for shape, (prefix, batch) in shapes.items():
+        for op_name, op in _single_ops(prefix).items():
+            cases.append(
+                BenchCase(
+                    name=f"ops/{op_name}/{shape}",
+                    group="ops",
+                    fn=_each(op.apply, batch),
+                    items=records,
+                )
+            )
+    return cases
+
+
+def _pipeline(length: int) -> list[Op]:
+    # Cycle through every op kind over distinct fields so each op does real work.
+    makers: tuple[Callable[[int], Op], ...] = (
+        lambda i: Rename(f"f{i}", f"r{i}"),
+        lambda i: SetDefault(f"d{i}", i),
+        lambda i: Move(f"r{i - 2}", f"m.r{i - 2}"),
+        lambda i: Coalesce(f"c{i}", [f"absent{i}", f"f{i}"]),
+        lambda i: Cast("num", int),
+        lambda i: Drop(f"f{i}"),
+    )
+    return [makers[index % len(makers)](index) for index in range(length)]
+
+
+def pipeline_cases(rng: random.Random, records: int) -> list[BenchCase]:
+    width = max(PIPELINE_LENGTHS)
+    batch = [flat_record(rng, width=width) for _ in range(records)]
+    cases = []
+    for backend in ("interpreted", "codegen"):
+        for length in PIPELINE_LENGTHS:
+            compiled = compile_ops(_pipeline(length), backend=backend)
+            cases.append(
+                BenchCase(
+                    name=f"compile_ops/{backend}/{length}",
+                    group="compile_ops",
+                    fn=_each(compiled, batch),
+                    items=records,
+                )
+            )
+    return cases
+
+
+def columnar_cases(rng: random.Random, records: int) -> list[BenchCase]:
+    """Row (upcast_many) against columnar (RecordBatch round trip) upcasts of one batch."""
+    width = max(COLUMNAR_LENGTHS)
+    batch = [flat_record(rng, width=width) for _ in range(records)]
+    cases = []
+    for length in COLUMNAR_LENGTHS:
+        registry = MigrationRegistry()
+        registry.register_migration("bench.flat", 1, 2, compile_ops(_pipeline(length)))
+        registry.set_latest_version("bench.flat", 2)
+        cases.append(
+            BenchCase(
+                name=f"columnar/upcast_many/{length}",
+                group="columnar",
+                fn=lambda registry=registry: upcast_many(batch, "bench.flat", registry),
+                items=records,
+            )
+        )
+        cases.append(
+            BenchCase(
+                name=f"columnar/upcast_batch/{length}",
+                group="columnar",
+                fn=lambda registry=registry: upcast_batch(
+                    RecordBatch.from_records(batch), "bench.flat", registry
+                ).to_records(),
+                items=records,
+            )
+        )
+    return cases
+
+
+def compose_cases(rng: random.Random) -> list[BenchCase]:
+    cases = []
+    for count in FRAGMENT_COUNTS:
+        payloads = [payload(rng, index) for index in range(count)]
+        fragments = [
+            # Every fourth fragment repeats a schema_id, exercising choose_newer.
+            Fragment(schema_id=f"frag.{index - 3 if index % 4 == 3 else index}", payload=p)
+            for index, p in enumerate(payloads)
+        ]
+        cases.append(
+            BenchCase(
+                name=f"compose_root/{count}",
+                group="compose",
+                fn=lambda fragments=fragments: compose_root(fragments, root_schema_id="bench.root"),
+                items=count,
+            )
+        )
+        cases.append(
+            BenchCase(
+                name=f"deep_merge/{count}",
+                group="compose",
+                fn=lambda payloads=payloads: reduce(deep_merge, payloads, {}),
+                items=count,
+            )
+        )
+    for size in ARRAY_SIZES:
+        base, patch = keyed_items(rng, size), keyed_items(rng, size)
+        cases.append(
+            BenchCase(
+                name=f"merge_arrays_by_key/{size}",
+                group="compose",
+                fn=lambda base=base, patch=patch: merge_arrays_by_key(base, patch, key="id"),
+                items=size,
+            )
+        )
+    return cases
+
+
+def build_cases(seed: int = 0, *, records: int = 200) -> list[BenchCase]:
+    """Build every benchmark case from seeded data; the same seed yields the same inputs."""
+    rng = random.Random(seed)
+    return [
+        *upcast_cases(rng, records),
+        *op_cases(rng, records),
+        *pipeline_cases(rng, records),
+        *compose_cases(rng),
+        *columnar_cases(rng, records),
+    ]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from schemalution_bench import (
+    REPORT_FORMAT,
+    __version__,
+    build_cases,
+    build_report,
+    compare_reports,
+    load_report,
+    main,
+    run_cases,
+    write_report,
+)
+
+
+def _report(**seconds: float) -> dict:
+    return {
+        "format": REPORT_FORMAT,
+        "seed": 0,
+        "records": 200,
+        "results": {name: {"best_seconds": value} for name, value in seconds.items()},
+    }
+
+
+def test_version_is_string() -> None:
+    assert isinstance(__version__, str)
+    assert __version__
+
+
+def test_cases_cover_every_suite_and_are_seeded() -> None:
+    cases = build_cases(seed=7, records=3)
+    names = {case.name for case in cases}
+
+    assert {"upcast_to_latest/crm/v1", "upcast_to_latest/crm/v3"} <= names
+    assert {f"ops/{op}/{shape}" for op in ("Cast", "Move") for shape in ("flat", "nested")} <= names
+    assert {"compile_ops/interpreted/64", "compile_ops/codegen/1"} <= names
+    assert {"compose_root/128", "deep_merge/2", "merge_arrays_by_key/1000"} <= names
+    assert {"columnar/upcast_many/16", "columnar/upcast_batch/16"} <= names
+    for case in cases:
+        case.fn()
+    first = [case.fn() for case in build_cases(seed=7, records=3) if case.group == "compose"]
+    second = [case.fn() for case in build_cases(seed=7, records=3) if case.group == "compose"]
+    assert first == second
+
+
+def test_run_and_report_round_trip(tmp_path: Path) -> None:
+    results = run_cases(build_cases(records=2), pattern="^ops/Drop/", repeat=2, min_time=0.0)
+    path = tmp_path / "report.json"
+
+    write_report(build_report(results, seed=0, records=2), path)
+    report = load_report(path)
+
+    assert list(report["results"]) == ["ops/Drop/flat", "ops/Drop/nested"]
+    assert report["results"]["ops/Drop/flat"]["items"] == 2
+    assert report["results"]["ops/Drop/flat"]["best_seconds"] > 0
+
+
+def test_compare_flags_regressions_beyond_threshold() -> None:
+    baseline = _report(fast=1.0, slow=1.0, gone=1.0)
+    current = _report(fast=1.05, slow=1.5, new=1.0)
+
+    by_name = {item.name: item for item in compare_reports(baseline, current, threshold=0.1)}
+
+    assert not by_name["fast"].regressed
+    assert by_name["slow"].regressed and by_name["slow"].ratio == 1.5
+    assert by_name["new"].baseline_seconds is None and not by_name["new"].regressed
+    assert by_name["gone"].current_seconds is None and by_name["gone"].ratio is None
+
+
+@pytest.mark.parametrize(("key", "value"), [("seed", 1), ("records", 50)])
+def test_compare_rejects_reports_of_different_inputs(key: str, value: int) -> None:
+    current = {**_report(case=1.0), key: value}
+
+    with pytest.raises(ValueError, match=f"differ in {key}"):
+        compare_reports(_report(case=1.0), current)
+
+
+def test_compare_command_exit_code(tmp_path: Path) -> None:
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline.write_text(json.dumps(_report(case=1.0)), encoding="utf-8")
+    current.write_text(json.dumps(_report(case=2.0)), encoding="utf-8")
+
+    assert main(["compare", str(baseline), str(baseline)]) == 0
+    assert main(["compare", str(baseline), str(current)]) == 1
+    assert main(["compare", str(baseline), str(current), "--threshold", "1.5"]) == 0
+
+
+def test_load_report_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "other.json"
+    path.write_text(json.dumps({"results": {}}), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="report"):
+        load_report(path)
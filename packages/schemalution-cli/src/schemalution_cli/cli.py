@@ -16,6 +16,7 @@ from schemalution_core import (
     NoMigrationPathError,
     UnsupportedSchemaIdError,
     UpcastContext,
+    UpcastTracer,
     upcast,
 )
 
@@ -41,6 +42,8 @@ def main(argv: Sequence[str] | None = None) -> int:
             return _handle_upcast(args)
         if args.command == "validate":
             return _handle_validate(args)
+        if args.command == "trace":
+            return _handle_trace(args)
         raise CLIError("invalid_command", "Unknown command.", command="unknown")
     except CLIError as exc:
         payload = _error_payload(exc)
@@ -82,6 +85,16 @@ def _build_parser() -> argparse.ArgumentParser:
     validate_parser.add_argument("--format", default="v1")
     validate_parser.add_argument("--trace", action="store_true")
 
+    trace_parser = subparsers.add_parser(
+        "trace", parents=[common], help="Upcast records from stdin and dump sampled traces."
+    )
+    trace_parser.add_argument("--schema-id", required=False)
+    trace_parser.add_argument("--format", default="v1")
+    trace_parser.add_argument("--sample-every", type=int, default=1)
+    trace_parser.add_argument("--slow-ms", type=float, default=None)
+    trace_parser.add_argument("--capacity", type=int, default=256)
+    trace_parser.add_argument("--key", help="Top-level field captured as record_key.")
+
     return parser
 
 
@@ -133,7 +146,7 @@ def _handle_registry_export(args: argparse.Namespace) -> int:
 def _handle_upcast(args: argparse.Namespace) -> int:
     _ensure_format(args.format, "upcast")
     schema_id = _require_schema_id(args.schema_id, "upcast")
-    registry, _ = _build_registry(args.pack, "upcast")
+    registry, _ = _build_registry(args.pack, "upcast", schema_id)
     record = _read_json_stdin("upcast")
     context = UpcastContext()
     trace: list[dict[str, str | int]] = []
@@ -174,7 +187,7 @@ def _handle_upcast(args: argparse.Namespace) -> int:
 def _handle_validate(args: argparse.Namespace) -> int:
     _ensure_format(args.format, "validate")
     schema_id = _require_schema_id(args.schema_id, "validate")
-    registry, _ = _build_registry(args.pack, "validate")
+    registry, _ = _build_registry(args.pack, "validate", schema_id)
     record = _read_json_stdin("validate")
     context = UpcastContext()
     trace: list[dict[str, str | int]] = []
@@ -210,9 +223,47 @@ def _handle_validate(args: argparse.Namespace) -> int:
     return 0
 
 
+def _handle_trace(args: argparse.Namespace) -> int:
+    _ensure_format(args.format, "trace")
+    schema_id = _require_schema_id(args.schema_id, "trace")
+    registry, _ = _build_registry(args.pack, "trace", schema_id)
+    records = _read_json_records_stdin("trace")
+    key_field = args.key
+    try:
+        tracer = UpcastTracer(
+            sample_every=args.sample_every,
+            slow_threshold=None if args.slow_ms is None else args.slow_ms / 1000,
+            capacity=args.capacity,
+            record_key=None if key_field is None else (lambda record: record.get(key_field)),
+        )
+    except ValueError as exc:
+        raise CLIError("invalid_arguments", str(exc), command="trace") from exc
+
+    failed = 0
+    for record in records:
+        try:
+            tracer.upcast(record, schema_id, registry)
+        except Exception:  # noqa: BLE001 - failures are captured as error traces
+            failed += 1
+
+    payload: dict[str, Any] = {
+        "format": "v1",
+        "command": "trace",
+        "schema_id": schema_id,
+        "success": True,
+        "errors": [],
+        "records": len(records),
+        "failed": failed,
+        "traces": [trace.to_dict() for trace in tracer.dump()],
+    }
+    _emit_json(payload)
+    return 0
+
+
 def _build_registry(
-    pack_args: Iterable[str] | None, command: str
+    pack_args: Iterable[str] | None, command: str, schema_id: str | None = None
 ) -> tuple[MigrationRegistry, list[Any]]:
+    """Load packs; with a schema_id, other schemas are only declared and never built."""
     module_names = resolve_pack_modules(pack_args)
     if not module_names:
         raise CLIError(
@@ -222,7 +273,9 @@ def _build_registry(
         )
     registry = MigrationRegistry()
     try:
-        packs = load_packs(registry, module_names)
+        packs = load_packs(registry, module_names, lazy=schema_id is not None)
+        if schema_id is not None:
+            registry.load_schema(schema_id)
     except Exception as exc:  # noqa: BLE001
         raise CLIError("pack_load_failed", f"Failed to load pack: {exc}", command=command) from exc
     return registry, packs
@@ -248,6 +301,22 @@ def _read_json_stdin(command: str) -> dict[str, Any]:
     return payload
 
 
+def _read_json_records_stdin(command: str) -> list[dict[str, Any]]:
+    """Read a JSON object, a JSON array of objects, or newline-delimited JSON objects."""
+    text = sys.stdin.read()
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError:
+        try:
+            payload = [json.loads(line) for line in text.splitlines() if line.strip()]
+        except json.JSONDecodeError as exc:
+            raise CLIError("invalid_json", f"Invalid JSON input: {exc}", command=command) from exc
+    records = payload if isinstance(payload, list) else [payload]
+    if not all(isinstance(record, dict) for record in records):
+        raise CLIError("invalid_json", "Input records must be JSON objects.", command=command)
+    return records
+
+
 def _emit_json(payload: dict[str, Any]) -> str:
     text = json.dumps(payload, sort_keys=True)
     sys.stdout.write(text)
@@ -308,7 +377,7 @@ def _error_payload(error: CLIError) -> dict[str, Any]:
 def _command_name(args: argparse.Namespace) -> str:
     if getattr(args, "command", None) == "registry":
         return "registry.export"
-    if getattr(args, "command", None) in {"upcast", "validate"}:
+    if getattr(args, "command", None) in {"upcast", "validate", "trace"}:
         return args.command
     return "unknown"
 
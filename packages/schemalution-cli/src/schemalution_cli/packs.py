@@ -36,7 +36,14 @@ def resolve_pack_modules(pack_args: Iterable[str] | None) -> list[str]:
     return ordered
 
 
-def load_packs(registry: MigrationRegistry, module_names: Iterable[str]) -> list[LoadedPack]:
+def load_packs(
+    registry: MigrationRegistry, module_names: Iterable[str], *, lazy: bool = False
+) -> list[LoadedPack]:
+    """Import pack modules and register them.
+
+    With lazy=True, modules whose schema specs (or SCHEMA_ID and LATEST_VERSION) are known
+    are only declared; their register() runs on first use of one of their schema_ids.
+    """
     loaded: list[LoadedPack] = []
     for module_name in module_names:
         module = importlib.import_module(module_name)
@@ -46,13 +53,25 @@ def load_packs(registry: MigrationRegistry, module_names: Iterable[str]) -> list
 
         pack_obj = getattr(module, "PACK", None)
         if pack_obj is not None and hasattr(pack_obj, "register"):
-            pack_obj.register(registry)
+            register = pack_obj.register
             schema_ids = _schema_ids_from_pack(pack_obj)
+            specs = _specs_from_pack(pack_obj)
         elif hasattr(module, "register"):
-            module.register(registry)
+            register = module.register
             schema_ids = _schema_ids_from_module(module)
+            specs = _specs_from_module(module)
         else:
             raise ValueError(f"pack module '{module_name}' does not expose register() or PACK.")
+        latest = _latest_versions(specs, module)
+        if lazy and latest:
+            # One loader per module: it registers every schema the module provides.
+            def loader(target: MigrationRegistry, register: Any = register) -> None:
+                register(target)
+
+            for schema_id, latest_version in sorted(latest.items()):
+                registry.declare_schema(schema_id, latest_version, loader)
+        else:
+            register(registry)
 
         after = set(registry.schema_ids())
         registered = sorted(after - before)
@@ -123,6 +142,36 @@ def _schema_ids_from_module(module: Any) -> list[str]:
     return []
 
 
+def _specs_from_pack(pack_obj: Any) -> list[Any]:
+    schemas = getattr(pack_obj, "schemas", None)
+    if not callable(schemas):
+        return []
+    result = schemas()
+    return result if isinstance(result, list) else [result]
+
+
+def _specs_from_module(module: Any) -> list[Any]:
+    for attr in ("SCHEMA_SPECS", "SCHEMA_SPEC"):
+        value = getattr(module, attr, None)
+        if value is not None:
+            return value if isinstance(value, list) else [value]
+    return []
+
+
+def _latest_versions(specs: Iterable[Any], module: Any) -> dict[str, int]:
+    latest: dict[str, int] = {}
+    for spec in specs:
+        schema_id = getattr(spec, "schema_id", None)
+        version = getattr(spec, "latest_version", None)
+        if isinstance(schema_id, str) and schema_id and type(version) is int:
+            latest[schema_id] = version
+    schema_id = getattr(module, "SCHEMA_ID", None)
+    version = getattr(module, "LATEST_VERSION", None)
+    if not latest and isinstance(schema_id, str) and schema_id and type(version) is int:
+        latest[schema_id] = version
+    return latest
+
+
 def _schema_ids_from_specs(specs: Iterable[Any]) -> list[str]:
     schema_ids: list[str] = []
     for spec in specs:
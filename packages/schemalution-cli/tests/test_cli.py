@@ -91,3 +91,49 @@ def test_registry_export_dot(monkeypatch) -> None:
         ["registry", "export", "--pack", pack, "--dot"],
     )
     assert output.strip().startswith("digraph schemalution")
+
+
+def test_trace_command(monkeypatch) -> None:
+    pack = _install_fake_pack("tests_fake_pack_trace")
+    records = [
+        {"schema_version": 1, "id": "a", "name": "Ada"},
+        {"schema_version": 2, "id": "b"},
+        {"id": "c"},
+    ]
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\n".join(json.dumps(r) for r in records)))
+    output = _run_cli(
+        monkeypatch,
+        ["trace", "--schema-id", "crm.customer", "--pack", pack, "--sample-every", "2"]
+        + ["--key", "id"],
+    )
+    payload = json.loads(output)
+    validate(payload, _SCHEMA)
+    assert (payload["records"], payload["failed"]) == (3, 1)
+    traces = payload["traces"]
+    assert [(t["record_key"], t["reason"]) for t in traces] == [("a", "sampled"), ("c", "error")]
+    assert [(s["from_version"], s["to_version"]) for s in traces[0]["steps"]] == [(1, 2)]
+    assert traces[1]["error"].startswith("MissingSchemaVersionError")
+    # Records the tracer cannot size are reported with a null record_bytes.
+    traces[0]["record_bytes"] = None
+    validate(payload, _SCHEMA)
+
+
+def test_upcast_only_registers_the_requested_schema(monkeypatch) -> None:
+    pack = _install_fake_pack()
+    unused = cast(Any, types.ModuleType("tests_unused_pack"))
+
+    def register(registry: MigrationRegistry) -> None:
+        raise AssertionError("unused pack must not be registered")
+
+    unused.register = register
+    unused.SCHEMA_ID = "billing.invoice"
+    unused.LATEST_VERSION = 3
+    monkeypatch.setitem(sys.modules, "tests_unused_pack", unused)
+
+    output = _run_cli(
+        monkeypatch,
+        ["upcast", "--schema-id", "crm.customer", "--pack", f"{pack},tests_unused_pack"],
+        {"schema_version": 1, "name": "Ada"},
+    )
+
+    assert json.loads(output)["record"]["full_name"] == "Ada"
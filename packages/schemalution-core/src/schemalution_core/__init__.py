@@ -6,27 +6,70 @@ Only the symbols exported here are considered public and stable.
 from __future__ import annotations
 
 from . import ops
+from .cache import CacheStats, UpcastCache
+from .columnar import RecordBatch, upcast_batch
+from .diagnostics import AggregatingContext, Diagnostic
 from .errors import (
     InvalidSchemaVersionError,
     MissingSchemaVersionError,
     NoMigrationPathError,
     UnsupportedSchemaIdError,
 )
+from .metrics import UpcastMetrics
 from .ops import compile_ops
-from .registry import MigrationEdge, MigrationRegistry, UpcastContext, upcast, upcast_to_latest
+from .parallel import ParallelUpcaster
+from .projection import ProjectionPlan
+from .records import Record
+from .registry import (
+    MigrationEdge,
+    MigrationRegistry,
+    UpcastContext,
+    UpcastFailure,
+    UpcastPlan,
+    mark_pure,
+    upcast,
+    upcast_many,
+    upcast_to_latest,
+)
+from .snapshot import EdgeSnapshot, RegistrySnapshot
+from .squash import SquashMismatch, squash_migrations, verify_squashed_edge
+from .streaming import upcast_stream
+from .tracing import UpcastTrace, UpcastTracer
 
 __all__ = [
+    "AggregatingContext",
+    "CacheStats",
+    "Diagnostic",
     "MigrationRegistry",
     "MigrationEdge",
+    "Record",
+    "RecordBatch",
+    "RegistrySnapshot",
+    "UpcastCache",
     "UpcastContext",
+    "UpcastFailure",
+    "UpcastMetrics",
+    "UpcastTrace",
+    "UpcastTracer",
+    "UpcastPlan",
     "compile_ops",
     "InvalidSchemaVersionError",
+    "EdgeSnapshot",
     "MissingSchemaVersionError",
+    "mark_pure",
     "NoMigrationPathError",
     "ops",
+    "ParallelUpcaster",
+    "ProjectionPlan",
+    "SquashMismatch",
+    "squash_migrations",
     "UnsupportedSchemaIdError",
     "upcast",
+    "upcast_batch",
+    "upcast_many",
+    "upcast_stream",
     "upcast_to_latest",
+    "verify_squashed_edge",
     "__version__",
 ]
 
@@ -0,0 +1,181 @@
+"""Content-addressed LRU cache for upcast results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import pickle
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .registry import (
+    MigrationRegistry,
+    UpcastContext,
+    _downcast_error,
+    _record_version,
+)
+
+# pickled (record, UpcastContext) of a cached upcast
+_Entry = bytes
+_Key = tuple[str, tuple[int, int], bytes]
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Point-in-time counters for an UpcastCache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    bypassed: int
+    entries: int
+    bytes: int
+
+
+def canonical_digest(record: Mapping[str, Any]) -> bytes:
+    """Return a blake2b digest of record that equal records share.
+
+    Records are encoded as JSON with keys sorted and containers tagged by type, so key
+    order and object identity do not matter while 1, 1.0, True, lists and tuples stay
+    distinct. Values of other types are encoded by their pickle.
+    """
+    encoded = json.dumps(_canonical(record), separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(encoded.encode("utf-8", "surrogatepass"), digest_size=20).digest()
+
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _canonical(value: Any) -> Any:
+    kind = type(value)
+    if kind in _SCALARS:
+        return value
+    if kind is list or kind is tuple:
+        return ["l" if kind is list else "t", [_canonical(item) for item in value]]
+    if isinstance(value, Mapping):
+        if all(type(key) is str for key in value):
+            items = sorted(value.items())
+            return ["d", [[key, _canonical(item)] for key, item in items]]
+        pairs = [(_canonical(key), _canonical(item)) for key, item in value.items()]
+        pairs.sort(key=lambda pair: json.dumps(pair[0], separators=(",", ":")))
+        return ["m", [list(pair) for pair in pairs]]
+    return ["p", pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL).hex()]
+
+
+class UpcastCache:
+    """LRU cache in front of upcast_to_latest for records migrated by pure steps only.
+
+    Entries are keyed by (schema_id, registry fingerprint, canonical_digest of the record), so
+    re-registering migrations invalidates them implicitly. Records whose plan contains an
+    impure step, or that cannot be pickled, bypass the cache. Results are stored pickled and
+    every hit returns a fresh deep copy, so callers cannot corrupt entries; warnings, notes,
+    and applied steps recorded on a miss are replayed into the caller's context on hits.
+    """
+
+    def __init__(
+        self,
+        registry: MigrationRegistry,
+        *,
+        max_entries: int = 4096,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be positive.")
+        self.registry = registry
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[_Key, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._bypassed = 0
+
+    def upcast_to_latest(
+        self,
+        record: Mapping[str, Any],
+        schema_id: str,
+        *,
+        context: UpcastContext | None = None,
+    ) -> dict[str, Any]:
+        """Upcast record to latest, serving repeated pure migrations from the cache."""
+        registry = self.registry
+        from_version = _record_version(record)
+        target_version = registry.latest_version(schema_id)
+        if from_version > target_version:
+            raise _downcast_error(schema_id, from_version, target_version)
+        plan = registry.plan(schema_id, from_version, target_version)
+        if not plan.steps or not plan.pure:
+            return self._bypass(plan.apply(record, context))
+
+        try:
+            digest = canonical_digest(record)
+        except Exception:  # noqa: BLE001 - unencodable records are simply not cached
+            return self._bypass(plan.apply(record, context))
+        key = (schema_id, registry.fingerprint, digest)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+        if entry is not None:
+            migrated, cached = pickle.loads(entry)
+            if context is not None:
+                context.extend(cached)
+            return migrated
+
+        # Diagnostics stay unrendered in the cache; extend renders them for callers that do.
+        local = UpcastContext(render_warnings=False)
+        migrated = plan.apply(record, local)
+        if context is not None:
+            context.extend(local)
+        try:
+            entry = pickle.dumps((migrated, local), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # noqa: BLE001 - unpicklable results are simply not cached
+            return self._bypass(migrated)
+        self._store(key, entry)
+        return migrated
+
+    def _bypass(self, migrated: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            self._bypassed += 1
+        return migrated
+
+    def _store(self, key: _Key, entry: _Entry) -> None:
+        size = len(entry)
+        with self._lock:
+            self._misses += 1
+            if size > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of hit/miss/eviction counters and current size."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                bypassed=self._bypassed,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
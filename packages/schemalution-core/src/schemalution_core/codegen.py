@@ -0,0 +1,287 @@
+"""Source generation backend for compiled declarative ops."""
+
+from __future__ import annotations
+
+import itertools
+import linecache
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+from .diagnostics import CAST_FAILED, MOVE_DESTINATION_EXISTS
+from .ops import (
+    _BUILTIN_OPS,
+    MISSING,
+    Cast,
+    Coalesce,
+    Drop,
+    Move,
+    Op,
+    PathParts,
+    Rename,
+    SetDefault,
+    _disown,
+    _ElementPipeline,
+    _owned_child,
+    _owned_list,
+)
+from .registry import UpcastContext
+
+GeneratedFn = Callable[[Mapping[str, Any], "UpcastContext | None"], dict[str, Any]]
+GeneratedInPlaceFn = Callable[
+    [dict[str, Any], dict[int, Any], "UpcastContext | None"], dict[str, Any]
+]
+
+_counter = itertools.count()
+
+
+def _owned_item(
+    parent: dict[str, Any],
+    keys: PathParts,
+    items: list[Any],
+    index: int,
+    item: Mapping[str, Any],
+    owned: dict[int, Any],
+) -> tuple[dict[str, Any], list[Any]]:
+    """Copy a list element (and the list) on first write; return the owned element and list."""
+    items = _owned_list(parent, keys, items, owned)
+    copied: dict[str, Any] = dict(item)
+    owned[id(copied)] = copied
+    items[index] = copied
+    return copied, items
+
+
+class _Emitter:
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.constants: dict[str, Any] = {}
+        self.indent = 1
+        # Enclosing element loops: (element var, list var, index var, parent var, list keys).
+        self.scopes: list[tuple[str, str, str, str, PathParts]] = []
+
+    @property
+    def root(self) -> str:
+        return self.scopes[-1][0] if self.scopes else "r"
+
+    def relative(self, parts: PathParts) -> PathParts:
+        # Element-level op paths start at _ELEMENT, which is bound to the loop variable.
+        return parts[1:] if self.scopes else parts
+
+    def own(self, level: int) -> None:
+        """Emit the copy-on-first-write of the element at scopes[level] and its parents."""
+        element, items, index, parent, keys = self.scopes[level]
+        self.line(f"if id({element}) not in o:")
+        self.indent += 1
+        if level:
+            self.own(level - 1)
+        self.line(f"{element}, {items} = _item({parent}, {keys!r}, {items}, {index}, {element}, o)")
+        self.indent -= 1
+
+    def line(self, text: str) -> None:
+        self.lines.append("    " * self.indent + text)
+
+    def constant(self, value: Any) -> str:
+        name = f"_c{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def get(self, target: str, parts: PathParts) -> None:
+        """Emit straight-line lookups binding target to the value at parts (or _M)."""
+        parts = self.relative(parts)
+        self.line(f"{target} = {self.root}.get({parts[0]!r}, _M)")
+        for part in parts[1:]:
+            self.line(
+                f"if {target} is not _M: "
+                f"{target} = {target}.get({part!r}, _M) if isinstance({target}, _Mapping) else _M"
+            )
+
+    def set(self, parts: PathParts, value: str) -> None:
+        parts = self.relative(parts)
+        root = self.root
+        if self.scopes:
+            self.own(len(self.scopes) - 1)
+        if len(parts) == 1:
+            self.line(f"{root}[{parts[0]!r}] = {value}")
+            return
+        self.line(f"c = _child({root}, {parts[0]!r}, o)")
+        for part in parts[1:-1]:
+            self.line(f"c = _child(c, {part!r}, o)")
+        self.line(f"c[{parts[-1]!r}] = {value}")
+
+    def delete(self, parts: PathParts) -> None:
+        parts = self.relative(parts)
+        root = self.root
+        if self.scopes:
+            self.own(len(self.scopes) - 1)
+        if len(parts) == 1:
+            self.line(f"{root}.pop({parts[0]!r}, None)")
+            return
+        self.line(f"c = {root}")
+        opened = 0
+        for part in parts[:-1]:
+            self.line(f"if isinstance(c.get({part!r}, _M), _Mapping):")
+            self.indent += 1
+            opened += 1
+            self.line(f"c = _child(c, {part!r}, o)")
+        self.line(f"c.pop({parts[-1]!r}, None)")
+        self.indent -= opened
+
+
+def _emit_op(emit: _Emitter, op: Op) -> None:
+    if isinstance(op, Rename):
+        if op._from_parts == op._to_parts:
+            return
+        emit.get("v", op._from_parts)
+        emit.line("if v is not _M:")
+        emit.indent += 1
+        if op.keep_source:
+            emit.line("_disown(v, o)")
+        else:
+            emit.delete(op._from_parts)
+        emit.set(op._to_parts, "v")
+        emit.indent -= 1
+    elif isinstance(op, SetDefault):
+        emit.get("v", op._parts)
+        emit.line("if v is _M:")
+        emit.indent += 1
+        emit.set(op._parts, emit.constant(op.default))
+        emit.indent -= 1
+    elif isinstance(op, Drop):
+        if len(op._parts) == 1 and not emit.scopes:
+            emit.delete(op._parts)
+            return
+        emit.get("v", op._parts)
+        emit.line("if v is not _M:")
+        emit.indent += 1
+        emit.delete(op._parts)
+        emit.indent -= 1
+    elif isinstance(op, Move):
+        if op._from_parts == op._to_parts:
+            return
+        emit.get("v", op._from_parts)
+        emit.line("if v is not _M:")
+        emit.indent += 1
+        if not op.overwrite:
+            report = ", ".join(
+                repr(value) for value in (MOVE_DESTINATION_EXISTS, "Move", op.from_path, op.to_path)
+            )
+            emit.get("w", op._to_parts)
+            emit.line("if w is not _M:")
+            emit.indent += 1
+            emit.line(f"if ctx is not None: ctx.report({report})")
+            emit.indent -= 1
+            emit.line("else:")
+            emit.indent += 1
+        emit.delete(op._from_parts)
+        emit.set(op._to_parts, "v")
+        emit.indent -= 1 if op.overwrite else 2
+    elif isinstance(op, Coalesce):
+        emit.get("v", op._to_parts)
+        emit.line("if v is _M:")
+        emit.indent += 1
+        for index, candidate in enumerate(op._from_parts):
+            if index:
+                emit.line("if v is _M:")
+                emit.indent += 1
+            emit.get("v", candidate)
+            if index:
+                emit.indent -= 1
+        emit.line("if v is not _M:")
+        emit.indent += 1
+        emit.line("_disown(v, o)")
+        emit.set(op._to_parts, "v")
+        emit.indent -= 2
+    elif isinstance(op, Cast):
+        cast_fn = emit.constant(op.cast)
+        emit.get("v", op._parts)
+        emit.line("if v is not _M and v is not None:")
+        emit.indent += 1
+        emit.line("try:")
+        emit.line(f"    v = {cast_fn}(v)")
+        emit.line("except Exception as exc:")
+        emit.indent += 1
+        if op.on_error == "raise":
+            message = emit.constant(f"cast failed for path '{op.path}'.")
+            emit.line(f"raise ValueError({message}) from exc")
+        elif op.on_error == "warn":
+            report = ", ".join(repr(value) for value in (CAST_FAILED, "Cast", op.path))
+            emit.line(f"if ctx is not None: ctx.report({report}, exc)")
+        else:
+            emit.line("pass")
+        emit.indent -= 1
+        emit.line("else:")
+        emit.indent += 1
+        emit.set(op._parts, "v")
+        emit.indent -= 2
+    elif isinstance(op, _ElementPipeline) and _inlinable(op):
+        _emit_elements(emit, op)
+    elif hasattr(op, "_apply_in_place"):
+        emit.line(f"{emit.constant(op)}._apply_in_place(r, o, ctx)")
+    else:
+        emit.line(f"r = {emit.constant(op)}.apply(r, ctx)")
+        emit.line("o.clear()")
+        emit.line("o[id(r)] = r")
+
+
+def _inlinable(group: _ElementPipeline) -> bool:
+    # Groups that stay inside mapping elements become loops; others call the interpreter.
+    return group.mappings_only and all(
+        type(step) in _BUILTIN_OPS or (isinstance(step, _ElementPipeline) and _inlinable(step))
+        for step, _ in group.pipeline._steps
+    )
+
+
+def _emit_elements(emit: _Emitter, group: _ElementPipeline) -> None:
+    """Emit a loop over the list at group.prefix running the element ops on each element."""
+    level = len(emit.scopes) + 1
+    element, items, index = f"e{level}", f"l{level}", f"i{level}"
+    keys = group.prefix[:-1]
+    emit.get(items, keys)
+    emit.line(f"if isinstance({items}, list):")
+    emit.indent += 1
+    emit.line(f"for {index}, {element} in enumerate({items}):")
+    emit.indent += 1
+    emit.line(f"if not isinstance({element}, _Mapping): continue")
+    emit.scopes.append((element, items, index, emit.root, emit.relative(keys)))
+    for step, _ in group.pipeline._steps:
+        _emit_op(emit, step)
+    emit.scopes.pop()
+    emit.indent -= 2
+
+
+def generate_ops_function(
+    ops: Sequence[Op],
+) -> tuple[GeneratedFn, GeneratedInPlaceFn, str]:
+    """Generate specialized functions for ops and return them with their source.
+
+    The in-place variant mutates an owned record, copying nested dicts missing from the owned
+    map on first write; the copying variant wraps it with a single top-level copy.
+    """
+    emit = _Emitter()
+    for index, op in enumerate(ops):
+        emit.line(f"# op {index}: {op!r}".replace("\n", " "))
+        _emit_op(emit, op)
+    emit.line("return r")
+
+    source = "\n".join(
+        [
+            "def _compiled_ops_in_place(r, o, ctx=None):",
+            *emit.lines,
+            "",
+            "def _compiled_ops(record, ctx=None):",
+            "    r = dict(record)",
+            "    return _compiled_ops_in_place(r, {id(r): r}, ctx)",
+            "",
+        ]
+    )
+    filename = f"<schemalution-ops-{next(_counter)}>"
+    namespace: dict[str, Any] = {
+        "_M": MISSING,
+        "_Mapping": Mapping,
+        "_child": _owned_child,
+        "_disown": _disown,
+        "_item": _owned_item,
+        **emit.constants,
+    }
+    exec(compile(source, filename, "exec"), namespace)  # noqa: S102 - source built from op data
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    return namespace["_compiled_ops"], namespace["_compiled_ops_in_place"], source
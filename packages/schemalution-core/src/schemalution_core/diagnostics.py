@@ -0,0 +1,158 @@
+"""Structured upcast diagnostics and the contexts that collect them."""
+
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+MOVE_DESTINATION_EXISTS = "move.destination_exists"
+CAST_FAILED = "cast.failed"
+
+# (code, op, path, step)
+DiagnosticKey = tuple[str, str, str, "tuple[int, int] | None"]
+
+
+@dataclass(frozen=True, slots=True)
+class Diagnostic:
+    """A warning reported by an op; the message is only rendered when asked for."""
+
+    code: str
+    op: str
+    path: str
+    step: tuple[int, int] | None = None
+    record_id: Any = None
+    detail: Any = None
+
+    @property
+    def key(self) -> DiagnosticKey:
+        return (self.code, self.op, self.path, self.step)
+
+    @property
+    def message(self) -> str:
+        render = _MESSAGES.get(self.code)
+        if render is not None:
+            return render(self)
+        suffix = "" if self.detail is None else f": {self.detail}"
+        return f"{self.op} {self.code} at '{self.path}'{suffix}"
+
+
+_MESSAGES: dict[str, Callable[[Diagnostic], str]] = {
+    MOVE_DESTINATION_EXISTS: lambda d: (
+        f"destination '{d.detail}' exists; move from '{d.path}' skipped."
+    ),
+    CAST_FAILED: lambda d: f"cast failed for path '{d.path}': {d.detail}",
+}
+
+
+@dataclass(slots=True)
+class UpcastContext:
+    """Collect diagnostics during upcast (warnings and soft errors).
+
+    Ops report structured Diagnostic entries through report(), which also appends the
+    rendered message to warnings unless render_warnings is False; free-form warnings are
+    appended to warnings directly. step and record_id are maintained by the upcast helpers
+    (upcast_many sets record_id to the input index) and stamped onto each diagnostic.
+    """
+
+    applied_steps: list[tuple[int, int]] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    notes: dict[str, Any] = field(default_factory=dict)
+    diagnostics: list[Diagnostic] = field(default_factory=list)
+    step: tuple[int, int] | None = None
+    record_id: Any = None
+    render_warnings: bool = True
+
+    @property
+    def warning_count(self) -> int:
+        """Number of warnings reported so far, without rendering any messages."""
+        if self.render_warnings:
+            return len(self.warnings)
+        return len(self.warnings) + len(self.diagnostics)
+
+    def report(self, code: str, op: str, path: str, detail: Any = None) -> None:
+        """Record a diagnostic for the current step and record."""
+        if isinstance(detail, BaseException):
+            # A traceback pins the frames (and records) of every failure; keep the error only.
+            detail = detail.with_traceback(None)
+        diagnostic = Diagnostic(code, op, path, self.step, self.record_id, detail)
+        self.add(diagnostic)
+        if self.render_warnings:
+            self.warnings.append(diagnostic.message)
+
+    def add(self, diagnostic: Diagnostic) -> None:
+        self.diagnostics.append(diagnostic)
+
+    def extend(self, other: UpcastContext) -> None:
+        """Append everything other collected, re-stamping diagnostics with record_id."""
+        self.applied_steps.extend(other.applied_steps)
+        self.notes.update(other.notes)
+        self.warnings.extend(other.warnings)
+        # other's warnings already hold its diagnostics' messages when it rendered them.
+        render = self.render_warnings and not other.render_warnings
+        for diagnostic in other.diagnostics:
+            self.add(dataclasses.replace(diagnostic, record_id=self.record_id))
+            if render:
+                self.warnings.append(diagnostic.message)
+
+
+@dataclass(slots=True)
+class AggregatingContext(UpcastContext):
+    """Batch-level context that counts diagnostics instead of keeping them.
+
+    Diagnostics are grouped by (code, op, path, step); each group keeps a count and its
+    first sample_size diagnostics (with record ids). diagnostics stays empty and warnings
+    only holds free-form warnings, so memory grows with the number of distinct groups
+    rather than with the number of records.
+    """
+
+    render_warnings: bool = False
+    sample_size: int = 5
+    counts: dict[DiagnosticKey, int] = field(default_factory=dict)
+    samples: dict[DiagnosticKey, list[Diagnostic]] = field(default_factory=dict)
+    _total: int = field(default=0, init=False, repr=False)
+
+    @property
+    def warning_count(self) -> int:
+        return len(self.warnings) + self._total
+
+    def add(self, diagnostic: Diagnostic) -> None:
+        key = diagnostic.key
+        count = self.counts.get(key, 0)
+        self.counts[key] = count + 1
+        self._total += 1
+        if count < self.sample_size:
+            self.samples.setdefault(key, []).append(diagnostic)
+
+    def extend(self, other: UpcastContext) -> None:
+        if not isinstance(other, AggregatingContext):
+            UpcastContext.extend(self, other)
+            return
+        self.applied_steps.extend(other.applied_steps)
+        self.notes.update(other.notes)
+        self.warnings.extend(other.warnings)
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+            self._total += count
+            sample = self.samples.setdefault(key, [])
+            sample.extend(other.samples.get(key, [])[: self.sample_size - len(sample)])
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Return JSON-ready groups, most frequent first."""
+        groups = []
+        for key, count in sorted(self.counts.items(), key=lambda item: -item[1]):
+            code, op, path, step = key
+            sample = self.samples.get(key, [])
+            groups.append(
+                {
+                    "code": code,
+                    "op": op,
+                    "path": path,
+                    "step": None if step is None else list(step),
+                    "count": count,
+                    "record_ids": [diagnostic.record_id for diagnostic in sample],
+                    "message": sample[0].message if sample else None,
+                }
+            )
+        return groups
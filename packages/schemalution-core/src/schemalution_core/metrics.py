@@ -0,0 +1,156 @@
+"""Per-step upcast metrics with Prometheus text and JSON export."""
+
+from __future__ import annotations
+
+import bisect
+import json
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+StepKey = tuple[str, int, int]
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+)
+
+
+class _StepSeries:
+    __slots__ = ("count", "failures", "warnings", "seconds", "buckets")
+
+    def __init__(self, size: int) -> None:
+        self.count = 0
+        self.failures = 0
+        self.warnings = 0
+        self.seconds = 0.0
+        self.buckets = [0] * size
+
+
+class UpcastMetrics:
+    """Collect per (schema_id, from_version, to_version) step counts and latencies.
+
+    Attach with MigrationRegistry.attach_metrics(); plans built while attached time every
+    step, and registries without metrics run uninstrumented steps. Counts include failed
+    executions; failures and warnings are counted separately. Histograms are cumulative
+    when exported, with buckets in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, *, prefix: str = "schemalution"):
+        bounds = tuple(sorted(float(bound) for bound in buckets))
+        if not bounds:
+            raise ValueError("buckets must not be empty.")
+        self.buckets = bounds
+        self.prefix = prefix
+        self._series: dict[StepKey, _StepSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        schema_id: str,
+        from_version: int,
+        to_version: int,
+        seconds: float,
+        *,
+        count: int = 1,
+        warnings: int = 0,
+        failures: int = 0,
+    ) -> None:
+        """Record count executions of one step taking seconds each (on average)."""
+        slot = bisect.bisect_left(self.buckets, seconds)
+        key = (schema_id, from_version, to_version)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _StepSeries(len(self.buckets) + 1)
+            series.count += count
+            series.failures += failures
+            series.warnings += warnings
+            series.seconds += seconds * count
+            series.buckets[slot] += count
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a JSON-ready snapshot with cumulative bucket counts, sorted by step."""
+        with self._lock:
+            items = sorted(self._series.items())
+            steps = []
+            for (schema_id, from_version, to_version), series in items:
+                cumulative = 0
+                buckets: dict[str, int] = {}
+                bounds = (*map(_format_float, self.buckets), "+Inf")
+                for bound, hits in zip(bounds, series.buckets):
+                    cumulative += hits
+                    buckets[bound] = cumulative
+                steps.append(
+                    {
+                        "schema_id": schema_id,
+                        "from_version": from_version,
+                        "to_version": to_version,
+                        "count": series.count,
+                        "failures": series.failures,
+                        "warnings": series.warnings,
+                        "duration_seconds": {"sum": series.seconds, "buckets": buckets},
+                    }
+                )
+        return {"steps": steps}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), sort_keys=True)
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        prefix = self.prefix
+        steps = self.snapshot()["steps"]
+        lines: list[str] = []
+        counters = (
+            ("step_total", "count", "Migration step executions."),
+            ("step_failures_total", "failures", "Migration step executions that raised."),
+            ("step_warnings_total", "warnings", "Warnings reported by migration steps."),
+        )
+        for name, field, help_text in counters:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for step in steps:
+                lines.append(f"{prefix}_{name}{{{_labels(step)}}} {step[field]}")
+        name = f"{prefix}_step_duration_seconds"
+        lines.append(f"# HELP {name} Migration step latency.")
+        lines.append(f"# TYPE {name} histogram")
+        for step in steps:
+            labels = _labels(step)
+            duration = step["duration_seconds"]
+            for bound, cumulative in duration["buckets"].items():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {_format_float(duration['sum'])}")
+            lines.append(f"{name}_count{{{labels}}} {step['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(step: dict[str, Any]) -> str:
+    return (
+        f'schema_id="{_escape(step["schema_id"])}",'
+        f'from_version="{step["from_version"]}",to_version="{step["to_version"]}"'
+    )
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
+import copy
 from collections.abc import Callable, Mapping, Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Literal, Protocol
 
+from .diagnostics import CAST_FAILED, MOVE_DESTINATION_EXISTS
 from .registry import UpcastContext
 
 MISSING = object()
 
+# Path segment addressing every element of a list, written as a "[*]" suffix: orders[*].price.
+WILDCARD = "[*]"
+# Key under which element-level ops see the current list element (see _apply_each).
+_ELEMENT = "*"
+
 
 class Op(Protocol):
     """Protocol for declarative migration operations."""
@@ -18,19 +26,63 @@ class Op(Protocol):
         """Apply the operation and return a new record."""
 
 
-def get_path(record: Mapping[str, Any], path: str) -> Any:
+PathParts = tuple[str, ...]
+
+# (paths the op reads, paths it may write or delete); used for projection analysis.
+PathDeps = tuple[tuple[PathParts, ...], tuple[PathParts, ...]]
+
+
+@lru_cache(maxsize=4096)
+def parse_path(path: str) -> PathParts:
+    """Split a dotted path into its segments; a backslash escapes a literal dot or backslash.
+
+    A segment ending in [*] is split into its key and a WILDCARD segment per suffix, so
+    "orders[*].price" parses to ("orders", "[*]", "price").
+    """
+    if "\\" not in path:
+        parts = path.split(".")
+    else:
+        parts = []
+        segment: list[str] = []
+        chars = iter(path)
+        for char in chars:
+            if char == "\\":
+                escaped = next(chars, "")
+                if escaped not in (".", "\\"):
+                    segment.append(char)
+                segment.append(escaped)
+            elif char == ".":
+                parts.append("".join(segment))
+                segment = []
+            else:
+                segment.append(char)
+        parts.append("".join(segment))
+    if WILDCARD not in path:
+        return tuple(parts)
+    expanded: list[str] = []
+    for part in parts:
+        count = 0
+        while part.endswith(WILDCARD):
+            part = part[: -len(WILDCARD)]
+            count += 1
+        if part or not count:
+            expanded.append(part)
+        expanded.extend([WILDCARD] * count)
+    return tuple(expanded)
+
+
+def get_path_parts(record: Mapping[str, Any], parts: PathParts) -> Any:
     current: Any = record
-    for part in path.split("."):
+    for part in parts:
         if not isinstance(current, Mapping):
             return MISSING
-        if part not in current:
+        current = current.get(part, MISSING)
+        if current is MISSING:
             return MISSING
-        current = current[part]
     return current
 
 
-def set_path(record: Mapping[str, Any], path: str, value: Any) -> dict[str, Any]:
-    parts = path.split(".")
+def set_path_parts(record: Mapping[str, Any], parts: PathParts, value: Any) -> dict[str, Any]:
     updated: dict[str, Any] = dict(record)
     current: dict[str, Any] = updated
     for part in parts[:-1]:
@@ -45,8 +97,7 @@ def set_path(record: Mapping[str, Any], path: str, value: Any) -> dict[str, Any]
     return updated
 
 
-def del_path(record: Mapping[str, Any], path: str) -> dict[str, Any]:
-    parts = path.split(".")
+def del_path_parts(record: Mapping[str, Any], parts: PathParts) -> dict[str, Any]:
     updated: dict[str, Any] = dict(record)
     current: dict[str, Any] = updated
     for part in parts[:-1]:
@@ -61,41 +112,254 @@ def del_path(record: Mapping[str, Any], path: str) -> dict[str, Any]:
     return updated
 
 
+def get_path(record: Mapping[str, Any], path: str) -> Any:
+    return get_path_parts(record, parse_path(path))
+
+
+def set_path(record: Mapping[str, Any], path: str, value: Any) -> dict[str, Any]:
+    return set_path_parts(record, parse_path(path), value)
+
+
+def del_path(record: Mapping[str, Any], path: str) -> dict[str, Any]:
+    return del_path_parts(record, parse_path(path))
+
+
+def _owned_child(parent: dict[str, Any], key: str, owned: dict[int, Any]) -> dict[str, Any]:
+    """Return parent[key] as a dict owned by the pipeline, copying or creating it on first write."""
+    value = parent.get(key, MISSING)
+    if id(value) in owned:
+        return value
+    child: dict[str, Any] = dict(value) if isinstance(value, Mapping) else {}
+    owned[id(child)] = child
+    parent[key] = child
+    return child
+
+
+def _set_in_place(
+    record: dict[str, Any], parts: PathParts, value: Any, owned: dict[int, Any]
+) -> None:
+    current = record
+    for part in parts[:-1]:
+        current = _owned_child(current, part, owned)
+    current[parts[-1]] = value
+
+
+def _del_in_place(record: dict[str, Any], parts: PathParts, owned: dict[int, Any]) -> None:
+    current = record
+    for part in parts[:-1]:
+        if not isinstance(current.get(part, MISSING), Mapping):
+            return
+        current = _owned_child(current, part, owned)
+    current.pop(parts[-1], None)
+
+
+def _disown(value: Any, owned: dict[int, Any]) -> None:
+    # A value placed at a second path is shared, so neither copy may be mutated in place.
+    if isinstance(value, (dict, list)) and owned.pop(id(value), None) is not None:
+        for child in value.values() if isinstance(value, dict) else value:
+            _disown(child, owned)
+
+
+class _InPlaceOp(Protocol):
+    def _apply_in_place(
+        self, record: dict[str, Any], owned: dict[int, Any], ctx: UpcastContext | None
+    ) -> None: ...
+
+
+def _apply_copy(
+    op: _InPlaceOp, record: Mapping[str, Any], ctx: UpcastContext | None
+) -> dict[str, Any]:
+    updated: dict[str, Any] = dict(record)
+    op._apply_in_place(updated, {id(updated): updated}, ctx)
+    return updated
+
+
+# (list prefix ending in WILDCARD, element-level op, whether every path continues with a key
+# inside the element, in which case non-mapping elements are skipped)
+ElementSplit = tuple[PathParts, Any, bool]
+
+
+def _init_each(op: Any, names: Sequence[str], many: Sequence[str] = ()) -> None:
+    """Set op._each for an op whose paths run through a list wildcard, else None.
+
+    names are attributes holding one PathParts, many hold a tuple of them. All paths must
+    share the prefix up to their first [*]; the element-level op is a copy of op with each
+    path rebased onto _ELEMENT, and is split again for nested wildcards.
+    """
+    paths = [getattr(op, name) for name in names]
+    paths.extend(parts for name in many for parts in getattr(op, name))
+    prefixes = {parts[: parts.index(WILDCARD) + 1] if WILDCARD in parts else () for parts in paths}
+    if prefixes == {()}:
+        object.__setattr__(op, "_each", None)
+        return
+    prefix = prefixes.pop()
+    if prefixes or len(prefix) < 2:
+        raise ValueError(
+            f"{type(op).__name__} paths must share one list prefix ending in {WILDCARD}, "
+            "with a key before the first wildcard."
+        )
+
+    def rebase(parts: PathParts) -> PathParts:
+        return (_ELEMENT, *parts[len(prefix) :])
+
+    element = copy.copy(op)
+    for name in names:
+        object.__setattr__(element, name, rebase(getattr(op, name)))
+    for name in many:
+        object.__setattr__(element, name, tuple(rebase(parts) for parts in getattr(op, name)))
+    _init_each(element, names, many)
+    size = len(prefix)
+    keyed = all(len(parts) > size and parts[size] != WILDCARD for parts in paths)
+    object.__setattr__(op, "_each", (prefix, element, keyed))
+
+
+def _apply_each(
+    prefix: PathParts,
+    run: Callable[[dict[str, Any], dict[int, Any], UpcastContext | None], Any],
+    mappings_only: bool,
+    record: dict[str, Any],
+    owned: dict[int, Any],
+    ctx: UpcastContext | None,
+) -> None:
+    """Run element-level ops once per element of the list at prefix.
+
+    Each element is exposed to run as holder[_ELEMENT], so element dicts are copied only when
+    an op writes into them and the list is copied on its first changed element. An element
+    the ops remove from the holder is removed from the list.
+    """
+    keys = prefix[:-1]
+    items = get_path_parts(record, keys)
+    if not isinstance(items, list):
+        return
+    updated: list[Any] | None = None
+    removed = False
+    holder: dict[str, Any] = {}
+    for index, item in enumerate(items):
+        if mappings_only and not isinstance(item, Mapping):
+            continue
+        holder[_ELEMENT] = item
+        run(holder, owned, ctx)
+        value = holder.pop(_ELEMENT, MISSING)
+        if value is item:
+            continue
+        if updated is None:
+            updated = _owned_list(record, keys, items, owned)
+        updated[index] = value
+        removed = removed or value is MISSING
+    if updated is not None and removed:
+        updated[:] = [value for value in updated if value is not MISSING]
+
+
+def _owned_list(
+    record: dict[str, Any], keys: PathParts, items: list[Any], owned: dict[int, Any]
+) -> list[Any]:
+    parent = record
+    for key in keys[:-1]:
+        parent = _owned_child(parent, key, owned)
+    if id(items) in owned:
+        return items
+    copied = list(items)
+    owned[id(copied)] = copied
+    parent[keys[-1]] = copied
+    return copied
+
+
+def _apply_element_op(
+    each: ElementSplit, record: dict[str, Any], owned: dict[int, Any], ctx: UpcastContext | None
+) -> None:
+    prefix, element, mappings_only = each
+    _apply_each(prefix, element._apply_in_place, mappings_only, record, owned, ctx)
+
+
 @dataclass(frozen=True)
 class Rename:
     from_path: str
     to_path: str
     keep_source: bool = False
+    _from_parts: PathParts = field(init=False, repr=False, compare=False)
+    _to_parts: PathParts = field(init=False, repr=False, compare=False)
+    _each: ElementSplit | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_from_parts", parse_path(self.from_path))
+        object.__setattr__(self, "_to_parts", parse_path(self.to_path))
+        _init_each(self, ("_from_parts", "_to_parts"))
 
     def apply(self, record: Mapping[str, Any], ctx: UpcastContext | None = None) -> dict[str, Any]:
-        value = get_path(record, self.from_path)
-        if value is MISSING or self.from_path == self.to_path:
-            return dict(record)
+        return _apply_copy(self, record, ctx)
+
+    def _paths(self) -> PathDeps:
+        if self.keep_source:
+            return (self._from_parts,), (self._to_parts,)
+        return (self._from_parts,), (self._from_parts, self._to_parts)
+
+    def _apply_in_place(
+        self, record: dict[str, Any], owned: dict[int, Any], ctx: UpcastContext | None
+    ) -> None:
+        if self._each is not None:
+            _apply_element_op(self._each, record, owned, ctx)
+            return
+        value = get_path_parts(record, self._from_parts)
+        if value is MISSING or self._from_parts == self._to_parts:
+            return
         if self.keep_source:
-            return set_path(record, self.to_path, value)
-        updated = del_path(record, self.from_path)
-        return set_path(updated, self.to_path, value)
+            _disown(value, owned)
+        else:
+            _del_in_place(record, self._from_parts, owned)
+        _set_in_place(record, self._to_parts, value, owned)
 
 
 @dataclass(frozen=True)
 class SetDefault:
     path: str
     default: Any
+    _parts: PathParts = field(init=False, repr=False, compare=False)
+    _each: ElementSplit | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_parts", parse_path(self.path))
+        _init_each(self, ("_parts",))
 
     def apply(self, record: Mapping[str, Any], ctx: UpcastContext | None = None) -> dict[str, Any]:
-        if get_path(record, self.path) is MISSING:
-            return set_path(record, self.path, self.default)
-        return dict(record)
+        return _apply_copy(self, record, ctx)
+
+    def _paths(self) -> PathDeps:
+        return (self._parts,), (self._parts,)
+
+    def _apply_in_place(
+        self, record: dict[str, Any], owned: dict[int, Any], ctx: UpcastContext | None
+    ) -> None:
+        if self._each is not None:
+            _apply_element_op(self._each, record, owned, ctx)
+            return
+        if get_path_parts(record, self._parts) is MISSING:
+            _set_in_place(record, self._parts, self.default, owned)
 
 
 @dataclass(frozen=True)
 class Drop:
     path: str
+    _parts: PathParts = field(init=False, repr=False, compare=False)
+    _each: ElementSplit | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_parts", parse_path(self.path))
+        _init_each(self, ("_parts",))
 
     def apply(self, record: Mapping[str, Any], ctx: UpcastContext | None = None) -> dict[str, Any]:
-        if get_path(record, self.path) is MISSING:
-            return dict(record)
-        return del_path(record, self.path)
+        return _apply_copy(self, record, ctx)
+
+    def _paths(self) -> PathDeps:
+        return (self._parts,), (self._parts,)
+
+    def _apply_in_place(
+        self, record: dict[str, Any], owned: dict[int, Any], ctx: UpcastContext | None
+    ) -> None:
+        if self._each is not None:
+            _apply_element_op(self._each, record, owned, ctx)
+            return
+        if get_path_parts(record, self._parts) is not MISSING:
+            _del_in_place(record, self._parts, owned)
 
 
 @dataclass(frozen=True)
@@ -103,35 +367,73 @@ class Move:
     from_path: str
     to_path: str
     overwrite: bool = False
+    _from_parts: PathParts = field(init=False, repr=False, compare=False)
+    _to_parts: PathParts = field(init=False, repr=False, compare=False)
+    _each: ElementSplit | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_from_parts", parse_path(self.from_path))
+        object.__setattr__(self, "_to_parts", parse_path(self.to_path))
+        _init_each(self, ("_from_parts", "_to_parts"))
 
     def apply(self, record: Mapping[str, Any], ctx: UpcastContext | None = None) -> dict[str, Any]:
-        value = get_path(record, self.from_path)
-        if value is MISSING or self.from_path == self.to_path:
-            return dict(record)
-        destination_value = get_path(record, self.to_path)
+        return _apply_copy(self, record, ctx)
+
+    def _paths(self) -> PathDeps:
+        # The destination is read too: an existing value blocks the move unless overwrite.
+        return (self._from_parts, self._to_parts), (self._from_parts, self._to_parts)
+
+    def _apply_in_place(
+        self, record: dict[str, Any], owned: dict[int, Any], ctx: UpcastContext | None
+    ) -> None:
+        if self._each is not None:
+            _apply_element_op(self._each, record, owned, ctx)
+            return
+        value = get_path_parts(record, self._from_parts)
+        if value is MISSING or self._from_parts == self._to_parts:
+            return
+        destination_value = get_path_parts(record, self._to_parts)
         if destination_value is not MISSING and not self.overwrite:
             if ctx is not None:
-                ctx.warnings.append(
-                    f"destination '{self.to_path}' exists; move from '{self.from_path}' skipped."
-                )
-            return dict(record)
-        updated = del_path(record, self.from_path)
-        return set_path(updated, self.to_path, value)
+                ctx.report(MOVE_DESTINATION_EXISTS, "Move", self.from_path, self.to_path)
+            return
+        _del_in_place(record, self._from_parts, owned)
+        _set_in_place(record, self._to_parts, value, owned)
 
 
 @dataclass(frozen=True)
 class Coalesce:
     to_path: str
     from_paths: Sequence[str]
+    _to_parts: PathParts = field(init=False, repr=False, compare=False)
+    _from_parts: tuple[PathParts, ...] = field(init=False, repr=False, compare=False)
+    _each: ElementSplit | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_to_parts", parse_path(self.to_path))
+        object.__setattr__(self, "_from_parts", tuple(parse_path(path) for path in self.from_paths))
+        _init_each(self, ("_to_parts",), ("_from_parts",))
 
     def apply(self, record: Mapping[str, Any], ctx: UpcastContext | None = None) -> dict[str, Any]:
-        if get_path(record, self.to_path) is not MISSING:
-            return dict(record)
-        for candidate in self.from_paths:
-            value = get_path(record, candidate)
+        return _apply_copy(self, record, ctx)
+
+    def _paths(self) -> PathDeps:
+        return (self._to_parts, *self._from_parts), (self._to_parts,)
+
+    def _apply_in_place(
+        self, record: dict[str, Any], owned: dict[int, Any], ctx: UpcastContext | None
+    ) -> None:
+        if self._each is not None:
+            _apply_element_op(self._each, record, owned, ctx)
+            return
+        if get_path_parts(record, self._to_parts) is not MISSING:
+            return
+        for candidate in self._from_parts:
+            value = get_path_parts(record, candidate)
             if value is not MISSING:
-                return set_path(record, self.to_path, value)
-        return dict(record)
+                _disown(value, owned)
+                _set_in_place(record, self._to_parts, value, owned)
+                return
 
 
 @dataclass(frozen=True)
@@ -139,29 +441,197 @@ class Cast:
     path: str
     cast: Callable[[Any], Any]
     on_error: Literal["raise", "warn", "skip"] = "raise"
+    _parts: PathParts = field(init=False, repr=False, compare=False)
+    _each: ElementSplit | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_parts", parse_path(self.path))
+        _init_each(self, ("_parts",))
 
     def apply(self, record: Mapping[str, Any], ctx: UpcastContext | None = None) -> dict[str, Any]:
-        value = get_path(record, self.path)
+        return _apply_copy(self, record, ctx)
+
+    def _paths(self) -> PathDeps:
+        return (self._parts,), (self._parts,)
+
+    def _apply_in_place(
+        self, record: dict[str, Any], owned: dict[int, Any], ctx: UpcastContext | None
+    ) -> None:
+        if self._each is not None:
+            _apply_element_op(self._each, record, owned, ctx)
+            return
+        value = get_path_parts(record, self._parts)
         if value is MISSING or value is None:
-            return dict(record)
+            return
         try:
             casted = self.cast(value)
         except Exception as exc:  # noqa: BLE001 - surface in warning/ValueError by design
             if self.on_error == "raise":
                 raise ValueError(f"cast failed for path '{self.path}'.") from exc
             if self.on_error == "warn" and ctx is not None:
-                ctx.warnings.append(f"cast failed for path '{self.path}': {exc}")
-            return dict(record)
-        return set_path(record, self.path, casted)
+                ctx.report(CAST_FAILED, "Cast", self.path, exc)
+            return
+        _set_in_place(record, self._parts, casted, owned)
+
+
+_BUILTIN_OPS = (Rename, SetDefault, Drop, Move, Coalesce, Cast)
 
+# Cast callables that depend only on their argument; others must opt in with mark_pure.
+_PURE_CASTS: tuple[Any, ...] = (int, float, str, bool, bytes, list, tuple, dict)
 
-def compile_ops(
-    ops: Sequence[Op],
-) -> Callable[[Mapping[str, Any], UpcastContext | None], dict[str, Any]]:
-    def _apply(record: Mapping[str, Any], ctx: UpcastContext | None = None) -> dict[str, Any]:
+
+def _is_pure_op(op: Op) -> bool:
+    if type(op) not in _BUILTIN_OPS:
+        return False
+    if isinstance(op, Cast):
+        fn = op.cast
+        if any(fn is pure for pure in _PURE_CASTS):
+            return True
+        return bool(getattr(fn, "__schemalution_pure__", False))
+    return True
+
+
+OpsBackend = Literal["interpreted", "codegen"]
+
+
+class _ElementPipeline:
+    """Consecutive wildcard ops over one list, run in a single pass over its elements.
+
+    The element-level ops are compiled with the pipeline's backend and run once per element,
+    so warnings are reported element by element.
+    """
+
+    __slots__ = ("prefix", "mappings_only", "ops", "pipeline")
+
+    def __init__(
+        self, prefix: PathParts, mappings_only: bool, ops: Sequence[Op], backend: OpsBackend
+    ) -> None:
+        self.prefix = prefix
+        self.mappings_only = mappings_only
+        self.ops = tuple(ops)
+        self.pipeline = CompiledOps(
+            [op._each[1] for op in self.ops],  # type: ignore[attr-defined]
+            backend,
+        )
+
+    def apply(self, record: Mapping[str, Any], ctx: UpcastContext | None = None) -> dict[str, Any]:
+        return _apply_copy(self, record, ctx)
+
+    def _apply_in_place(
+        self, record: dict[str, Any], owned: dict[int, Any], ctx: UpcastContext | None
+    ) -> None:
+        _apply_each(self.prefix, self.pipeline.run_in_place, self.mappings_only, record, owned, ctx)
+
+    def __repr__(self) -> str:
+        return f"_ElementPipeline({list(self.ops)!r})"
+
+
+def _group_wildcards(ops: Sequence[Op], backend: OpsBackend) -> tuple[Any, ...]:
+    """Replace wildcard ops with _ElementPipeline steps, merging runs over the same list.
+
+    Only ops addressing keys inside mapping elements merge; ops on the elements themselves
+    (such as Drop("orders[*]")) or on nested lists run as a pipeline of their own.
+    """
+    steps: list[Any] = []
+    run: list[Op] = []
+    run_prefix: PathParts | None = None
+    for op in ops:
+        each = getattr(op, "_each", None) if type(op) in _BUILTIN_OPS else None
+        if run and (each is None or not each[2] or each[0] != run_prefix):
+            steps.append(_ElementPipeline(run_prefix or (), True, run, backend))
+            run = []
+        if each is None:
+            steps.append(op)
+        elif each[2]:
+            run.append(op)
+            run_prefix = each[0]
+        else:
+            steps.append(_ElementPipeline(each[0], False, [op], backend))
+    if run:
+        steps.append(_ElementPipeline(run_prefix or (), True, run, backend))
+    return tuple(steps)
+
+
+class CompiledOps:
+    """Pipeline of ops that runs in place on a single private copy of the record.
+
+    Nested dicts shared with the caller are copied on first write only. Ops that do not
+    support in-place execution fall back to their regular apply(). With the "codegen"
+    backend the pipeline is generated as specialized Python source, kept in `source`.
+    Consecutive ops through the same list wildcard share one pass over its elements.
+    """
+
+    __slots__ = (
+        "ops",
+        "backend",
+        "source",
+        "_steps",
+        "_generated",
+        "_generated_in_place",
+        "__schemalution_pure__",
+    )
+
+    def __init__(self, ops: Sequence[Op], backend: OpsBackend = "interpreted") -> None:
+        self.ops: tuple[Op, ...] = tuple(ops)
+        self.backend: OpsBackend = backend
+        self.source: str | None = None
+        steps = _group_wildcards(self.ops, backend)
+        self._steps = tuple((step, getattr(step, "_apply_in_place", None)) for step in steps)
+        # Built-in ops only rearrange the record, so the pipeline is cacheable (see mark_pure)
+        # unless a Cast runs a callable that is not known to be pure.
+        self.__schemalution_pure__ = all(_is_pure_op(op) for op in self.ops)
+        self._generated: Callable[[Mapping[str, Any], UpcastContext | None], dict] | None = None
+        self._generated_in_place: (
+            Callable[[dict[str, Any], dict[int, Any], UpcastContext | None], dict] | None
+        ) = None
+        if backend == "codegen":
+            from .codegen import generate_ops_function
+
+            self._generated, self._generated_in_place, self.source = generate_ops_function(steps)
+        elif backend != "interpreted":
+            raise ValueError(f"unsupported backend '{backend}'.")
+
+    def __call__(
+        self, record: Mapping[str, Any], ctx: UpcastContext | None = None
+    ) -> dict[str, Any]:
+        if self._generated is not None:
+            return self._generated(record, ctx)
         current: dict[str, Any] = dict(record)
-        for op in ops:
-            current = op.apply(current, ctx)
+        return self.run_in_place(current, {id(current): current}, ctx)
+
+    def run_in_place(
+        self, record: dict[str, Any], owned: dict[int, Any], ctx: UpcastContext | None = None
+    ) -> dict[str, Any]:
+        """Run the pipeline on a record the caller owns and return the result.
+
+        owned maps id() to every dict inside record that may be mutated; it is updated as
+        nested dicts are copied. Fallback ops may return a new record, so always use the
+        return value.
+        """
+        if self._generated_in_place is not None:
+            return self._generated_in_place(record, owned, ctx)
+        current = record
+        for op, apply_in_place in self._steps:
+            if apply_in_place is not None:
+                apply_in_place(current, owned, ctx)
+            else:
+                current = op.apply(current, ctx)
+                owned.clear()
+                owned[id(current)] = current
         return current
 
-    return _apply
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Pickle as op data; generated code and in-place bindings are rebuilt on load.
+        return (CompiledOps, (self.ops, self.backend))
+
+    def __repr__(self) -> str:
+        return f"CompiledOps({list(self.ops)!r}, backend={self.backend!r})"
+
+
+def compile_ops(ops: Sequence[Op], *, backend: OpsBackend = "interpreted") -> CompiledOps:
+    """Compile ops into a single-copy, in-place pipeline.
+
+    backend="codegen" generates straight-line Python for the op list; its output is
+    identical to the interpreted pipeline.
+    """
+    return CompiledOps(ops, backend)
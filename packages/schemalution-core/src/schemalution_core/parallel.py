@@ -0,0 +1,182 @@
+"""Process-pool parallel upcasts."""
+
+from __future__ import annotations
+
+import os
+import pickle
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from types import TracebackType
+from typing import Any
+
+from .registry import LatestLiteral, MigrationRegistry, UpcastFailure, upcast_many
+from .snapshot import RegistrySnapshot
+
+_WORKER_REGISTRY: MigrationRegistry | None = None
+
+# (results, [(offset, error)], elapsed seconds)
+_ChunkResult = tuple[list[dict[str, Any] | None], list[tuple[int, Exception]], float]
+
+
+def _init_worker(payload: bytes) -> None:
+    global _WORKER_REGISTRY
+    _WORKER_REGISTRY = RegistrySnapshot.from_bytes(payload).to_registry()
+
+
+def _upcast_chunk(
+    schema_id: str,
+    to_version: int | LatestLiteral,
+    records: list[Mapping[str, Any]],
+) -> _ChunkResult:
+    if _WORKER_REGISTRY is None:  # pragma: no cover - the pool initializer always runs first
+        raise RuntimeError("worker registry is not initialized.")
+    started = time.perf_counter()
+    failures: list[UpcastFailure] = []
+    results = upcast_many(records, schema_id, _WORKER_REGISTRY, to_version, failures=failures)
+    elapsed = time.perf_counter() - started
+    return results, [(failure.index, _picklable(failure.error)) for failure in failures], elapsed
+
+
+def _picklable(error: Exception) -> Exception:
+    try:
+        pickle.dumps(error)
+    except Exception:  # noqa: BLE001 - keep the message when the error type cannot travel
+        return RuntimeError(f"{type(error).__name__}: {error}")
+    return error
+
+
+class ParallelUpcaster:
+    """Upcast records across a process pool, returning results in input order.
+
+    Workers are initialized once with a RegistrySnapshot built from registry or from pack
+    module names. Records are sent in chunks sized so each chunk takes roughly
+    target_chunk_seconds, based on the measured per-record cost of completed chunks. Use as a
+    context manager (or call close()) to shut the pool down.
+    """
+
+    def __init__(
+        self,
+        registry: MigrationRegistry | RegistrySnapshot | None = None,
+        *,
+        pack_modules: Sequence[str] | None = None,
+        max_workers: int | None = None,
+        target_chunk_seconds: float = 0.1,
+        initial_chunk_size: int = 64,
+        min_chunk_size: int = 16,
+        max_chunk_size: int = 8192,
+        mp_context: Any = None,
+    ) -> None:
+        if (registry is None) == (pack_modules is None):
+            raise ValueError("pass exactly one of registry or pack_modules.")
+        if not 1 <= min_chunk_size <= max_chunk_size:
+            raise ValueError("chunk sizes must satisfy 1 <= min_chunk_size <= max_chunk_size.")
+        if isinstance(registry, MigrationRegistry):
+            snapshot = RegistrySnapshot.from_registry(registry)
+        elif registry is not None:
+            snapshot = registry
+        else:
+            snapshot = RegistrySnapshot.from_pack_modules(pack_modules or ())
+        self.snapshot = snapshot
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.target_chunk_seconds = target_chunk_seconds
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.chunk_size = min(max(initial_chunk_size, min_chunk_size), max_chunk_size)
+        self._per_record: float | None = None
+        self._payload = snapshot.to_bytes()
+        self._mp_context = mp_context
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> ParallelUpcaster:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self._mp_context,
+                initializer=_init_worker,
+                initargs=(self._payload,),
+            )
+        return self._pool
+
+    def _observe(self, elapsed: float, count: int) -> None:
+        if count == 0:
+            return
+        per_record = elapsed / count
+        if self._per_record is None:
+            self._per_record = per_record
+        else:
+            self._per_record = (self._per_record + per_record) / 2
+        if self._per_record > 0:
+            wanted = int(self.target_chunk_seconds / self._per_record)
+        else:
+            wanted = self.max_chunk_size
+        self.chunk_size = min(max(wanted, self.min_chunk_size), self.max_chunk_size)
+
+    def upcast_many(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        schema_id: str,
+        to_version: int | LatestLiteral = "latest",
+        *,
+        failures: list[UpcastFailure] | None = None,
+    ) -> list[dict[str, Any] | None]:
+        """Upcast records in parallel with the semantics of upcast_many.
+
+        records may be any iterable; it is consumed as chunks are submitted. When failures is
+        given, per-record errors are appended to it in index order and the record's slot is
+        None; otherwise the error of the lowest failing index is raised once in-flight chunks
+        finish. Contexts are not supported across processes.
+        """
+        pool = self._executor()
+        iterator = iter(records)
+        results: list[dict[str, Any] | None] = []
+        collected: list[UpcastFailure] = []
+        pending: dict[Future[_ChunkResult], int] = {}
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < 2 * self.max_workers:
+                if failures is None and collected:
+                    exhausted = True
+                    break
+                chunk = list(islice(iterator, self.chunk_size))
+                if not chunk:
+                    exhausted = True
+                    break
+                start = len(results)
+                results.extend([None] * len(chunk))
+                pending[pool.submit(_upcast_chunk, schema_id, to_version, chunk)] = start
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start = pending.pop(future)
+                chunk_results, chunk_failures, elapsed = future.result()
+                results[start : start + len(chunk_results)] = chunk_results
+                for offset, error in chunk_failures:
+                    collected.append(UpcastFailure(index=start + offset, error=error))
+                self._observe(elapsed, len(chunk_results))
+
+        collected.sort(key=lambda failure: failure.index)
+        if failures is None:
+            if collected:
+                raise collected[0].error
+        else:
+            failures.extend(collected)
+        return results
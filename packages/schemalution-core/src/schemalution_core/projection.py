@@ -0,0 +1,167 @@
+"""Projection-aware upcasts that only run the ops feeding the requested fields."""
+
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from .ops import MISSING, WILDCARD, CompiledOps, PathDeps, PathParts, compile_ops, parse_path
+from .registry import MigrationStep, UpcastContext, UpcastPlan, _bind_context_call
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectionPlan:
+    """An upcast plan pruned to the ops that can affect fields.
+
+    inputs lists the source paths the pruned plan reads, or is None when an opaque step
+    (a plain function or an op without dependency information) needs the whole record.
+    """
+
+    plan: UpcastPlan
+    fields: tuple[PathParts, ...]
+    inputs: tuple[PathParts, ...] | None
+    _field_trie: dict[str, Any] = field(init=False, repr=False, compare=False)
+    _input_trie: dict[str, Any] | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_field_trie", _path_trie(self.fields))
+        inputs = self.inputs
+        object.__setattr__(self, "_input_trie", None if inputs is None else _path_trie(inputs))
+
+    def apply(
+        self,
+        record: Mapping[str, Any],
+        context: UpcastContext | None = None,
+        on_step: Callable[[str, int, int], None] | None = None,
+    ) -> dict[str, Any]:
+        """Upcast record and return only fields (and schema_version) from the result."""
+        current: Mapping[str, Any] = record
+        owned: dict[int, Any] | None = None
+        if self._input_trie is not None:
+            owned = {}
+            current = _select(record, self._input_trie, owned)
+        plan = self.plan
+        for step in plan.steps:
+            current, owned = step.run(current, owned, context)
+            if context is not None:
+                context.applied_steps.append((step.from_version, step.to_version))
+            if on_step is not None:
+                on_step(plan.schema_id, step.from_version, step.to_version)
+        selected = _select(current, self._field_trie, None)
+        selected["schema_version"] = plan.to_version
+        return selected
+
+
+def select_paths(
+    record: Mapping[str, Any],
+    paths: Iterable[PathParts],
+    owned: dict[int, Any] | None = None,
+) -> dict[str, Any]:
+    """Return a sparse copy of record holding only the values at paths that exist.
+
+    Dicts along each path are new; the selected values themselves are shared with record.
+    New dicts are added to owned when given.
+    """
+    return _select(record, _path_trie(paths), owned)
+
+
+def _path_trie(paths: Iterable[PathParts]) -> dict[str, Any]:
+    trie: dict[str, Any] = {}
+    for parts in sorted(set(paths), key=len):
+        node = trie
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+            if node is MISSING:
+                break
+        else:
+            # MISSING marks "whole value"; deeper paths under it are already covered.
+            node[parts[-1]] = MISSING
+    return trie
+
+
+def _select(
+    record: Mapping[str, Any], trie: dict[str, Any], owned: dict[int, Any] | None
+) -> dict[str, Any]:
+    selected: dict[str, Any] = {}
+    if owned is not None:
+        owned[id(selected)] = selected
+    for key, node in trie.items():
+        value = record.get(key, MISSING)
+        if value is MISSING:
+            continue
+        if node is MISSING:
+            selected[key] = value
+        elif isinstance(value, Mapping):
+            child = _select(value, node, owned)
+            if child:
+                selected[key] = child
+    return selected
+
+
+def _list_path(parts: PathParts) -> PathParts:
+    # Lists are selected whole, so a path through a wildcard depends on the entire list.
+    return parts[: parts.index(WILDCARD)] if WILDCARD in parts else parts
+
+
+def _overlaps(path: PathParts, other: PathParts) -> bool:
+    # Paths overlap when one is a prefix of (or equal to) the other.
+    size = min(len(path), len(other))
+    return path[:size] == other[:size]
+
+
+def _prune_ops(
+    fn: CompiledOps, needed: set[PathParts] | None
+) -> tuple[list[Any], set[PathParts] | None]:
+    kept: list[Any] = []
+    for op in reversed(fn.ops):
+        paths = getattr(op, "_paths", None)
+        if needed is None or paths is None:
+            kept.append(op)
+            needed = None
+            continue
+        reads, writes = cast(Callable[[], PathDeps], paths)()
+        if any(_overlaps(_list_path(write), path) for write in writes for path in needed):
+            kept.append(op)
+            # Needed paths stay needed: conditional ops may leave the old value in place.
+            needed.update(_list_path(read) for read in reads)
+    kept.reverse()
+    return kept, needed
+
+
+def build_projection(plan: UpcastPlan, fields: Iterable[str]) -> ProjectionPlan:
+    """Prune plan to the ops that can affect fields, walking the steps backwards.
+
+    An op is kept when a path it writes overlaps a needed path; its reads then become
+    needed for earlier ops. Steps that are not compile_ops pipelines are kept whole and make
+    every earlier op needed. Paths through list wildcards count as the whole list.
+    """
+    targets = tuple(_list_path(parse_path(path)) for path in fields)
+    needed: set[PathParts] | None = set(targets)
+    steps: list[MigrationStep] = []
+    for step in reversed(plan.steps):
+        fn = step.fn
+        if not isinstance(fn, CompiledOps):
+            steps.append(step)
+            needed = None
+            continue
+        kept, needed = _prune_ops(fn, needed)
+        if len(kept) == len(fn.ops):
+            steps.append(step)
+            continue
+        pruned = compile_ops(kept, backend=fn.backend)
+        steps.append(
+            dataclasses.replace(
+                step,
+                fn=pruned,
+                call_with_context=_bind_context_call(pruned),
+                run_in_place=pruned.run_in_place,
+            )
+        )
+    steps.reverse()
+    return ProjectionPlan(
+        plan=dataclasses.replace(plan, steps=tuple(steps)),
+        fields=targets,
+        inputs=None if needed is None else tuple(sorted(needed)),
+    )
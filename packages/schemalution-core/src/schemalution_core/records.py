@@ -0,0 +1,122 @@
+"""Compact slotted record classes for latest-shape upcast results."""
+
+from __future__ import annotations
+
+import keyword
+import re
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, ClassVar
+
+
+class Record(Mapping[str, Any]):
+    """Read-only mapping that stores known top-level fields in __slots__.
+
+    Subclasses are generated per field list (see record_class). Declared fields live in
+    slots, so an instance costs a fixed few bytes per field instead of a dict's hash table;
+    keys outside the field list are kept in a small side dict. Nested values are stored as
+    they are. Records compare equal to dicts with the same items and pickle by value.
+    """
+
+    __slots__ = ("_extra",)
+
+    _fields: ClassVar[tuple[str, ...]] = ()
+    # field -> slot getter / setter
+    _getters: ClassVar[dict[str, Callable[[Any], Any]]] = {}
+    _setters: ClassVar[dict[str, Callable[[Any, Any], None]]] = {}
+
+    _extra: dict[str, Any] | None
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> Record:
+        """Build a record from data; nested values are shared, not copied."""
+        record = cls.__new__(cls)
+        setters = cls._setters
+        extra: dict[str, Any] | None = None
+        for key, value in data.items():
+            setter = setters.get(key)
+            if setter is not None:
+                setter(record, value)
+            elif extra is None:
+                extra = {key: value}
+            else:
+                extra[key] = value
+        record._extra = extra
+        return record
+
+    def __getitem__(self, key: str) -> Any:
+        getter = self._getters.get(key)
+        if getter is not None:
+            try:
+                return getter(self)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for key, getter in self._getters.items():
+            try:
+                getter(self)
+            except AttributeError:
+                continue
+            yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the items as a new dict (values are shared)."""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_rebuild, (type(self).__name__, self._fields, self.to_dict()))
+
+
+_RESERVED = frozenset(dir(Record))
+
+
+def _slot_name(index: int, name: str) -> str:
+    # Keep readable slot names where possible; anything that could shadow a Mapping method
+    # or is not a plain identifier gets a positional name.
+    if name.isidentifier() and not keyword.iskeyword(name) and not name.startswith("_"):
+        if name not in _RESERVED:
+            return name
+    return f"_f{index}"
+
+
+def record_class(name: str, fields: Iterable[str]) -> type[Record]:
+    """Return the Record subclass storing fields in slots (cached per name and fields)."""
+    fields = tuple(fields)
+    if len(set(fields)) != len(fields):
+        raise ValueError("record fields must be unique.")
+    if not re.fullmatch(r"[A-Za-z_]\w*", name):
+        raise ValueError(f"record class name '{name}' is not an identifier.")
+    return _record_class(name, fields)
+
+
+@lru_cache(maxsize=None)
+def _record_class(name: str, fields: tuple[str, ...]) -> type[Record]:
+    slots = tuple(_slot_name(index, field) for index, field in enumerate(fields))
+    cls = type(name, (Record,), {"__slots__": slots, "_fields": fields})
+    cls._getters = {field: attrgetter(slot) for field, slot in zip(fields, slots)}
+    cls._setters = {field: getattr(cls, slot).__set__ for field, slot in zip(fields, slots)}
+    return cls
+
+
+def _rebuild(name: str, fields: tuple[str, ...], data: dict[str, Any]) -> Record:
+    return _record_class(name, fields).from_mapping(data)
+
+
+def record_class_name(schema_id: str) -> str:
+    """Derive a class name from schema_id, e.g. crm.customer -> CrmCustomerRecord."""
+    parts = re.split(r"[^0-9A-Za-z]+", schema_id)
+    name = "".join(part[:1].upper() + part[1:] for part in parts) + "Record"
+    return name if name[0].isalpha() else f"_{name}"
@@ -3,27 +3,28 @@
 from __future__ import annotations
 
 import inspect
-from collections.abc import Callable, Mapping
-from dataclasses import dataclass, field
-from typing import Any, Literal, cast
-
+import itertools
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Literal, TypeVar, cast, overload
+
+from .diagnostics import UpcastContext
 from .errors import (
     InvalidSchemaVersionError,
     MissingSchemaVersionError,
     NoMigrationPathError,
     UnsupportedSchemaIdError,
 )
+from .metrics import UpcastMetrics
+from .records import Record, record_class, record_class_name
 
-LatestLiteral = Literal["latest"]
-
+if TYPE_CHECKING:
+    from .projection import ProjectionPlan
 
-@dataclass(slots=True)
-class UpcastContext:
-    """Collect diagnostics during upcast (warnings and soft errors)."""
-
-    applied_steps: list[tuple[int, int]] = field(default_factory=list)
-    warnings: list[str] = field(default_factory=list)
-    notes: dict[str, Any] = field(default_factory=dict)
+LatestLiteral = Literal["latest"]
 
 
 MigrationFn = (
@@ -33,6 +34,38 @@ MigrationFn = (
         dict[str, Any],
     ]
 )
+MigrationFnT = TypeVar("MigrationFnT", bound=Callable[..., Any])
+
+# Registers the migrations of declared schemas into the registry it is given.
+SchemaLoader = Callable[["MigrationRegistry"], None]
+
+
+_PURE_ATTR = "__schemalution_pure__"
+
+_registry_tokens = itertools.count()
+
+# Projections are keyed by caller-supplied field sets; bound them so ad-hoc sets cannot grow
+# the cache without limit.
+_MAX_PROJECTIONS = 1024
+
+
+def mark_pure(fn: MigrationFnT) -> MigrationFnT:
+    """Mark a migration as pure: its output depends only on the input record.
+
+    Pure migrations may be cached (see UpcastCache); they must not read clocks, randomness,
+    or external state, and must only report through the context. compile_ops pipelines are
+    pure when every Cast uses a builtin constructor (int, str, ...) or a marked function.
+    """
+    setattr(fn, _PURE_ATTR, True)
+    return fn
+
+
+InPlaceFn = Callable[[dict[str, Any], dict[int, Any], "UpcastContext | None"], dict[str, Any]]
+
+PassthroughMode = Literal["copy", "identity", "view"]
+
+# (input index, record, owned-dict map or None while the record is still the caller's)
+_BatchEntry = tuple[int, Mapping[str, Any], "dict[int, Any] | None"]
 
 
 def _ensure_int_version(value: Any, label: str) -> int:
@@ -42,11 +75,48 @@ def _ensure_int_version(value: Any, label: str) -> int:
 
 
 class MigrationRegistry:
-    """Registry for linear migrations and latest version tracking."""
+    """Registry for migration edges and latest version tracking."""
 
     def __init__(self) -> None:
-        self._migrations: dict[str, dict[int, MigrationFn]] = {}
+        # schema_id -> from_version -> to_version -> step
+        self._steps: dict[str, dict[int, dict[int, MigrationStep]]] = {}
         self._latest_versions: dict[str, int] = {}
+        self._plans: dict[tuple[str, int, int], UpcastPlan] = {}
+        self._projections: dict[tuple[str, int, int, frozenset[str]], ProjectionPlan] = {}
+        # Declared schemas whose migrations are not registered yet (see declare_schema).
+        self._loaders: dict[str, SchemaLoader] = {}
+        self._declared_edges: dict[str, tuple[tuple[int, int], ...]] = {}
+        self._loading: set[str] = set()
+        # Thread running a loader; only its registrations leave the fingerprint unchanged.
+        self._loading_thread: int | None = None
+        self._load_lock = threading.RLock()
+        self._record_fields: dict[str, tuple[str, ...]] = {}
+        self._token = next(_registry_tokens)
+        self._generation = 0
+        self.metrics: UpcastMetrics | None = None
+
+    @property
+    def fingerprint(self) -> tuple[int, int]:
+        """Identity of this registry's current contents; changes on every registration."""
+        return (self._token, self._generation)
+
+    def attach_metrics(self, metrics: UpcastMetrics) -> None:
+        """Time every migration step into metrics; plans are rebuilt with metered steps."""
+        self.metrics = metrics
+        self._clear_plans()
+
+    def detach_metrics(self) -> None:
+        self.metrics = None
+        self._clear_plans()
+
+    def _changed(self) -> None:
+        if self._loading_thread != threading.get_ident():
+            self._generation += 1
+        self._clear_plans()
+
+    def _clear_plans(self) -> None:
+        self._plans.clear()
+        self._projections.clear()
 
     def register_migration(
         self,
@@ -54,19 +124,115 @@ class MigrationRegistry:
         from_version: int,
         to_version: int,
         fn: MigrationFn,
+        *,
+        pure: bool | None = None,
     ) -> None:
-        """Register a sequential migration step (vN -> vN+1)."""
+        """Register a migration edge from from_version to to_version.
+
+        Edges are usually sequential (vN -> vN+1); longer squashed edges such as v1 -> v40 let
+        the planner skip intermediate steps (see squash_migrations). pure marks the step as
+        cacheable; when None it is read from mark_pure on fn.
+        """
         from_version = _ensure_int_version(from_version, "from_version")
         to_version = _ensure_int_version(to_version, "to_version")
-        if to_version != from_version + 1:
-            raise ValueError(
-                "Only sequential migrations are supported; to_version must equal from_version + 1."
+        if to_version <= from_version:
+            raise ValueError("to_version must be greater than from_version.")
+        step = MigrationStep(
+            from_version=from_version,
+            to_version=to_version,
+            fn=fn,
+            call_with_context=_bind_context_call(fn),
+            run_in_place=getattr(fn, "run_in_place", None),
+            pure=bool(getattr(fn, _PURE_ATTR, False)) if pure is None else pure,
+        )
+        self._steps.setdefault(schema_id, {}).setdefault(from_version, {})[to_version] = step
+        self._changed()
+
+    def declare_schema(
+        self,
+        schema_id: str,
+        latest_version: int,
+        loader: SchemaLoader,
+        *,
+        edges: Iterable[tuple[int, int]] | None = None,
+    ) -> None:
+        """Declare schema_id and its latest version, deferring migration registration.
+
+        loader(registry) registers the migrations the first time a plan or edge of schema_id
+        is needed (or on load_schema); a loader shared by several schema_ids runs once for all
+        of them. schema_ids() and latest_versions() never load; list_migrations() reports the
+        declared edges and only loads schemas declared without them. Loading does not change
+        the fingerprint, so edges and loader must describe the same migrations.
+        """
+        version = _ensure_int_version(latest_version, "latest_version")
+        if edges is None:
+            self._declared_edges.pop(schema_id, None)
+        else:
+            self._declared_edges[schema_id] = tuple(
+                sorted(
+                    (
+                        _ensure_int_version(from_version, "from_version"),
+                        _ensure_int_version(to_version, "to_version"),
+                    )
+                    for from_version, to_version in edges
+                )
             )
-        self._migrations.setdefault(schema_id, {})[from_version] = fn
+        self._latest_versions[schema_id] = version
+        self._loaders[schema_id] = loader
+        self._changed()
+
+    def load_schema(self, schema_id: str) -> None:
+        """Register the migrations of a declared schema now; no-op once loaded or if undeclared."""
+        if schema_id not in self._loaders:
+            return
+        with self._load_lock:
+            # A loader may declare schema_id again (a lazy pack inside a lazy module), so
+            # keep going until nothing is pending; re-entrant calls from a loader return.
+            while schema_id not in self._loading:
+                loader = self._loaders.get(schema_id)
+                if loader is None:
+                    return
+                # Every schema sharing the loader is in progress, so a loader reaching a
+                # sibling (directly or through a plan) does not run itself again.
+                shared = {other for other, pending in self._loaders.items() if pending is loader}
+                self._loading.update(shared)
+                outer_thread = self._loading_thread
+                self._loading_thread = threading.get_ident()
+                try:
+                    loader(self)
+                finally:
+                    self._loading_thread = outer_thread
+                    self._loading.difference_update(shared)
+                for other, pending in list(self._loaders.items()):
+                    if pending is loader:
+                        del self._loaders[other]
+                        self._declared_edges.pop(other, None)
 
     def set_latest_version(self, schema_id: str, version: int) -> None:
         version = _ensure_int_version(version, "version")
         self._latest_versions[schema_id] = version
+        self._changed()
+
+    def set_record_fields(self, schema_id: str, fields: Iterable[str]) -> None:
+        """Declare the top-level fields of schema_id's latest shape for record_class.
+
+        schema_version is added when missing. Fields do not affect migrations, so the
+        fingerprint is unchanged.
+        """
+        if isinstance(fields, str):
+            raise TypeError("fields must be an iterable of field names, not a single string.")
+        fields = tuple(fields)
+        if "schema_version" not in fields:
+            fields = ("schema_version", *fields)
+        record_class(record_class_name(schema_id), fields)
+        self._record_fields[schema_id] = fields
+
+    def record_class(self, schema_id: str) -> type[Record]:
+        """Return the slotted Record class for schema_id's latest shape (see set_record_fields)."""
+        fields = self._record_fields.get(schema_id)
+        if fields is None:
+            raise ValueError(f"no record fields are declared for schema_id '{schema_id}'.")
+        return record_class(record_class_name(schema_id), fields)
 
     def latest_version(self, schema_id: str) -> int:
         try:
@@ -77,33 +243,111 @@ class MigrationRegistry:
             ) from exc
 
     def _has_schema(self, schema_id: str) -> bool:
-        return schema_id in self._latest_versions or schema_id in self._migrations
-
-    def _migration_for(self, schema_id: str, from_version: int) -> MigrationFn | None:
-        return self._migrations.get(schema_id, {}).get(from_version)
+        return schema_id in self._latest_versions or schema_id in self._steps
+
+    def plan(self, schema_id: str, from_version: int, to_version: int) -> UpcastPlan:
+        """Return the cached migration plan from from_version to to_version.
+
+        Plans are resolved once per (schema_id, from_version, to_version) and reused until the
+        registry changes.
+        """
+        key = (schema_id, from_version, to_version)
+        cached = self._plans.get(key)
+        if cached is not None:
+            return cached
+        plan = self._build_plan(schema_id, from_version, to_version)
+        self._plans[key] = plan
+        return plan
+
+    def projection(
+        self, schema_id: str, from_version: int, to_version: int, fields: frozenset[str]
+    ) -> ProjectionPlan:
+        """Return the cached plan pruned to the ops that can affect fields (latest-shape paths)."""
+        key = (schema_id, from_version, to_version, fields)
+        cached = self._projections.get(key)
+        if cached is not None:
+            return cached
+        from .projection import build_projection
+
+        projection = build_projection(self.plan(schema_id, from_version, to_version), fields)
+        if len(self._projections) >= _MAX_PROJECTIONS:
+            self._projections.clear()
+        self._projections[key] = projection
+        return projection
+
+    def edge(self, schema_id: str, from_version: int, to_version: int) -> MigrationStep | None:
+        """Return the step registered for exactly from_version -> to_version, if any."""
+        self.load_schema(schema_id)
+        return self._steps.get(schema_id, {}).get(from_version, {}).get(to_version)
+
+    def _build_plan(self, schema_id: str, from_version: int, to_version: int) -> UpcastPlan:
+        if from_version > to_version:
+            raise _downcast_error(schema_id, from_version, to_version)
+        self.load_schema(schema_id)
+        migrations = self._steps.get(schema_id, {})
+        # Versions only move forward, so a sweep in version order finds the path with the
+        # fewest edges; ties prefer the longest jump out of each version.
+        best: dict[int, tuple[int, MigrationStep | None]] = {from_version: (0, None)}
+        for version in range(from_version, to_version):
+            reached = best.get(version)
+            if reached is None:
+                continue
+            for target in sorted(migrations.get(version, {}), reverse=True):
+                if target > to_version:
+                    continue
+                hops = reached[0] + 1
+                if target not in best or hops < best[target][0]:
+                    best[target] = (hops, migrations[version][target])
+        if to_version not in best:
+            furthest = max(best)
+            raise NoMigrationPathError(
+                f"missing migration step v{furthest} -> v{furthest + 1} for '{schema_id}'."
+            )
+        steps: list[MigrationStep] = []
+        version = to_version
+        while version != from_version:
+            step = cast(MigrationStep, best[version][1])
+            steps.append(step)
+            version = step.from_version
+        steps.reverse()
+        if self.metrics is not None:
+            steps = [_MeteredStep.wrap(step, schema_id, self.metrics) for step in steps]
+        return UpcastPlan(
+            schema_id=schema_id,
+            from_version=from_version,
+            to_version=to_version,
+            steps=tuple(steps),
+        )
 
     def schema_ids(self) -> list[str]:
         """Return all schema_ids known to the registry, sorted for determinism."""
-        return sorted(set(self._latest_versions) | set(self._migrations))
+        return sorted(set(self._latest_versions) | set(self._steps))
 
     def latest_versions(self) -> dict[str, int]:
         """Return a copy of latest version mapping."""
         return dict(self._latest_versions)
 
     def list_migrations(self) -> list[MigrationEdge]:
-        """Return sequential migration edges registered in the registry."""
-        edges: list[MigrationEdge] = []
-        for schema_id in sorted(self._migrations):
-            migrations = self._migrations[schema_id]
-            for from_version in sorted(migrations):
-                edges.append(
-                    MigrationEdge(
-                        schema_id=schema_id,
-                        from_version=from_version,
-                        to_version=from_version + 1,
-                    )
-                )
-        return edges
+        """Return migration edges registered in the registry, squashed edges included.
+
+        Declared schemas that are not loaded yet report their declared edges.
+        """
+        for schema_id in [key for key in self._loaders if key not in self._declared_edges]:
+            self.load_schema(schema_id)
+        pairs: dict[str, set[tuple[int, int]]] = {}
+        for schema_id, migrations in self._steps.items():
+            pairs[schema_id] = {
+                (from_version, to_version)
+                for from_version, targets in migrations.items()
+                for to_version in targets
+            }
+        for schema_id, declared in self._declared_edges.items():
+            pairs.setdefault(schema_id, set()).update(declared)
+        return [
+            MigrationEdge(schema_id=schema_id, from_version=from_version, to_version=to_version)
+            for schema_id in sorted(pairs)
+            for from_version, to_version in sorted(pairs[schema_id])
+        ]
 
 
 @dataclass(frozen=True, slots=True)
@@ -113,6 +357,146 @@ class MigrationEdge:
     to_version: int
 
 
+@dataclass(frozen=True, slots=True)
+class UpcastFailure:
+    """A record that could not be upcast during a batch call."""
+
+    index: int
+    error: Exception
+
+
+@dataclass(frozen=True, slots=True)
+class MigrationStep:
+    """A registered migration with its calling convention resolved at registration time."""
+
+    from_version: int
+    to_version: int
+    fn: MigrationFn
+    call_with_context: Callable[[Mapping[str, Any], UpcastContext], dict[str, Any]]
+    run_in_place: InPlaceFn | None = None
+    pure: bool = False
+
+    def apply(
+        self, record: Mapping[str, Any], context: UpcastContext | None = None
+    ) -> dict[str, Any]:
+        if context is None:
+            return cast(Callable[[Mapping[str, Any]], dict[str, Any]], self.fn)(record)
+        return self.call_with_context(record, context)
+
+    def run(
+        self,
+        record: Mapping[str, Any],
+        owned: dict[int, Any] | None,
+        context: UpcastContext | None = None,
+    ) -> tuple[dict[str, Any], dict[int, Any]]:
+        """Run the step copy-on-write and stamp schema_version on the result.
+
+        owned maps id() to the dicts inside record that belong to the running upcast, or is
+        None when record is still the caller's. Steps compiled with compile_ops mutate an
+        owned record in place, so consecutive compiled steps share one top-level copy.
+        """
+        if context is not None:
+            context.step = (self.from_version, self.to_version)
+        if self.run_in_place is not None:
+            if owned is None:
+                working = dict(record)
+                owned = {id(working): working}
+            else:
+                working = cast(dict[str, Any], record)
+            migrated = self.run_in_place(working, owned, context)
+        else:
+            # Plain migrations may mutate their argument, so the caller's record is copied.
+            migrated = self.apply(dict(record) if owned is None else record, context)
+            if not isinstance(migrated, dict):
+                migrated = dict(migrated)
+            owned = {id(migrated): migrated}
+        migrated["schema_version"] = self.to_version
+        return migrated, owned
+
+
+@dataclass(frozen=True, slots=True)
+class _MeteredStep(MigrationStep):
+    """MigrationStep that reports its latency, warnings, and failures to UpcastMetrics."""
+
+    schema_id: str = ""
+    metrics: UpcastMetrics | None = None
+
+    @classmethod
+    def wrap(cls, step: MigrationStep, schema_id: str, metrics: UpcastMetrics) -> _MeteredStep:
+        return cls(
+            from_version=step.from_version,
+            to_version=step.to_version,
+            fn=step.fn,
+            call_with_context=step.call_with_context,
+            run_in_place=step.run_in_place,
+            pure=step.pure,
+            schema_id=schema_id,
+            metrics=metrics,
+        )
+
+    def run(
+        self,
+        record: Mapping[str, Any],
+        owned: dict[int, Any] | None,
+        context: UpcastContext | None = None,
+    ) -> tuple[dict[str, Any], dict[int, Any]]:
+        # A scratch context lets warnings be counted when the caller passed none.
+        active = UpcastContext() if context is None else context
+        warnings_before = active.warning_count
+        started = time.perf_counter()
+        try:
+            result = MigrationStep.run(self, record, owned, active)
+        except Exception:
+            self._observe(time.perf_counter() - started, active.warning_count - warnings_before, 1)
+            raise
+        self._observe(time.perf_counter() - started, active.warning_count - warnings_before, 0)
+        return result
+
+    def _observe(self, seconds: float, warnings: int, failures: int) -> None:
+        cast(UpcastMetrics, self.metrics).observe(
+            self.schema_id,
+            self.from_version,
+            self.to_version,
+            seconds,
+            warnings=warnings,
+            failures=failures,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class UpcastPlan:
+    """Resolved chain of migration steps for one schema_id and version range."""
+
+    schema_id: str
+    from_version: int
+    to_version: int
+    steps: tuple[MigrationStep, ...]
+
+    @property
+    def pure(self) -> bool:
+        """True when every step is marked pure, so results may be cached."""
+        return all(step.pure for step in self.steps)
+
+    def apply(
+        self,
+        record: Mapping[str, Any],
+        context: UpcastContext | None = None,
+        on_step: Callable[[str, int, int], None] | None = None,
+    ) -> dict[str, Any]:
+        """Run every step in order, stamping schema_version after each one."""
+        if not self.steps:
+            return dict(record)
+        current_record: Mapping[str, Any] = record
+        owned: dict[int, Any] | None = None
+        for step in self.steps:
+            current_record, owned = step.run(current_record, owned, context)
+            if context is not None:
+                context.applied_steps.append((step.from_version, step.to_version))
+            if on_step is not None:
+                on_step(self.schema_id, step.from_version, step.to_version)
+        return cast(dict[str, Any], current_record)
+
+
 def _can_accept_positional_context(signature: inspect.Signature) -> bool:
     positional = 0
     for param in signature.parameters.values():
@@ -123,30 +507,76 @@ def _can_accept_positional_context(signature: inspect.Signature) -> bool:
     return positional >= 2
 
 
-def _apply_migration(
+def _bind_context_call(
     migration: MigrationFn,
-    record: Mapping[str, Any],
-    context: UpcastContext | None,
-) -> dict[str, Any]:
+) -> Callable[[Mapping[str, Any], UpcastContext], dict[str, Any]]:
+    """Resolve how a migration receives the upcast context, once per registration."""
     migration_callable = cast(Callable[..., dict[str, Any]], migration)
-    if context is None:
-        return migration_callable(record)
-
     try:
         signature = inspect.signature(migration)
     except (TypeError, ValueError):
-        return migration_callable(record, context)
+        return lambda record, context: migration_callable(record, context)
 
     params = signature.parameters
-    if any(param.kind == param.VAR_KEYWORD for param in params.values()):
-        return migration_callable(record, ctx=context)
-    if "ctx" in params:
-        return migration_callable(record, ctx=context)
+    if any(param.kind == param.VAR_KEYWORD for param in params.values()) or "ctx" in params:
+        return lambda record, context: migration_callable(record, ctx=context)
     if "context" in params:
-        return migration_callable(record, context=context)
+        return lambda record, context: migration_callable(record, context=context)
     if _can_accept_positional_context(signature):
-        return migration_callable(record, context)
-    return migration_callable(record)
+        return lambda record, context: migration_callable(record, context)
+    return lambda record, context: migration_callable(record)
+
+
+def _record_version(record: Mapping[str, Any]) -> int:
+    if "schema_version" not in record:
+        raise MissingSchemaVersionError("record is missing required 'schema_version'.")
+    return _ensure_int_version(record["schema_version"], "schema_version")
+
+
+def _target_version(
+    schema_id: str, registry: MigrationRegistry, to_version: int | LatestLiteral
+) -> int:
+    if to_version == "latest":
+        # For "latest", schema_id validation is delegated to registry.latest_version.
+        return registry.latest_version(schema_id)
+    target_version = _ensure_int_version(to_version, "to_version")
+    if not registry._has_schema(schema_id):
+        raise UnsupportedSchemaIdError(f"schema_id '{schema_id}' is not registered.")
+    return target_version
+
+
+def _downcast_error(schema_id: str, from_version: int, to_version: int) -> NoMigrationPathError:
+    return NoMigrationPathError(
+        f"cannot downcast from v{from_version} to v{to_version} for '{schema_id}'."
+    )
+
+
+@overload
+def upcast(
+    record: Mapping[str, Any],
+    schema_id: str,
+    registry: MigrationRegistry,
+    to_version: int | LatestLiteral = ...,
+    context: UpcastContext | None = ...,
+    on_step: Callable[[str, int, int], None] | None = ...,
+    *,
+    passthrough: Literal["copy"] = ...,
+    fields: Iterable[str] | None = ...,
+) -> dict[str, Any]: ...
+
+
+@overload
+def upcast(
+    record: Mapping[str, Any],
+    schema_id: str,
+    registry: MigrationRegistry,
+    to_version: int | LatestLiteral = ...,
+    context: UpcastContext | None = ...,
+    on_step: Callable[[str, int, int], None] | None = ...,
+    *,
+    passthrough: PassthroughMode,
+    fields: Iterable[str] | None = ...,
+) -> Mapping[str, Any]: ...
 
 
 def upcast(
@@ -156,48 +586,89 @@ def upcast(
     to_version: int | LatestLiteral = "latest",
     context: UpcastContext | None = None,
     on_step: Callable[[str, int, int], None] | None = None,
-) -> dict[str, Any]:
-    """Upcast a record to a target version (or latest), overwriting schema_version each step."""
-
-    if "schema_version" not in record:
-        raise MissingSchemaVersionError("record is missing required 'schema_version'.")
-    from_version = _ensure_int_version(record["schema_version"], "schema_version")
-
-    if to_version == "latest":
-        # For "latest", schema_id validation is delegated to registry.latest_version.
-        target_version = registry.latest_version(schema_id)
-    else:
-        target_version = _ensure_int_version(to_version, "to_version")
-        if not registry._has_schema(schema_id):
-            raise UnsupportedSchemaIdError(f"schema_id '{schema_id}' is not registered.")
+    *,
+    passthrough: PassthroughMode = "copy",
+    fields: Iterable[str] | None = None,
+) -> Mapping[str, Any]:
+    """Upcast a record to a target version (or latest), overwriting schema_version each step.
+
+    The input record is never mutated. A record already at the target is returned as a copy
+    by default; passthrough="identity" returns it as-is and passthrough="view" wraps it in a
+    read-only MappingProxyType, so read paths skip the copy. Migrated records are always new
+    dicts: compiled steps share one top-level copy and nested dicts are copied on first write.
+
+    fields selects dotted target-shape paths to return (plus schema_version). Only the
+    compile_ops ops that can affect them run, on a copy of just the source paths they read;
+    skipped ops raise no errors and report no warnings. passthrough does not apply.
+    """
+
+    from_version = _record_version(record)
+    target_version = _target_version(schema_id, registry, to_version)
+
+    if fields is not None:
+        if isinstance(fields, str):
+            raise TypeError("fields must be an iterable of paths, not a single string.")
+        if from_version > target_version:
+            raise _downcast_error(schema_id, from_version, target_version)
+        projection = registry.projection(schema_id, from_version, target_version, frozenset(fields))
+        return projection.apply(record, context, on_step)
 
     if from_version == target_version:
+        if passthrough == "identity":
+            return record
+        if passthrough == "view":
+            return MappingProxyType(cast(dict[str, Any], record))
+        if passthrough != "copy":
+            raise ValueError(f"unsupported passthrough mode '{passthrough}'.")
         return dict(record)
 
     if from_version > target_version:
-        raise NoMigrationPathError(
-            f"cannot downcast from v{from_version} to v{target_version} for '{schema_id}'."
-        )
+        raise _downcast_error(schema_id, from_version, target_version)
 
-    current_version = from_version
-    current_record: dict[str, Any] = dict(record)
-    while current_version < target_version:
-        from_version = current_version
-        to_version_step = current_version + 1
-        migration = registry._migration_for(schema_id, current_version)
-        if migration is None:
-            raise NoMigrationPathError(
-                f"missing migration step v{current_version} -> v{current_version + 1} "
-                f"for '{schema_id}'."
-            )
-        current_record = dict(_apply_migration(migration, current_record, context))
-        current_version += 1
-        current_record["schema_version"] = current_version
-        if context is not None:
-            context.applied_steps.append((from_version, to_version_step))
-        if on_step is not None:
-            on_step(schema_id, from_version, to_version_step)
-    return current_record
+    plan = registry.plan(schema_id, from_version, target_version)
+    return plan.apply(record, context, on_step)
+
+
+@overload
+def upcast_to_latest(
+    record: Mapping[str, Any],
+    schema_id: str,
+    registry: MigrationRegistry,
+    *,
+    context: UpcastContext | None = ...,
+    on_step: Callable[[str, int, int], None] | None = ...,
+    passthrough: Literal["copy"] = ...,
+    fields: Iterable[str] | None = ...,
+    as_record: Literal[False] = ...,
+) -> dict[str, Any]: ...
+
+
+@overload
+def upcast_to_latest(
+    record: Mapping[str, Any],
+    schema_id: str,
+    registry: MigrationRegistry,
+    *,
+    context: UpcastContext | None = ...,
+    on_step: Callable[[str, int, int], None] | None = ...,
+    passthrough: PassthroughMode,
+    fields: Iterable[str] | None = ...,
+    as_record: Literal[False] = ...,
+) -> Mapping[str, Any]: ...
+
+
+@overload
+def upcast_to_latest(
+    record: Mapping[str, Any],
+    schema_id: str,
+    registry: MigrationRegistry,
+    *,
+    context: UpcastContext | None = ...,
+    on_step: Callable[[str, int, int], None] | None = ...,
+    passthrough: PassthroughMode = ...,
+    fields: Iterable[str] | None = ...,
+    as_record: Literal[True],
+) -> Record: ...
 
 
 def upcast_to_latest(
@@ -207,14 +678,144 @@ def upcast_to_latest(
     *,
     context: UpcastContext | None = None,
     on_step: Callable[[str, int, int], None] | None = None,
-) -> dict[str, Any]:
-    """Upcast a record to the latest schema version for schema_id."""
-
-    return upcast(
+    passthrough: PassthroughMode = "copy",
+    fields: Iterable[str] | None = None,
+    as_record: bool = False,
+) -> Mapping[str, Any]:
+    """Upcast a record to the latest schema version for schema_id (see upcast for fields).
+
+    as_record=True returns an instance of registry.record_class(schema_id) instead of a
+    dict; passthrough does not apply since the record is always a new object.
+    """
+
+    if not as_record:
+        return upcast(
+            record,
+            schema_id,
+            registry,
+            "latest",
+            context=context,
+            on_step=on_step,
+            passthrough=passthrough,
+            fields=fields,
+        )
+    cls = registry.record_class(schema_id)
+    migrated = upcast(
         record,
         schema_id,
         registry,
         "latest",
         context=context,
         on_step=on_step,
+        passthrough="identity",
+        fields=fields,
     )
+    return cls.from_mapping(migrated)
+
+
+@overload
+def upcast_many(
+    records: Iterable[Mapping[str, Any]],
+    schema_id: str,
+    registry: MigrationRegistry,
+    to_version: int | LatestLiteral = ...,
+    *,
+    context: UpcastContext | None = ...,
+    failures: list[UpcastFailure] | None = ...,
+    as_record: Literal[False] = ...,
+) -> list[dict[str, Any] | None]: ...
+
+
+@overload
+def upcast_many(
+    records: Iterable[Mapping[str, Any]],
+    schema_id: str,
+    registry: MigrationRegistry,
+    to_version: int | LatestLiteral = ...,
+    *,
+    context: UpcastContext | None = ...,
+    failures: list[UpcastFailure] | None = ...,
+    as_record: Literal[True],
+) -> list[Record | None]: ...
+
+
+def upcast_many(
+    records: Iterable[Mapping[str, Any]],
+    schema_id: str,
+    registry: MigrationRegistry,
+    to_version: int | LatestLiteral = "latest",
+    *,
+    context: UpcastContext | None = None,
+    failures: list[UpcastFailure] | None = None,
+    as_record: bool = False,
+) -> list[dict[str, Any] | None] | list[Record | None]:
+    """Upcast a batch of records, running each migration step once per version group.
+
+    Records are bucketed by schema_version; each step runs over a whole bucket and the
+    migrated records merge into the next bucket. Results are returned in input order.
+    When failures is given, per-record errors are appended to it and the record's slot is
+    None; otherwise the first error is raised. A shared context sees every migration call
+    and records each executed step once per group; its record_id is set to the input index
+    of the record being migrated. as_record=True (latest only) builds each result as an
+    instance of registry.record_class(schema_id) instead of a dict.
+    """
+
+    target_version = _target_version(schema_id, registry, to_version)
+    finish: Callable[[Mapping[str, Any]], Any] = dict
+    if as_record:
+        if target_version != registry.latest_version(schema_id):
+            raise ValueError("as_record requires upcasting to the latest version.")
+        finish = registry.record_class(schema_id).from_mapping
+    results: list[Any] = []
+    buckets: dict[int, list[_BatchEntry]] = {}
+
+    def _fail(index: int, exc: Exception) -> None:
+        if failures is None:
+            raise exc
+        failures.append(UpcastFailure(index=index, error=exc))
+
+    for index, record in enumerate(records):
+        results.append(None)
+        try:
+            version = _record_version(record)
+            if version > target_version:
+                raise _downcast_error(schema_id, version, target_version)
+        except Exception as exc:  # noqa: BLE001 - collected per record by design
+            _fail(index, exc)
+            continue
+        if version == target_version:
+            results[index] = finish(record)
+        else:
+            buckets.setdefault(version, []).append((index, record, None))
+
+    while buckets:
+        version = min(buckets)
+        group = buckets.pop(version)
+        try:
+            step = registry.plan(schema_id, version, target_version).steps[0]
+        except NoMigrationPathError as exc:
+            for index, _, _ in group:
+                _fail(index, exc)
+            continue
+
+        run = step.run
+        step_version = step.to_version
+        migrated: list[_BatchEntry] = []
+        for index, record, owned in group:
+            if context is not None:
+                context.record_id = index
+            try:
+                updated, owned = run(record, owned, context)
+            except Exception as exc:  # noqa: BLE001 - collected per record by design
+                _fail(index, exc)
+                continue
+            migrated.append((index, updated, owned))
+
+        if context is not None and migrated:
+            context.applied_steps.append((step.from_version, step_version))
+        if step_version == target_version:
+            for index, updated, _ in migrated:
+                results[index] = finish(updated) if as_record else updated
+        else:
+            buckets.setdefault(step_version, []).extend(migrated)
+    return results
@@ -0,0 +1,174 @@
+"""Picklable, frozen registry snapshots for shipping to worker processes."""
+
+from __future__ import annotations
+
+import importlib
+import io
+import pickle
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from .ops import CompiledOps, Op, OpsBackend
+from .registry import MigrationRegistry
+
+SNAPSHOT_FORMAT = 1
+
+
+@dataclass(frozen=True, slots=True)
+class EdgeSnapshot:
+    """One migration edge as declarative op data or a module-level function reference.
+
+    payload is (backend, ops) for kind "ops" and (module, qualname) for kind "ref".
+    """
+
+    schema_id: str
+    from_version: int
+    to_version: int
+    kind: Literal["ops", "ref"]
+    payload: tuple[Any, Any]
+    pure: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class RegistrySnapshot:
+    """Frozen description of a registry that rebuilds identical plans in another process.
+
+    Pack modules are re-imported and registered first, then captured edges and latest
+    versions are applied on top. compile_ops steps travel as their op data (codegen source is
+    regenerated on load); other migrations travel as references to module-level functions.
+    """
+
+    latest_versions: tuple[tuple[str, int], ...] = ()
+    edges: tuple[EdgeSnapshot, ...] = ()
+    pack_modules: tuple[str, ...] = ()
+
+    @classmethod
+    def from_registry(cls, registry: MigrationRegistry) -> RegistrySnapshot:
+        """Capture every edge and latest version of registry.
+
+        Raises ValueError for migrations that cannot be shipped: closures, lambdas, bound
+        methods, or op lists holding unpicklable cast functions.
+        """
+        edges: list[EdgeSnapshot] = []
+        for edge in registry.list_migrations():
+            step = registry.edge(edge.schema_id, edge.from_version, edge.to_version)
+            if step is None:  # pragma: no cover - list_migrations only returns known edges
+                continue
+            label = f"migration v{edge.from_version} -> v{edge.to_version} for '{edge.schema_id}'"
+            fn = step.fn
+            if isinstance(fn, CompiledOps):
+                try:
+                    _OpsPickler(io.BytesIO(), protocol=pickle.HIGHEST_PROTOCOL).dump(fn.ops)
+                except Exception as exc:  # noqa: BLE001 - reported with the offending edge
+                    raise ValueError(f"{label} holds ops that cannot be pickled: {exc}") from exc
+                kind: Literal["ops", "ref"] = "ops"
+                payload: tuple[Any, Any] = (fn.backend, fn.ops)
+            else:
+                kind = "ref"
+                payload = _function_reference(fn, label)
+            edges.append(
+                EdgeSnapshot(
+                    schema_id=edge.schema_id,
+                    from_version=edge.from_version,
+                    to_version=edge.to_version,
+                    kind=kind,
+                    payload=payload,
+                    pure=step.pure,
+                )
+            )
+        return cls(
+            latest_versions=tuple(sorted(registry.latest_versions().items())),
+            edges=tuple(edges),
+        )
+
+    @classmethod
+    def from_pack_modules(cls, modules: Iterable[str]) -> RegistrySnapshot:
+        """Snapshot that rebuilds the registry by importing and registering pack modules.
+
+        Each module must expose PACK.register(registry) or register(registry).
+        """
+        return cls(pack_modules=tuple(modules))
+
+    def to_bytes(self) -> bytes:
+        return pickle.dumps((SNAPSHOT_FORMAT, self), protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> RegistrySnapshot:
+        loaded = pickle.loads(data)  # noqa: S301 - snapshots are produced by to_bytes
+        if not isinstance(loaded, tuple) or len(loaded) != 2 or loaded[0] != SNAPSHOT_FORMAT:
+            raise ValueError("unsupported registry snapshot format.")
+        snapshot = loaded[1]
+        if not isinstance(snapshot, cls):
+            raise ValueError("unsupported registry snapshot format.")
+        return snapshot
+
+    def to_registry(self) -> MigrationRegistry:
+        """Build a fresh registry from the snapshot."""
+        registry = MigrationRegistry()
+        for module_name in self.pack_modules:
+            register_pack_module(registry, module_name)
+        for edge in self.edges:
+            if edge.kind == "ops":
+                backend: OpsBackend = edge.payload[0]
+                ops: tuple[Op, ...] = edge.payload[1]
+                fn: Any = CompiledOps(ops, backend)
+            else:
+                fn = _resolve_reference(*edge.payload)
+            registry.register_migration(
+                edge.schema_id, edge.from_version, edge.to_version, fn, pure=edge.pure
+            )
+        for schema_id, version in self.latest_versions:
+            registry.set_latest_version(schema_id, version)
+        return registry
+
+
+def register_pack_module(registry: MigrationRegistry, module_name: str) -> None:
+    """Import a pack module and register it via PACK.register() or register()."""
+    module = importlib.import_module(module_name)
+    pack_obj = getattr(module, "PACK", None)
+    if pack_obj is not None and hasattr(pack_obj, "register"):
+        pack_obj.register(registry)
+    elif hasattr(module, "register"):
+        module.register(registry)
+    else:
+        raise ValueError(f"pack module '{module_name}' does not expose register() or PACK.")
+
+
+def _function_reference(fn: Any, label: str) -> tuple[str, str]:
+    module = getattr(fn, "__module__", None)
+    qualname = getattr(fn, "__qualname__", None)
+    if not module or not qualname or "<" in qualname:
+        raise ValueError(
+            f"{label} is not a module-level function; use compile_ops or a module-level "
+            "function so it can be shipped by reference."
+        )
+    if module == "__main__":
+        # Workers (spawned processes, Spark executors) have a different __main__.
+        raise ValueError(
+            f"{label} is defined in __main__ and cannot be resolved in a worker; move it "
+            "into an importable module."
+        )
+    try:
+        resolved = _resolve_reference(module, qualname)
+    except (ImportError, AttributeError) as exc:
+        raise ValueError(f"{label} cannot be resolved as {module}.{qualname}.") from exc
+    if resolved is not fn:
+        raise ValueError(f"{label} does not match {module}.{qualname}.")
+    return module, qualname
+
+
+class _OpsPickler(pickle.Pickler):
+    """Pickler that rejects references into __main__, which workers cannot import."""
+
+    def reducer_override(self, obj: Any) -> Any:
+        if callable(obj) and getattr(obj, "__module__", None) == "__main__":
+            raise pickle.PicklingError(f"{obj!r} is defined in __main__")
+        return NotImplemented
+
+
+def _resolve_reference(module_name: str, qualname: str) -> Any:
+    target: Any = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target
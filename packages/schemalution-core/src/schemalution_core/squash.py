@@ -0,0 +1,154 @@
+"""Squashed migration edges derived from declarative op lists."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, cast
+
+from .errors import NoMigrationPathError
+from .ops import _BUILTIN_OPS, Coalesce, CompiledOps, Op, OpsBackend, compile_ops
+from .registry import (
+    MigrationEdge,
+    MigrationRegistry,
+    MigrationStep,
+    UpcastContext,
+    UpcastPlan,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SquashMismatch:
+    """A fixture whose squashed result differs from the step-by-step chain."""
+
+    index: int
+    expected: Any
+    actual: Any
+
+
+def _squashable(step: MigrationStep) -> bool:
+    """True for compile_ops steps whose ops are built-in and never touch schema_version.
+
+    Intermediate versions are stamped between sequential steps, so ops reading or writing
+    schema_version cannot be concatenated safely; custom ops cannot be analysed at all.
+    """
+    if not isinstance(step.fn, CompiledOps):
+        return False
+    return all(type(op) in _BUILTIN_OPS and not _touches_version(op) for op in step.fn.ops)
+
+
+def _touches_version(op: Op) -> bool:
+    if isinstance(op, Coalesce):
+        paths = [op._to_parts, *op._from_parts]
+    else:
+        paths = [
+            getattr(op, name)
+            for name in ("_parts", "_from_parts", "_to_parts")
+            if hasattr(op, name)
+        ]
+    return any(parts[0] == "schema_version" for parts in paths)
+
+
+def squash_migrations(
+    registry: MigrationRegistry,
+    schema_id: str,
+    *,
+    min_steps: int = 2,
+    backend: OpsBackend | None = None,
+) -> list[MigrationEdge]:
+    """Register squashed edges for runs of sequential compile_ops steps and return them.
+
+    For every run of consecutive squashable steps vA -> ... -> vB, an edge vN -> vB is derived
+    for each start version spanning at least min_steps steps, so records at any version in the
+    run reach vB in one step with one op pipeline. Existing edges are left untouched. backend
+    defaults to the backend of the run's last step. Use verify_squashed_edge to check the
+    derived edges against the sequential chain on fixtures.
+    """
+    if min_steps < 2:
+        raise ValueError("min_steps must be at least 2.")
+    if schema_id not in registry.schema_ids():
+        return []
+    latest = registry.latest_version(schema_id)
+    edges: list[MigrationEdge] = []
+    version = min((edge.from_version for edge in _sequential(registry, schema_id)), default=latest)
+    while version < latest:
+        run: list[MigrationStep] = []
+        step = registry.edge(schema_id, version, version + 1)
+        while step is not None and _squashable(step):
+            run.append(step)
+            step = registry.edge(schema_id, step.to_version, step.to_version + 1)
+        for start in range(len(run) - min_steps + 1):
+            chain = run[start:]
+            from_version = chain[0].from_version
+            to_version = chain[-1].to_version
+            if registry.edge(schema_id, from_version, to_version) is not None:
+                continue
+            fns = [cast(CompiledOps, step.fn) for step in chain]
+            squashed = compile_ops(
+                [op for fn in fns for op in fn.ops],
+                backend=backend or fns[-1].backend,
+            )
+            registry.register_migration(
+                schema_id,
+                from_version,
+                to_version,
+                squashed,
+                pure=all(step.pure for step in chain),
+            )
+            edges.append(MigrationEdge(schema_id, from_version, to_version))
+        version += max(len(run), 1)
+    return edges
+
+
+def _sequential(registry: MigrationRegistry, schema_id: str) -> list[MigrationEdge]:
+    return [
+        edge
+        for edge in registry.list_migrations()
+        if edge.schema_id == schema_id and edge.to_version == edge.from_version + 1
+    ]
+
+
+def verify_squashed_edge(
+    registry: MigrationRegistry,
+    schema_id: str,
+    from_version: int,
+    to_version: int,
+    fixtures: Iterable[Mapping[str, Any]],
+) -> list[SquashMismatch]:
+    """Run fixtures through a squashed edge and through the sequential chain.
+
+    Returns one SquashMismatch per fixture whose migrated record, warnings, or raised error
+    differ; an empty list means the edge is equivalent on these fixtures.
+    """
+    squashed = registry.edge(schema_id, from_version, to_version)
+    if squashed is None:
+        raise NoMigrationPathError(
+            f"no edge v{from_version} -> v{to_version} registered for '{schema_id}'."
+        )
+    chain: list[MigrationStep] = []
+    for version in range(from_version, to_version):
+        step = registry.edge(schema_id, version, version + 1)
+        if step is None:
+            raise NoMigrationPathError(
+                f"missing migration step v{version} -> v{version + 1} for '{schema_id}'."
+            )
+        chain.append(step)
+
+    sequential = UpcastPlan(schema_id, from_version, to_version, tuple(chain))
+    direct = UpcastPlan(schema_id, from_version, to_version, (squashed,))
+    mismatches: list[SquashMismatch] = []
+    for index, record in enumerate(fixtures):
+        expected = _outcome(sequential, record)
+        actual = _outcome(direct, record)
+        if expected != actual:
+            mismatches.append(SquashMismatch(index=index, expected=expected, actual=actual))
+    return mismatches
+
+
+def _outcome(plan: UpcastPlan, record: Mapping[str, Any]) -> tuple[Any, list[str]]:
+    context = UpcastContext()
+    try:
+        migrated: Any = plan.apply(record, context)
+    except Exception as exc:  # noqa: BLE001 - errors are part of the compared outcome
+        migrated = (type(exc).__name__, str(exc))
+    return migrated, context.warnings
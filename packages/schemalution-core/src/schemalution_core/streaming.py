@@ -0,0 +1,118 @@
+"""asyncio streaming upcasts with bounded micro-batches."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterable, Mapping
+from concurrent.futures import Executor
+from typing import Any
+
+from .registry import LatestLiteral, MigrationRegistry, UpcastFailure, upcast_many
+
+# (results, failures re-indexed to stream positions)
+_BatchResult = tuple[list[dict[str, Any] | None], list[UpcastFailure]]
+
+
+def _run_batch(
+    batch: list[Mapping[str, Any]],
+    start: int,
+    schema_id: str,
+    registry: MigrationRegistry,
+    to_version: int | LatestLiteral,
+    collect: bool,
+) -> _BatchResult:
+    if not collect:
+        return upcast_many(batch, schema_id, registry, to_version), []
+    failures: list[UpcastFailure] = []
+    results = upcast_many(batch, schema_id, registry, to_version, failures=failures)
+    return results, [UpcastFailure(start + failure.index, failure.error) for failure in failures]
+
+
+async def upcast_stream(
+    records: AsyncIterable[Mapping[str, Any]],
+    schema_id: str,
+    registry: MigrationRegistry,
+    to_version: int | LatestLiteral = "latest",
+    *,
+    batch_size: int = 256,
+    max_in_flight: int = 4,
+    max_batch_delay: float | None = 0.01,
+    executor: Executor | None = None,
+    failures: list[UpcastFailure] | None = None,
+) -> AsyncGenerator[dict[str, Any] | None, None]:
+    """Upcast an async stream of records, yielding results in input order.
+
+    Records are grouped into micro-batches of up to batch_size and run with upcast_many on
+    executor (the loop's default thread pool when None), so the event loop never runs
+    migrations itself. At most max_in_flight batches are outstanding; while that many are
+    running the source is not read, which propagates backpressure upstream. A partial batch
+    is dispatched when the source produces nothing for max_batch_delay seconds (None waits
+    for a full batch). Failures follow upcast_many: collected into failures with stream
+    indices (slot yields None), or raised when failures is None.
+    """
+    if batch_size < 1 or max_in_flight < 1:
+        raise ValueError("batch_size and max_in_flight must be positive.")
+    loop = asyncio.get_running_loop()
+    iterator = records.__aiter__()
+    pending: deque[asyncio.Future[_BatchResult]] = deque()
+    batch: list[Mapping[str, Any]] = []
+    consumed = 0
+    fetch: asyncio.Future[Any] | None = None
+    exhausted = False
+
+    def dispatch() -> None:
+        nonlocal batch
+        pending.append(
+            loop.run_in_executor(
+                executor,
+                _run_batch,
+                batch,
+                consumed - len(batch),
+                schema_id,
+                registry,
+                to_version,
+                failures is not None,
+            )
+        )
+        batch = []
+
+    try:
+        while True:
+            can_dispatch = len(pending) < max_in_flight
+            if batch and can_dispatch and (exhausted or len(batch) >= batch_size):
+                dispatch()
+                can_dispatch = len(pending) < max_in_flight
+            if fetch is None and not exhausted and can_dispatch and len(batch) < batch_size:
+                fetch = asyncio.ensure_future(iterator.__anext__())
+            waiters: set[asyncio.Future[Any]] = {pending[0]} if pending else set()
+            if fetch is not None:
+                waiters.add(fetch)
+            if not waiters:
+                return
+            flush_partial = batch and fetch is not None and can_dispatch
+            idle_timeout = max_batch_delay if flush_partial else None
+            done, _ = await asyncio.wait(
+                waiters, timeout=idle_timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                dispatch()
+                continue
+            if fetch is not None and fetch.done():
+                try:
+                    batch.append(fetch.result())
+                    consumed += 1
+                except StopAsyncIteration:
+                    exhausted = True
+                fetch = None
+            while pending and pending[0].done():
+                results, batch_failures = pending.popleft().result()
+                if failures is not None:
+                    failures.extend(batch_failures)
+                for result in results:
+                    yield result
+    finally:
+        if fetch is not None:
+            fetch.cancel()
+        for future in pending:
+            future.cancel()
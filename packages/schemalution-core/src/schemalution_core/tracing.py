@@ -0,0 +1,179 @@
+"""Sampling tracer for slow or sampled upcasts."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from .registry import (
+    LatestLiteral,
+    MigrationRegistry,
+    UpcastContext,
+    _record_version,
+    _target_version,
+    upcast,
+)
+
+TraceReason = Literal["sampled", "slow", "error"]
+
+
+@dataclass(frozen=True, slots=True)
+class UpcastTrace:
+    """One captured upcast: where it started, how long each step took, and what it reported."""
+
+    schema_id: str
+    from_version: int | None
+    to_version: int | None
+    reason: TraceReason
+    started_at: float
+    total_seconds: float
+    steps: tuple[tuple[int, int, float], ...]
+    record_bytes: int | None
+    warnings: tuple[str, ...]
+    record_key: Any = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "schema_id": self.schema_id,
+            "from_version": self.from_version,
+            "to_version": self.to_version,
+            "reason": self.reason,
+            "started_at": self.started_at,
+            "total_seconds": self.total_seconds,
+            "steps": [
+                {"from_version": from_v, "to_version": to_v, "seconds": seconds}
+                for from_v, to_v, seconds in self.steps
+            ],
+            "record_bytes": self.record_bytes,
+            "warnings": list(self.warnings),
+            "record_key": self.record_key,
+            "error": self.error,
+        }
+
+
+class UpcastTracer:
+    """Wrap upcast and keep recent sampled or slow calls in a bounded ring buffer.
+
+    Every sample_every-th call is captured (0 disables sampling), as is any call slower than
+    slow_threshold seconds (None disables it) and any call that raises. Untraced calls pay
+    for a clock read per step; record size (JSON bytes) and record_key are only computed for
+    captured calls. record_key extracts an identifier such as the document id so offending
+    records can be found without storing their contents.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_every: int = 1000,
+        slow_threshold: float | None = 0.001,
+        capacity: int = 256,
+        record_key: Callable[[Mapping[str, Any]], Any] | None = None,
+    ) -> None:
+        if sample_every < 0 or capacity < 1:
+            raise ValueError("sample_every must be >= 0 and capacity must be positive.")
+        self.sample_every = sample_every
+        self.slow_threshold = slow_threshold
+        self.record_key = record_key
+        self._buffer: deque[UpcastTrace] = deque(maxlen=capacity)
+        self._calls = itertools.count()
+
+    def upcast(
+        self,
+        record: Mapping[str, Any],
+        schema_id: str,
+        registry: MigrationRegistry,
+        to_version: int | LatestLiteral = "latest",
+        *,
+        context: UpcastContext | None = None,
+    ) -> dict[str, Any]:
+        """Upcast like schemalution_core.upcast, tracing the call when it is selected."""
+        # Run on a private context so captured warnings are this call's; merged back below.
+        active = UpcastContext(render_warnings=context is None or context.render_warnings)
+        if context is not None:
+            active.record_id = context.record_id
+        marks: list[tuple[int, int, float]] = []
+        clock = time.perf_counter
+
+        def on_step(_: str, from_v: int, to_v: int) -> None:
+            marks.append((from_v, to_v, clock()))
+
+        sampled = self.sample_every > 0 and next(self._calls) % self.sample_every == 0
+        started_at = time.time()
+        started = clock()
+
+        def capture(reason: TraceReason, finished: float, error: Exception | None) -> None:
+            steps: list[tuple[int, int, float]] = []
+            previous = started
+            for from_v, to_v, mark in marks:
+                steps.append((from_v, to_v, mark - previous))
+                previous = mark
+            key = self.record_key
+            self._buffer.append(
+                UpcastTrace(
+                    schema_id=schema_id,
+                    from_version=_safe(lambda: _record_version(record)),
+                    to_version=_safe(lambda: _target_version(schema_id, registry, to_version)),
+                    reason=reason,
+                    started_at=started_at,
+                    total_seconds=finished - started,
+                    steps=tuple(steps),
+                    record_bytes=_safe(lambda: len(json.dumps(record, default=str).encode())),
+                    warnings=_trace_warnings(active),
+                    record_key=None if key is None else _safe(lambda: key(record)),
+                    error=None if error is None else f"{type(error).__name__}: {error}",
+                )
+            )
+
+        try:
+            result = upcast(record, schema_id, registry, to_version, active, on_step)
+            finished = clock()
+        except Exception as exc:
+            capture("error", clock(), exc)
+            raise
+        finally:
+            if context is not None:
+                context.extend(active)
+        slow = self.slow_threshold is not None and finished - started > self.slow_threshold
+        if sampled or slow:
+            capture("slow" if slow else "sampled", finished, None)
+        return result
+
+    def upcast_to_latest(
+        self,
+        record: Mapping[str, Any],
+        schema_id: str,
+        registry: MigrationRegistry,
+        *,
+        context: UpcastContext | None = None,
+    ) -> dict[str, Any]:
+        return self.upcast(record, schema_id, registry, "latest", context=context)
+
+    def dump(self) -> list[UpcastTrace]:
+        """Return captured traces, oldest first."""
+        return list(self._buffer)
+
+    def dump_json(self) -> str:
+        return json.dumps([trace.to_dict() for trace in self._buffer], default=str)
+
+    def clear(self) -> None:
+        self._buffer.clear()
+
+
+def _safe(fn: Callable[[], Any]) -> Any:
+    try:
+        return fn()
+    except Exception:  # noqa: BLE001 - traces describe failing records too
+        return None
+
+
+def _trace_warnings(context: UpcastContext) -> tuple[str, ...]:
+    if context.render_warnings:
+        return tuple(context.warnings)
+    # Rendered only for captured traces; diagnostics follow the free-form warnings.
+    return (*context.warnings, *(diagnostic.message for diagnostic in context.diagnostics))
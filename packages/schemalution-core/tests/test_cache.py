@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from schemalution_core import (
+    MigrationRegistry,
+    UpcastCache,
+    UpcastContext,
+    compile_ops,
+    mark_pure,
+    ops,
+)
+
+CALLS: list[int] = []
+
+
+@mark_pure
+def _v1_to_v2(record: Mapping[str, Any], ctx: UpcastContext | None = None) -> dict[str, Any]:
+    CALLS.append(1)
+    if ctx is not None:
+        ctx.warnings.append("v1->v2 filled tags")
+    updated = dict(record)
+    updated["tags"] = {"seen": True}
+    return updated
+
+
+def _impure(record: Mapping[str, Any]) -> dict[str, Any]:
+    CALLS.append(2)
+    return dict(record)
+
+
+def _build_registry() -> MigrationRegistry:
+    registry = MigrationRegistry()
+    registry.register_migration("crm.customer", 1, 2, _v1_to_v2)
+    registry.register_migration("crm.customer", 2, 3, compile_ops([ops.Rename("name", "n")]))
+    registry.set_latest_version("crm.customer", 3)
+    return registry
+
+
+@pytest.fixture(autouse=True)
+def _reset_calls() -> None:
+    CALLS.clear()
+
+
+def test_hits_skip_migrations_and_replay_context() -> None:
+    cache = UpcastCache(_build_registry())
+    record = {"schema_version": 1, "name": "Ada"}
+
+    first = cache.upcast_to_latest(record, "crm.customer")
+    context = UpcastContext()
+    second = cache.upcast_to_latest(dict(record), "crm.customer", context=context)
+
+    assert first == second == {"schema_version": 3, "n": "Ada", "tags": {"seen": True}}
+    assert CALLS == [1]
+    assert context.warnings == ["v1->v2 filled tags"]
+    assert context.applied_steps == [(1, 2), (2, 3)]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_hits_return_defensive_copies() -> None:
+    cache = UpcastCache(_build_registry())
+    record = {"schema_version": 1, "name": "Ada"}
+
+    cache.upcast_to_latest(record, "crm.customer")["tags"]["seen"] = False
+    hit = cache.upcast_to_latest(record, "crm.customer")
+    hit["tags"]["seen"] = False
+
+    assert cache.upcast_to_latest(record, "crm.customer")["tags"] == {"seen": True}
+
+
+def test_impure_steps_bypass_the_cache() -> None:
+    registry = _build_registry()
+    registry.register_migration("crm.customer", 2, 3, _impure)
+    cache = UpcastCache(registry)
+
+    for _ in range(2):
+        cache.upcast_to_latest({"schema_version": 1}, "crm.customer")
+
+    assert CALLS == [1, 2, 1, 2]
+    assert cache.stats().bypassed == 2
+
+
+def test_register_migration_pure_flag_overrides_marker() -> None:
+    registry = _build_registry()
+    registry.register_migration("crm.customer", 1, 2, _v1_to_v2, pure=False)
+
+    assert not registry.plan("crm.customer", 1, 3).pure
+    assert registry.plan("crm.customer", 2, 3).pure
+
+
+def test_registry_changes_invalidate_entries() -> None:
+    registry = _build_registry()
+    cache = UpcastCache(registry)
+    cache.upcast_to_latest({"schema_version": 1}, "crm.customer")
+
+    registry.register_migration("crm.customer", 2, 3, compile_ops([ops.SetDefault("x", 1)]))
+    migrated = cache.upcast_to_latest({"schema_version": 1}, "crm.customer")
+
+    assert migrated["x"] == 1
+    assert cache.stats().misses == 2
+
+
+def test_lru_eviction_by_entries_and_bytes() -> None:
+    cache = UpcastCache(_build_registry(), max_entries=2)
+    for index in range(3):
+        cache.upcast_to_latest({"schema_version": 2, "name": index}, "crm.customer")
+    cache.upcast_to_latest({"schema_version": 2, "name": 2}, "crm.customer")
+
+    stats = cache.stats()
+    assert (stats.entries, stats.evictions, stats.hits) == (2, 1, 1)
+
+    tiny = UpcastCache(_build_registry(), max_bytes=16)
+    tiny.upcast_to_latest({"schema_version": 2, "name": "Ada"}, "crm.customer")
+    assert tiny.stats().entries == 0
+
+
+def test_keys_ignore_key_order_and_sharing_but_keep_types() -> None:
+    cache = UpcastCache(_build_registry())
+    shared = ["x"]
+
+    cache.upcast_to_latest(
+        {"schema_version": 1, "name": "Ada", "a": shared, "b": shared}, "crm.customer"
+    )
+    cache.upcast_to_latest(
+        {"b": ["x"], "a": ["x"], "name": "Ada", "schema_version": 1}, "crm.customer"
+    )
+    assert cache.stats().hits == 1
+
+    for value in (1, 1.0, True, (1,), [1]):
+        cache.upcast_to_latest({"schema_version": 1, "name": value}, "crm.customer")
+    assert cache.stats().misses == 6
+
+
+def test_cast_pipelines_are_pure_only_with_known_callables() -> None:
+    @mark_pure
+    def _upper(value: str) -> str:
+        return value.upper()
+
+    assert compile_ops([ops.Cast("a", int)]).__schemalution_pure__
+    assert compile_ops([ops.Cast("a", _upper)]).__schemalution_pure__
+    assert not compile_ops([ops.Cast("a", lambda value: value)]).__schemalution_pure__
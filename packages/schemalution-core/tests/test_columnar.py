@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import builtins
+import sys
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from schemalution_core import (
+    MigrationRegistry,
+    RecordBatch,
+    UpcastContext,
+    compile_ops,
+    upcast_batch,
+    upcast_many,
+)
+from schemalution_core.errors import MissingSchemaVersionError
+from schemalution_core.ops import MISSING, Cast, Coalesce, Drop, Move, Rename, SetDefault
+
+RECORDS: list[dict[str, Any]] = [
+    {"customerId": "c-1", "age": "42", "email": "ada@example.com", "contact": {"phone": "1"}},
+    {"customerId": "c-2", "age": "bad", "contact": {"email": "kai@example.com"}},
+    {"age": None, "email": "lin@example.com", "contact": "legacy"},
+    {},
+]
+
+
+def _row_results(ops: list[Any]) -> tuple[list[dict[str, Any]], list[list[str]]]:
+    fn = compile_ops(ops)
+    contexts = [UpcastContext() for _ in RECORDS]
+    results = [fn(record, context) for record, context in zip(RECORDS, contexts)]
+    return results, [context.warnings for context in contexts]
+
+
+@pytest.mark.parametrize(
+    "ops",
+    [
+        [Rename("customerId", "customer_id")],
+        [Rename("contact", "profile.contact", keep_source=True)],
+        [Move("email", "contact.email", overwrite=False)],
+        [Move("email", "contact.email", overwrite=True)],
+        [Drop("contact.phone"), Drop("email")],
+        [SetDefault("contact.primary.verified", False), SetDefault("flags", {})],
+        [Coalesce("primary_email", ["contact.email", "email"])],
+        [Cast("age", int, on_error="warn")],
+        [Cast("contact", lambda value: {"raw": value}, on_error="skip")],
+        [
+            SetDefault("contact.items", [{"sku": "a"}, {}]),
+            SetDefault("contact.items[*].sku", "none"),
+            Cast("age", int, on_error="warn"),
+        ],
+    ],
+)
+def test_record_batch_matches_row_execution(ops: list[Any]) -> None:
+    expected, expected_warnings = _row_results(ops)
+    contexts = [UpcastContext() for _ in RECORDS]
+    batch = RecordBatch.from_records(RECORDS)
+
+    batch.apply(ops, contexts)
+
+    assert batch.to_records() == expected
+    assert [context.warnings for context in contexts] == expected_warnings
+
+
+def test_record_batch_relabels_columns_for_renames() -> None:
+    batch = RecordBatch.from_records([{"a": {"x": 1}}, {"a": {"x": 2, "y": 3}}])
+    column = batch.columns[("a", "x")]
+
+    batch.apply([Rename("a", "b")])
+
+    assert batch.columns[("b", "x")] is column
+    assert batch.column("b.y") == [MISSING, 3]
+    assert batch.to_records() == [{"b": {"x": 1}}, {"b": {"x": 2, "y": 3}}]
+
+
+def test_record_batch_applies_ops_to_row_subset() -> None:
+    batch = RecordBatch.from_records([{"a": 1}, {"a": 2}, {"a": 3}])
+
+    batch.apply([Rename("a", "b")], rows=[1])
+
+    assert batch.to_records() == [{"a": 1}, {"b": 2}, {"a": 3}]
+
+
+def test_record_batch_keeps_empty_dicts() -> None:
+    batch = RecordBatch.from_records([{"a": {"b": 1}, "c": {}}])
+
+    batch.apply([Drop("a.b")])
+
+    assert batch.to_records() == [{"a": {}, "c": {}}]
+
+
+def test_record_batch_raises_cast_errors() -> None:
+    batch = RecordBatch.from_records([{"age": "1"}, {"age": "bad"}])
+
+    with pytest.raises(ValueError, match="cast failed for path 'age'"):
+        batch.apply([Cast("age", int)])
+
+
+def _registry() -> MigrationRegistry:
+    def _v2_to_v3(record: Mapping[str, Any]) -> dict[str, Any]:
+        updated = dict(record)
+        updated["tier"] = "basic"
+        return updated
+
+    registry = MigrationRegistry()
+    registry.register_migration(
+        "crm.customer",
+        1,
+        2,
+        compile_ops([Rename("customerId", "customer_id"), Cast("age", int, on_error="warn")]),
+    )
+    registry.register_migration("crm.customer", 2, 3, _v2_to_v3)
+    registry.set_latest_version("crm.customer", 3)
+    return registry
+
+
+def test_upcast_batch_matches_upcast_many() -> None:
+    registry = _registry()
+    records = [
+        {"schema_version": 1, "customerId": "c-1", "age": "42"},
+        {"schema_version": 3, "customer_id": "c-2", "tier": "gold"},
+        {"schema_version": 2, "customer_id": "c-3"},
+        {"schema_version": 1, "customerId": "c-4", "age": "bad"},
+    ]
+    contexts: list[UpcastContext | None] = [UpcastContext() for _ in records]
+
+    batch = upcast_batch(
+        RecordBatch.from_records(records), "crm.customer", registry, contexts=contexts
+    )
+
+    assert batch.to_records() == upcast_many(records, "crm.customer", registry)
+    context = contexts[3]
+    assert context is not None
+    assert context.applied_steps == [(1, 2), (2, 3)]
+    assert context.warnings == [
+        "cast failed for path 'age': invalid literal for int() with base 10: 'bad'"
+    ]
+
+
+def test_upcast_batch_relabels_columns_when_one_version_covers_the_batch() -> None:
+    records = [
+        {"schema_version": 1, "customerId": "c-1", "age": "42"},
+        {"schema_version": 1, "customerId": "c-2"},
+    ]
+    batch = RecordBatch.from_records(records)
+    column = batch.columns[("customerId",)]
+
+    upcast_batch(batch, "crm.customer", _registry(), to_version=2)
+
+    assert batch.columns[("customer_id",)] is column
+    assert ("customerId",) not in batch.columns
+    assert batch.to_records() == upcast_many(records, "crm.customer", _registry(), to_version=2)
+
+
+def test_upcast_batch_requires_schema_version() -> None:
+    batch = RecordBatch.from_records([{"schema_version": 1}, {}])
+
+    with pytest.raises(MissingSchemaVersionError):
+        upcast_batch(batch, "crm.customer", _registry())
+
+
+def test_to_numpy_raises_without_numpy(monkeypatch: pytest.MonkeyPatch) -> None:
+    real_import = builtins.__import__
+
+    def blocked_import(name: str, *args: Any, **kwargs: Any) -> Any:
+        if name == "numpy":
+            raise ImportError("numpy blocked for test")
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.delitem(sys.modules, "numpy", raising=False)
+    monkeypatch.setattr(builtins, "__import__", blocked_import)
+
+    with pytest.raises(RuntimeError, match="numpy is required"):
+        RecordBatch.from_records([{"a": 1}]).to_numpy("a")
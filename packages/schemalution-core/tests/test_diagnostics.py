@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import pytest
+from schemalution_core import (
+    AggregatingContext,
+    Diagnostic,
+    MigrationRegistry,
+    RecordBatch,
+    UpcastCache,
+    UpcastContext,
+    UpcastMetrics,
+    compile_ops,
+    ops,
+    upcast,
+    upcast_batch,
+    upcast_many,
+)
+from schemalution_core.diagnostics import CAST_FAILED, MOVE_DESTINATION_EXISTS
+
+
+def _build_registry(backend: ops.OpsBackend = "interpreted") -> MigrationRegistry:
+    registry = MigrationRegistry()
+    registry.register_migration(
+        "crm.customer", 1, 2, compile_ops([ops.Cast("age", int, on_error="warn")], backend=backend)
+    )
+    registry.register_migration(
+        "crm.customer",
+        2,
+        3,
+        compile_ops([ops.Move("email", "contact.email")], backend=backend),
+    )
+    registry.set_latest_version("crm.customer", 3)
+    return registry
+
+
+BAD = {"schema_version": 1, "age": "x", "email": "a@x", "contact": {"email": "b@x"}}
+
+
+@pytest.mark.parametrize("backend", ["interpreted", "codegen"])
+def test_ops_report_structured_diagnostics(backend: ops.OpsBackend) -> None:
+    context = UpcastContext(record_id="c-1")
+
+    upcast(BAD, "crm.customer", _build_registry(backend), context=context)
+
+    cast_failed, move_skipped = context.diagnostics
+    assert (cast_failed.code, cast_failed.op, cast_failed.path) == (CAST_FAILED, "Cast", "age")
+    assert (cast_failed.step, cast_failed.record_id) == ((1, 2), "c-1")
+    assert isinstance(cast_failed.detail, ValueError)
+    assert move_skipped == Diagnostic(
+        MOVE_DESTINATION_EXISTS, "Move", "email", (2, 3), "c-1", "contact.email"
+    )
+    assert context.warnings == [
+        f"cast failed for path 'age': {cast_failed.detail}",
+        "destination 'contact.email' exists; move from 'email' skipped.",
+    ]
+
+
+def test_report_renders_warnings_in_report_order() -> None:
+    context = UpcastContext()
+    context.report("custom.code", "Custom", "a.b")
+    context.warnings.append("free-form")
+    context.report("custom.code", "Custom", "c", detail=3)
+
+    assert context.warning_count == 3
+    assert context.warnings == [
+        "Custom custom.code at 'a.b'",
+        "free-form",
+        "Custom custom.code at 'c': 3",
+    ]
+
+
+def test_aggregating_context_counts_and_samples() -> None:
+    registry = _build_registry()
+    context = AggregatingContext(sample_size=2)
+    records = [BAD, {"schema_version": 1, "age": "1"}, BAD, BAD]
+
+    upcast_many(records, "crm.customer", registry, context=context)
+
+    assert context.diagnostics == [] and context.warnings == []
+    assert context.warning_count == 6
+    cast_key = (CAST_FAILED, "Cast", "age", (1, 2))
+    assert context.counts[cast_key] == 3
+    assert [d.record_id for d in context.samples[cast_key]] == [0, 2]
+    summary = context.summary()
+    assert summary[0]["count"] == 3 and summary[0]["record_ids"] == [0, 2]
+    assert summary[1]["message"] == "destination 'contact.email' exists; move from 'email' skipped."
+
+
+def test_aggregating_context_merges_and_counts_metrics() -> None:
+    registry = _build_registry()
+    metrics = UpcastMetrics()
+    registry.attach_metrics(metrics)
+    first, second = AggregatingContext(sample_size=1), AggregatingContext(sample_size=1)
+
+    upcast_many([BAD], "crm.customer", registry, context=first)
+    upcast_batch(
+        RecordBatch.from_records([BAD, BAD]), "crm.customer", registry, contexts=[second] * 2
+    )
+    first.extend(second)
+
+    assert first.counts[(CAST_FAILED, "Cast", "age", (1, 2))] == 3
+    assert len(first.samples[(CAST_FAILED, "Cast", "age", (1, 2))]) == 1
+    assert [step["warnings"] for step in metrics.snapshot()["steps"]] == [3, 3]
+
+
+def test_cache_replays_diagnostics_into_the_callers_context() -> None:
+    registry = _build_registry()
+    cache = UpcastCache(registry)
+    context = AggregatingContext()
+
+    for record_id in ("a", "b"):
+        context.record_id = record_id
+        cache.upcast_to_latest(BAD, "crm.customer", context=context)
+
+    assert cache.stats().hits == 1
+    samples = context.samples[(CAST_FAILED, "Cast", "age", (1, 2))]
+    assert [d.record_id for d in samples] == ["a", "b"]
+
+
+def test_upcast_context_keeps_warnings_as_an_init_field() -> None:
+    context = UpcastContext([(1, 2)], ["free-form"], {"note": 1})
+    context.report(CAST_FAILED, "Cast", "age", "bad")
+
+    assert context.warnings == ["free-form", "cast failed for path 'age': bad"]
+    assert context.notes == {"note": 1}
+    assert UpcastContext(warnings=["a"]) == UpcastContext(warnings=["a"])
+
+    context.report(CAST_FAILED, "Cast", "age", "worse")
+    context.warnings = ["replaced"]
+
+    assert context.warnings == ["replaced"]
+    assert context.warning_count == 1
+
+
+def test_extend_keeps_free_form_warnings_apart_from_diagnostics() -> None:
+    message = "cast failed for path 'age': bad"
+    source = UpcastContext(render_warnings=False)
+    source.warnings.append(message)
+    source.report(CAST_FAILED, "Cast", "age", "bad")
+    target, aggregating = UpcastContext(record_id="r"), AggregatingContext()
+
+    target.extend(source)
+    aggregating.extend(source)
+
+    assert target.warnings == [message, message]
+    assert [d.record_id for d in target.diagnostics] == ["r"]
+    assert aggregating.warnings == [message]
+    assert aggregating.warning_count == 2
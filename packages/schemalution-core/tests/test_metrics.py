@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from schemalution_core import (
+    MigrationRegistry,
+    RecordBatch,
+    UpcastContext,
+    UpcastFailure,
+    UpcastMetrics,
+    compile_ops,
+    ops,
+    upcast,
+    upcast_batch,
+    upcast_many,
+)
+from schemalution_core.registry import MigrationStep
+
+
+def _v2_to_v3(record: Mapping[str, Any]) -> dict[str, Any]:
+    if record.get("fail"):
+        raise RuntimeError("boom")
+    return dict(record)
+
+
+def _build_registry() -> MigrationRegistry:
+    registry = MigrationRegistry()
+    registry.register_migration(
+        "crm.customer", 1, 2, compile_ops([ops.Cast("age", int, on_error="warn")])
+    )
+    registry.register_migration("crm.customer", 2, 3, _v2_to_v3)
+    registry.set_latest_version("crm.customer", 3)
+    return registry
+
+
+def _step(metrics: UpcastMetrics, from_version: int) -> dict[str, Any]:
+    (step,) = [s for s in metrics.snapshot()["steps"] if s["from_version"] == from_version]
+    return step
+
+
+def test_unattached_registry_runs_plain_steps() -> None:
+    registry = _build_registry()
+
+    assert registry.metrics is None
+    assert all(type(step) is MigrationStep for step in registry.plan("crm.customer", 1, 3).steps)
+
+
+def test_metrics_count_steps_warnings_and_failures() -> None:
+    registry = _build_registry()
+    metrics = UpcastMetrics()
+    registry.attach_metrics(metrics)
+
+    upcast({"schema_version": 1, "age": "x"}, "crm.customer", registry)
+    upcast({"schema_version": 1, "age": "3"}, "crm.customer", registry, context=UpcastContext())
+    failures: list[UpcastFailure] = []
+    upcast_many([{"schema_version": 2, "fail": True}], "crm.customer", registry, failures=failures)
+
+    first, second = _step(metrics, 1), _step(metrics, 2)
+    assert (first["count"], first["warnings"], first["failures"]) == (2, 1, 0)
+    assert (second["count"], second["warnings"], second["failures"]) == (3, 0, 1)
+    assert first["duration_seconds"]["buckets"]["+Inf"] == 2
+    assert json.loads(metrics.to_json()) == metrics.snapshot()
+
+    registry.detach_metrics()
+    upcast({"schema_version": 1}, "crm.customer", registry)
+    assert _step(metrics, 1)["count"] == 2
+
+
+def test_columnar_batches_report_per_row_counts() -> None:
+    registry = _build_registry()
+    metrics = UpcastMetrics()
+    registry.attach_metrics(metrics)
+    batch = RecordBatch.from_records([{"schema_version": 1, "age": "1"}] * 3)
+
+    upcast_batch(batch, "crm.customer", registry)
+
+    assert _step(metrics, 1)["count"] == 3
+    assert _step(metrics, 2)["count"] == 3
+
+
+def test_prometheus_exposition() -> None:
+    metrics = UpcastMetrics(buckets=[0.01, 0.001])
+    metrics.observe('crm."x"', 1, 2, 0.005, warnings=2)
+    metrics.observe('crm."x"', 1, 2, 0.5)
+
+    text = metrics.to_prometheus()
+
+    labels = 'schema_id="crm.\\"x\\"",from_version="1",to_version="2"'
+    assert "# TYPE schemalution_step_total counter" in text
+    assert f"schemalution_step_total{{{labels}}} 2" in text
+    assert f"schemalution_step_warnings_total{{{labels}}} 2" in text
+    assert f'schemalution_step_duration_seconds_bucket{{{labels},le="0.001"}} 0' in text
+    assert f'schemalution_step_duration_seconds_bucket{{{labels},le="0.01"}} 1' in text
+    assert f'schemalution_step_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"schemalution_step_duration_seconds_count{{{labels}}} 2" in text
+
+
+def test_metrics_require_buckets() -> None:
+    with pytest.raises(ValueError, match="buckets"):
+        UpcastMetrics(buckets=[])
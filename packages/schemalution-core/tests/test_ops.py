@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+from typing import Any
+
 import pytest
 from schemalution_core import UpcastContext
 from schemalution_core.ops import (
@@ -11,7 +14,11 @@ from schemalution_core.ops import (
     Rename,
     SetDefault,
     compile_ops,
+    del_path_parts,
     get_path,
+    get_path_parts,
+    parse_path,
+    set_path_parts,
 )
 
 
@@ -125,3 +132,209 @@ def test_get_path_returns_missing_sentinel() -> None:
     record = {"a": {"b": 1}}
 
     assert get_path(record, "a.c") is MISSING
+
+
+def test_compile_ops_copies_record_once_and_leaves_input_untouched() -> None:
+    nested = {"b": 1, "keep": {"x": 1}}
+    record = {"a": nested, "other": {"y": 2}}
+    ops = [
+        Rename("a.b", "a.c"),
+        SetDefault("a.d", 2),
+        Drop("a.c"),
+    ]
+
+    result = compile_ops(ops)(record, None)
+
+    assert result == {"a": {"keep": {"x": 1}, "d": 2}, "other": {"y": 2}}
+    assert record == {"a": {"b": 1, "keep": {"x": 1}}, "other": {"y": 2}}
+    assert result["a"] is not nested
+    assert result["a"]["keep"] is nested["keep"]
+    assert result["other"] is record["other"]
+
+
+def test_compile_ops_does_not_alias_copied_values() -> None:
+    ops = [
+        SetDefault("a.x", 1),
+        Rename("a", "b", keep_source=True),
+        SetDefault("b.y", 2),
+        Coalesce("c", ["b"]),
+        Drop("c.x"),
+    ]
+
+    result = compile_ops(ops)({}, None)
+
+    assert result == {"a": {"x": 1}, "b": {"x": 1, "y": 2}, "c": {"y": 2}}
+
+
+def test_compile_ops_falls_back_to_apply_for_custom_ops() -> None:
+    class Stamp:
+        def apply(self, record, ctx=None):  # type: ignore[no-untyped-def]
+            updated = dict(record)
+            updated["stamped"] = True
+            return updated
+
+    fn = compile_ops([SetDefault("a.b", 1), Stamp(), SetDefault("a.c", 2)])
+
+    result = fn({"a": {}}, None)
+
+    assert result == {"a": {"b": 1, "c": 2}, "stamped": True}
+    assert fn.ops[1].__class__ is Stamp
+
+
+@pytest.mark.parametrize(
+    ("path", "parts"),
+    [
+        ("a", ("a",)),
+        ("a.b.c", ("a", "b", "c")),
+        ("a\\.b.c", ("a.b", "c")),
+        ("a\\\\.b", ("a\\", "b")),
+        ("a\\x", ("a\\x",)),
+        ("orders[*].price", ("orders", "[*]", "price")),
+        ("grid[*][*]", ("grid", "[*]", "[*]")),
+    ],
+)
+def test_parse_path_splits_and_unescapes(path: str, parts: tuple[str, ...]) -> None:
+    assert parse_path(path) == parts
+
+
+def test_path_parts_helpers_round_trip() -> None:
+    record = {"a": {"b": 1}}
+
+    updated = set_path_parts(record, ("a", "c.d"), 2)
+
+    assert updated == {"a": {"b": 1, "c.d": 2}}
+    assert get_path_parts(updated, ("a", "c.d")) == 2
+    assert del_path_parts(updated, ("a", "b")) == {"a": {"c.d": 2}}
+    assert record == {"a": {"b": 1}}
+
+
+def test_ops_parse_paths_once_and_support_escaped_dots() -> None:
+    op = Rename("meta\\.source", "meta.source")
+
+    result = op.apply({"meta.source": "crm"})
+
+    assert result == {"meta": {"source": "crm"}}
+    assert op == Rename("meta\\.source", "meta.source")
+    assert "_from_parts" not in repr(op)
+
+
+def _codegen_cases() -> list[tuple[list[Any], dict[str, Any]]]:
+    return [
+        ([Rename("a.b", "c"), Drop("a")], {"a": {"b": 1, "x": 2}}),
+        ([Move("a", "b.c"), Move("x", "b", overwrite=False)], {"a": 1, "x": 2, "b": {}}),
+        ([Coalesce("out", ["m", "n.o", "p"]), Rename("n", "k", keep_source=True)], {"n": {"o": 3}}),
+        ([SetDefault("x.y", {}), SetDefault("x.y.z", 1), Cast("age", int, on_error="warn")], {}),
+        (
+            [Cast("age", int, on_error="warn"), Cast("n", str, on_error="skip")],
+            {"age": "x", "n": 1},
+        ),
+        (
+            [
+                Rename("orders[*].price", "orders[*].unit_price"),
+                Cast("orders[*].qty", int, on_error="warn"),
+                SetDefault("orders[*].lines[*].tax", 0),
+                Drop("tags[*]"),
+            ],
+            {
+                "orders": [{"price": 1, "qty": "2"}, {"qty": "x", "lines": [{}, 3]}, None],
+                "tags": ["a"],
+            },
+        ),
+    ]
+
+
+@pytest.mark.parametrize(("ops", "record"), _codegen_cases())
+def test_codegen_backend_matches_interpreted(ops: list[Any], record: dict[str, Any]) -> None:
+    interpreted_ctx = UpcastContext()
+    codegen_ctx = UpcastContext()
+
+    expected = compile_ops(ops)(record, interpreted_ctx)
+    result = compile_ops(ops, backend="codegen")(record, codegen_ctx)
+
+    assert json.dumps(result) == json.dumps(expected)
+    assert codegen_ctx.warnings == interpreted_ctx.warnings
+
+
+def test_codegen_backend_exposes_source() -> None:
+    fn = compile_ops([Rename("a", "b"), Cast("b", int)], backend="codegen")
+
+    assert fn.source is not None
+    assert "r.get('a', _M)" in fn.source
+    assert ".apply(" not in fn.source
+    assert compile_ops([Rename("a", "b")]).source is None
+
+
+def test_codegen_backend_raises_cast_errors() -> None:
+    fn = compile_ops([Cast("age", int)], backend="codegen")
+
+    with pytest.raises(ValueError, match="cast failed for path 'age'"):
+        fn({"age": "bad"}, None)
+
+
+def test_compile_ops_rejects_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="unsupported backend"):
+        compile_ops([], backend="jit")  # type: ignore[arg-type]
+
+
+def test_wildcard_ops_rewrite_each_list_element() -> None:
+    untouched = {"qty": 1}
+    record = {"orders": [{"price": "1.5", "qty": "2"}, untouched, "legacy"], "id": 7}
+
+    for fn in (
+        compile_ops([Rename("orders[*].price", "orders[*].unit_price")]),
+        Rename("orders[*].price", "orders[*].unit_price").apply,
+    ):
+        result = fn(record)
+
+        assert result == {
+            "orders": [{"unit_price": "1.5", "qty": "2"}, {"qty": 1}, "legacy"],
+            "id": 7,
+        }
+        # Elements an op does not change are shared, not copied.
+        assert result["orders"][1] is untouched
+    assert record["orders"][0] == {"price": "1.5", "qty": "2"}
+
+
+def test_wildcard_ops_on_elements_themselves() -> None:
+    record = {"tags": [1, "2"], "scores": [[1, 2], [3]]}
+
+    result = compile_ops([Cast("tags[*]", str), Drop("scores[*][*]")])(record)
+
+    assert result == {"tags": ["1", "2"], "scores": [[], []]}
+    assert record == {"tags": [1, "2"], "scores": [[1, 2], [3]]}
+
+
+def test_wildcard_ops_share_one_pass_per_list() -> None:
+    fn = compile_ops(
+        [
+            Rename("orders[*].price", "orders[*].unit_price"),
+            Cast("orders[*].qty", int),
+            Drop("flags"),
+            SetDefault("orders[*].currency", "EUR"),
+        ],
+        backend="codegen",
+    )
+
+    assert fn.source is not None
+    assert fn.source.count("for i1, e1 in enumerate(l1)") == 2
+    assert "_apply_in_place" not in fn.source
+    assert fn({"orders": [{"price": 1, "qty": "2"}]}) == {
+        "orders": [{"unit_price": 1, "qty": 2, "currency": "EUR"}]
+    }
+
+
+def test_wildcard_warnings_keep_the_declared_path() -> None:
+    ctx = UpcastContext()
+
+    Cast("orders[*].qty", int, on_error="warn").apply({"orders": [{"qty": "x"}]}, ctx)
+
+    assert ctx.warnings[0].startswith("cast failed for path 'orders[*].qty'")
+
+
+def test_wildcard_paths_must_share_a_list_prefix() -> None:
+    with pytest.raises(ValueError, match="share one list prefix"):
+        Rename("orders[*].price", "price")
+    with pytest.raises(ValueError, match="share one list prefix"):
+        Coalesce("orders[*].total", ["orders[*].sum", "items[*].sum"])
+    with pytest.raises(ValueError, match="key before the first wildcard"):
+        Drop("[*].price")
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+from schemalution_core import (
+    MigrationRegistry,
+    ParallelUpcaster,
+    UpcastFailure,
+    compile_ops,
+    ops,
+    upcast_many,
+)
+from schemalution_core.errors import InvalidSchemaVersionError
+
+
+def _build_registry() -> MigrationRegistry:
+    registry = MigrationRegistry()
+    registry.register_migration(
+        "crm.customer", 1, 2, compile_ops([ops.Cast("age", int, on_error="raise")])
+    )
+    registry.register_migration("crm.customer", 2, 3, compile_ops([ops.Rename("name", "n")]))
+    registry.set_latest_version("crm.customer", 3)
+    return registry
+
+
+def _records(count: int) -> list[dict[str, object]]:
+    return [
+        {"schema_version": 1 + index % 3, "name": f"c-{index}", "age": str(index)}
+        for index in range(count)
+    ]
+
+
+def test_parallel_results_match_upcast_many_in_order() -> None:
+    registry = _build_registry()
+    records = _records(200)
+
+    with ParallelUpcaster(
+        registry, max_workers=2, initial_chunk_size=7, min_chunk_size=3
+    ) as upcaster:
+        results = upcaster.upcast_many(iter(records), "crm.customer")
+
+    assert results == upcast_many(records, "crm.customer", registry)
+    assert 3 <= upcaster.chunk_size <= 8192
+
+
+def test_parallel_collects_failures_with_input_indices() -> None:
+    records = _records(50)
+    records[3]["age"] = "x"
+    records[41] = {"schema_version": "1"}
+
+    with ParallelUpcaster(
+        _build_registry(), max_workers=2, initial_chunk_size=4, min_chunk_size=4, max_chunk_size=4
+    ) as upcaster:
+        failures: list[UpcastFailure] = []
+        results = upcaster.upcast_many(records, "crm.customer", failures=failures)
+
+        assert [failure.index for failure in failures] == [3, 41]
+        assert isinstance(failures[1].error, InvalidSchemaVersionError)
+        assert results[3] is None and results[41] is None
+        assert results[6] == {"schema_version": 3, "n": "c-6", "age": 6}
+
+        with pytest.raises(ValueError, match="cast failed for path 'age'"):
+            upcaster.upcast_many(records, "crm.customer")
+
+
+def test_parallel_requires_exactly_one_registry_source() -> None:
+    with pytest.raises(ValueError, match="exactly one"):
+        ParallelUpcaster()
+    with pytest.raises(ValueError, match="exactly one"):
+        ParallelUpcaster(_build_registry(), pack_modules=["schemalution_pack_example_crm"])
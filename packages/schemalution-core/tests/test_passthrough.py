@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import copy
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import pytest
+from schemalution_core import (
+    MigrationRegistry,
+    UpcastContext,
+    compile_ops,
+    ops,
+    upcast,
+    upcast_many,
+    upcast_to_latest,
+)
+
+
+@dataclass(frozen=True)
+class _RecordId:
+    seen: list[int] = field(default_factory=list)
+
+    def apply(self, record: Mapping[str, Any], ctx: UpcastContext | None = None) -> dict[str, Any]:
+        return dict(record)
+
+    def _apply_in_place(
+        self, record: dict[str, Any], owned: dict[int, Any], ctx: UpcastContext | None
+    ) -> None:
+        self.seen.append(id(record))
+
+
+def _build_registry(*steps: Any) -> MigrationRegistry:
+    registry = MigrationRegistry()
+    for from_version, fn in enumerate(steps, start=1):
+        registry.register_migration("crm.customer", from_version, from_version + 1, fn)
+    registry.set_latest_version("crm.customer", len(steps) + 1)
+    return registry
+
+
+def test_passthrough_modes_for_records_at_target() -> None:
+    registry = _build_registry(compile_ops([ops.SetDefault("status", "active")]))
+    record = {"schema_version": 2, "profile": {"name": "Ada"}}
+
+    copied = upcast_to_latest(record, "crm.customer", registry)
+    identity = upcast_to_latest(record, "crm.customer", registry, passthrough="identity")
+    view = upcast(record, "crm.customer", registry, passthrough="view")
+
+    assert copied == record and copied is not record
+    assert identity is record
+    assert view == record
+    with pytest.raises(TypeError):
+        view["status"] = "x"  # type: ignore[index]
+
+
+def test_passthrough_does_not_apply_to_migrated_records() -> None:
+    registry = _build_registry(compile_ops([ops.SetDefault("status", "active")]))
+    record = {"schema_version": 1}
+
+    migrated = upcast(record, "crm.customer", registry, passthrough="identity")
+
+    assert migrated == {"schema_version": 2, "status": "active"}
+    assert record == {"schema_version": 1}
+
+
+def test_unknown_passthrough_mode_raises() -> None:
+    registry = _build_registry(compile_ops([]))
+
+    with pytest.raises(ValueError, match="passthrough"):
+        upcast({"schema_version": 2}, "crm.customer", registry, passthrough="bogus")  # type: ignore[call-overload]
+
+
+@pytest.mark.parametrize("backend", ["interpreted", "codegen"])
+def test_chained_compiled_steps_share_one_copy(backend: str) -> None:
+    probe = _RecordId()
+    registry = _build_registry(
+        compile_ops([probe, ops.Rename("name", "full_name")], backend=backend),  # type: ignore[arg-type]
+        compile_ops([probe, ops.SetDefault("profile.tier", "gold")], backend=backend),  # type: ignore[arg-type]
+    )
+    record = {"schema_version": 1, "name": "Ada", "profile": {"a": 1}, "tags": {"b": 2}}
+    snapshot = copy.deepcopy(record)
+
+    migrated = upcast(record, "crm.customer", registry)
+
+    assert record == snapshot
+    assert migrated == {
+        "schema_version": 3,
+        "full_name": "Ada",
+        "profile": {"a": 1, "tier": "gold"},
+        "tags": {"b": 2},
+    }
+    assert len(set(probe.seen)) == 1
+    assert probe.seen[0] == id(migrated)
+    assert migrated["tags"] is record["tags"]
+
+
+def test_plain_migrations_still_receive_a_fresh_record() -> None:
+    def _mutating(record: dict[str, Any]) -> dict[str, Any]:
+        record["touched"] = True
+        return record
+
+    registry = _build_registry(compile_ops([ops.Drop("legacy")]), _mutating)
+    records = [{"schema_version": 1, "legacy": {"x": 1}}, {"schema_version": 2}]
+    snapshot = copy.deepcopy(records)
+
+    single = [upcast_to_latest(record, "crm.customer", registry) for record in records]
+    assert records == snapshot
+    migrated = upcast_many(records, "crm.customer", registry)
+    assert records == snapshot
+
+    expected = {"schema_version": 3, "touched": True}
+    assert single == migrated == [expected, expected]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from schemalution_core import MigrationRegistry, UpcastContext, upcast
+from schemalution_core.errors import NoMigrationPathError
+
+
+def _v1_to_v2(record: Mapping[str, Any]) -> dict[str, Any]:
+    updated = dict(record)
+    updated["steps"] = [*record.get("steps", []), "v2"]
+    return updated
+
+
+def _v2_to_v3(record: Mapping[str, Any], ctx: UpcastContext | None = None) -> dict[str, Any]:
+    if ctx is not None:
+        ctx.warnings.append("v2->v3 saw context")
+    updated = dict(record)
+    updated["steps"] = [*record.get("steps", []), "v3"]
+    return updated
+
+
+def _v3_to_v4(record: Mapping[str, Any], context: UpcastContext | None = None) -> dict[str, Any]:
+    if context is not None:
+        context.notes["v4"] = True
+    updated = dict(record)
+    updated["steps"] = [*record.get("steps", []), "v4"]
+    return updated
+
+
+def _build_registry() -> MigrationRegistry:
+    registry = MigrationRegistry()
+    registry.register_migration("crm.customer", 1, 2, _v1_to_v2)
+    registry.register_migration("crm.customer", 2, 3, _v2_to_v3)
+    registry.register_migration("crm.customer", 3, 4, _v3_to_v4)
+    registry.set_latest_version("crm.customer", 4)
+    return registry
+
+
+def test_plan_resolves_steps_in_order() -> None:
+    registry = _build_registry()
+
+    plan = registry.plan("crm.customer", 1, 4)
+
+    assert [(step.from_version, step.to_version) for step in plan.steps] == [
+        (1, 2),
+        (2, 3),
+        (3, 4),
+    ]
+    assert plan.steps[0].fn is _v1_to_v2
+
+
+def test_plan_is_cached_until_registry_changes() -> None:
+    registry = _build_registry()
+
+    first = registry.plan("crm.customer", 1, 4)
+    assert registry.plan("crm.customer", 1, 4) is first
+
+    registry.register_migration("crm.customer", 1, 2, _v1_to_v2)
+    assert registry.plan("crm.customer", 1, 4) is not first
+
+    second = registry.plan("crm.customer", 1, 4)
+    registry.set_latest_version("crm.customer", 4)
+    assert registry.plan("crm.customer", 1, 4) is not second
+
+
+def test_plan_passes_context_using_resolved_convention() -> None:
+    registry = _build_registry()
+    context = UpcastContext()
+
+    result = upcast({"schema_version": 1}, "crm.customer", registry, context=context)
+
+    assert result == {"schema_version": 4, "steps": ["v2", "v3", "v4"]}
+    assert context.warnings == ["v2->v3 saw context"]
+    assert context.notes == {"v4": True}
+    assert context.applied_steps == [(1, 2), (2, 3), (3, 4)]
+
+
+def test_plan_apply_does_not_mutate_input() -> None:
+    registry = _build_registry()
+    record = {"schema_version": 2, "steps": ["v2"]}
+
+    result = registry.plan("crm.customer", 2, 4).apply(record)
+
+    assert result == {"schema_version": 4, "steps": ["v2", "v3", "v4"]}
+    assert record == {"schema_version": 2, "steps": ["v2"]}
+
+
+def test_plan_with_gap_raises_before_running_steps() -> None:
+    registry = MigrationRegistry()
+    registry.register_migration("crm.customer", 1, 2, _v1_to_v2)
+    registry.set_latest_version("crm.customer", 3)
+    calls: list[tuple[str, int, int]] = []
+
+    with pytest.raises(NoMigrationPathError, match="v2 -> v3"):
+        upcast(
+            {"schema_version": 1},
+            "crm.customer",
+            registry,
+            on_step=lambda sid, f, t: calls.append((sid, f, t)),
+        )
+    assert calls == []
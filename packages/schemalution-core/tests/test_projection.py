@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from schemalution_core import (
+    MigrationRegistry,
+    UpcastContext,
+    UpcastMetrics,
+    compile_ops,
+    ops,
+    upcast,
+    upcast_to_latest,
+)
+
+
+def _build_registry(backend: ops.OpsBackend = "interpreted") -> MigrationRegistry:
+    registry = MigrationRegistry()
+    registry.register_migration(
+        "crm.customer",
+        1,
+        2,
+        compile_ops(
+            [
+                ops.Rename("customerId", "customer_id"),
+                ops.Move("email", "contact.email"),
+                ops.Cast("age", int, on_error="raise"),
+            ],
+            backend=backend,
+        ),
+    )
+    registry.register_migration(
+        "crm.customer",
+        2,
+        3,
+        compile_ops(
+            [
+                ops.Rename("name", "full_name"),
+                ops.Move("contact.email", "contact.primary.email"),
+                ops.SetDefault("contact.primary.verified", False),
+            ],
+            backend=backend,
+        ),
+    )
+    registry.set_latest_version("crm.customer", 3)
+    return registry
+
+
+RECORD = {
+    "schema_version": 1,
+    "customerId": "c-1",
+    "name": "Ada",
+    "email": "ada@example.com",
+    "age": "42",
+    "notes": {"long": "x" * 100},
+}
+
+
+@pytest.mark.parametrize("backend", ["interpreted", "codegen"])
+def test_projection_matches_full_upcast(backend: ops.OpsBackend) -> None:
+    registry = _build_registry(backend)
+    full = upcast_to_latest(RECORD, "crm.customer", registry)
+
+    projected = upcast_to_latest(
+        RECORD,
+        "crm.customer",
+        registry,
+        fields=["full_name", "contact.primary", "age", "missing.path"],
+    )
+
+    assert projected == {
+        "schema_version": 3,
+        "full_name": full["full_name"],
+        "contact": {"primary": full["contact"]["primary"]},
+        "age": 42,
+    }
+    assert RECORD["email"] == "ada@example.com"
+
+
+def test_projection_runs_only_feeding_ops() -> None:
+    registry = _build_registry()
+
+    projection = registry.projection("crm.customer", 1, 3, frozenset({"full_name"}))
+
+    assert [step.fn.ops for step in projection.plan.steps] == [  # type: ignore[attr-defined]
+        (),
+        (ops.Rename("name", "full_name"),),
+    ]
+    assert projection.inputs == (("full_name",), ("name",))
+    assert registry.projection("crm.customer", 1, 3, frozenset({"full_name"})) is projection
+
+
+def test_skipped_ops_do_not_fail_or_warn() -> None:
+    registry = _build_registry()
+    record = {**RECORD, "age": "not a number", "contact": {"email": "kept@example.com"}}
+    context = UpcastContext()
+
+    result = upcast(record, "crm.customer", registry, context=context, fields=["customer_id"])
+
+    assert result == {"schema_version": 3, "customer_id": "c-1"}
+    assert context.applied_steps == [(1, 2), (2, 3)]
+    assert context.warnings == []
+    with pytest.raises(ValueError, match="cast failed"):
+        upcast(record, "crm.customer", registry, fields=["age"])
+
+
+def test_opaque_steps_read_the_whole_record() -> None:
+    def add_tier(record: Mapping[str, Any]) -> dict[str, Any]:
+        return {**record, "tier": "gold" if record.get("customer_id") else "none"}
+
+    registry = _build_registry()
+    registry.register_migration("crm.customer", 3, 4, add_tier)
+    registry.register_migration(
+        "crm.customer", 4, 5, compile_ops([ops.Rename("tier", "level"), ops.Drop("age")])
+    )
+    registry.set_latest_version("crm.customer", 5)
+
+    projection = registry.projection("crm.customer", 1, 5, frozenset({"level"}))
+
+    assert projection.inputs is None
+    assert len(projection.plan.steps[-1].fn.ops) == 1  # type: ignore[attr-defined]
+    assert upcast_to_latest(RECORD, "crm.customer", registry, fields=["level"]) == {
+        "schema_version": 5,
+        "level": "gold",
+    }
+
+
+def test_projection_cache_follows_registry_changes() -> None:
+    registry = _build_registry()
+    metrics = UpcastMetrics()
+    before = registry.projection("crm.customer", 1, 3, frozenset({"age"}))
+
+    registry.attach_metrics(metrics)
+    upcast_to_latest(RECORD, "crm.customer", registry, fields=["age"])
+
+    assert registry.projection("crm.customer", 1, 3, frozenset({"age"})) is not before
+    assert [step["count"] for step in metrics.snapshot()["steps"]] == [1, 1]
+
+
+def test_fields_must_not_be_a_string() -> None:
+    with pytest.raises(TypeError, match="fields"):
+        upcast_to_latest(RECORD, "crm.customer", _build_registry(), fields="age")
+
+
+def test_paths_through_lists_select_the_whole_list() -> None:
+    registry = MigrationRegistry()
+    registry.register_migration(
+        "shop.order",
+        1,
+        2,
+        compile_ops(
+            [
+                ops.Rename("lines[*].price", "lines[*].unit_price"),
+                ops.SetDefault("lines[*].currency", "EUR"),
+                ops.Rename("note", "comment"),
+            ]
+        ),
+    )
+    record = {"schema_version": 1, "lines": [{"price": 1}, {"price": 2}], "note": "x"}
+
+    result = upcast(record, "shop.order", registry, to_version=2, fields=["lines[*].unit_price"])
+
+    assert result == {
+        "schema_version": 2,
+        "lines": [{"unit_price": 1, "currency": "EUR"}, {"unit_price": 2, "currency": "EUR"}],
+    }
+    plan = registry.projection("shop.order", 1, 2, frozenset(["lines[*].unit_price"]))
+    assert plan.inputs == (("lines",),)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pickle
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from schemalution_core import MigrationRegistry, Record, upcast_many, upcast_to_latest
+
+
+def _v1_to_v2(record: Mapping[str, Any]) -> dict[str, Any]:
+    updated = dict(record)
+    updated["full_name"] = updated.pop("name")
+    return updated
+
+
+def _build_registry() -> MigrationRegistry:
+    registry = MigrationRegistry()
+    registry.register_migration("crm.customer", 1, 2, _v1_to_v2)
+    registry.set_latest_version("crm.customer", 2)
+    registry.set_record_fields("crm.customer", ["full_name", "items", "contact-info"])
+    return registry
+
+
+def test_upcast_to_latest_as_record_matches_dict_result() -> None:
+    registry = _build_registry()
+    record = {"schema_version": 1, "name": "Ada", "items": [1], "note": "x"}
+
+    result = upcast_to_latest(record, "crm.customer", registry, as_record=True)
+
+    assert isinstance(result, Record)
+    assert type(result).__name__ == "CrmCustomerRecord"
+    assert result == upcast_to_latest(record, "crm.customer", registry)
+    assert result["items"] == [1]
+    assert result["note"] == "x"
+    assert "contact-info" not in result
+    assert len(result) == 4
+    assert not hasattr(result, "__dict__")
+
+
+def test_record_pickles_and_converts_back_to_dict() -> None:
+    registry = _build_registry()
+    record = upcast_to_latest(
+        {"schema_version": 2, "full_name": "Ada", "contact-info": {"email": "a@x"}},
+        "crm.customer",
+        registry,
+        as_record=True,
+    )
+
+    restored = pickle.loads(pickle.dumps(record))
+
+    assert type(restored) is type(record)
+    assert restored.to_dict() == {
+        "schema_version": 2,
+        "full_name": "Ada",
+        "contact-info": {"email": "a@x"},
+    }
+    with pytest.raises(KeyError):
+        restored["items"]
+
+
+def test_upcast_many_as_record_and_projection() -> None:
+    registry = _build_registry()
+    records = [{"schema_version": 1, "name": "Ada"}, {"schema_version": 2, "full_name": "Lin"}]
+
+    results = upcast_many(records, "crm.customer", registry, as_record=True)
+    projected = upcast_to_latest(
+        records[0], "crm.customer", registry, fields=["full_name"], as_record=True
+    )
+
+    assert results == [{"schema_version": 2, "full_name": "Ada"}, records[1]]
+    assert all(isinstance(result, Record) for result in results)
+    assert projected == {"schema_version": 2, "full_name": "Ada"}
+    with pytest.raises(ValueError):
+        upcast_many(records, "crm.customer", registry, 1, as_record=True)
+    registry.set_latest_version("other.schema", 1)
+    with pytest.raises(ValueError, match="no record fields"):
+        upcast_many([], "other.schema", registry, as_record=True)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import threading
 from typing import Mapping
 
+import pytest
 from schemalution_core import MigrationRegistry
 
 
@@ -26,3 +28,105 @@ def test_registry_introspection_methods() -> None:
         ("billing.invoice", 1, 2),
         ("crm.customer", 1, 2),
     ]
+
+
+def _register_invoices(registry: MigrationRegistry) -> None:
+    registry.register_migration("billing.invoice", 1, 2, _v1_to_v2)
+    registry.register_migration("billing.credit", 1, 2, _v1_to_v2)
+
+
+def test_declared_schemas_load_on_first_use() -> None:
+    registry = MigrationRegistry()
+    calls: list[str] = []
+
+    def loader(target: MigrationRegistry) -> None:
+        calls.append("load")
+        _register_invoices(target)
+
+    registry.declare_schema("billing.invoice", 2, loader, edges=[(1, 2)])
+    registry.declare_schema("billing.credit", 2, loader, edges=[(1, 2)])
+    fingerprint = registry.fingerprint
+
+    assert registry.schema_ids() == ["billing.credit", "billing.invoice"]
+    assert registry.latest_versions() == {"billing.invoice": 2, "billing.credit": 2}
+    assert len(registry.list_migrations()) == 2
+    assert calls == []
+
+    plan = registry.plan("billing.invoice", 1, 2)
+
+    assert len(plan.steps) == 1
+    assert registry.edge("billing.credit", 1, 2) is not None
+    # One shared loader materializes both schemas, without changing the fingerprint.
+    assert calls == ["load"]
+    assert registry.fingerprint == fingerprint
+
+
+def test_list_migrations_loads_schemas_declared_without_edges() -> None:
+    registry = MigrationRegistry()
+    registry.declare_schema("billing.invoice", 2, _register_invoices)
+
+    edges = registry.list_migrations()
+
+    assert [(edge.schema_id, edge.to_version) for edge in edges] == [
+        ("billing.credit", 2),
+        ("billing.invoice", 2),
+    ]
+
+
+def test_failed_loader_is_retried() -> None:
+    registry = MigrationRegistry()
+    attempts: list[int] = []
+
+    def flaky(target: MigrationRegistry) -> None:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("pack unavailable")
+        _register_invoices(target)
+
+    registry.declare_schema("billing.invoice", 2, flaky)
+
+    with pytest.raises(RuntimeError, match="pack unavailable"):
+        registry.load_schema("billing.invoice")
+    registry.load_schema("billing.invoice")
+
+    assert registry.edge("billing.invoice", 1, 2) is not None
+    assert len(attempts) == 2
+
+
+def test_shared_loader_reaching_a_sibling_runs_once() -> None:
+    registry = MigrationRegistry()
+    calls: list[str] = []
+
+    def loader(target: MigrationRegistry) -> None:
+        calls.append("load")
+        target.register_migration("billing.invoice", 1, 2, _v1_to_v2)
+        # The sibling is still pending while its loader runs.
+        assert target.edge("billing.credit", 1, 2) is None
+        target.register_migration("billing.credit", 1, 2, _v1_to_v2)
+
+    registry.declare_schema("billing.invoice", 2, loader)
+    registry.declare_schema("billing.credit", 2, loader)
+
+    registry.load_schema("billing.invoice")
+
+    assert calls == ["load"]
+    assert registry.edge("billing.credit", 1, 2) is not None
+
+
+def test_registrations_from_other_threads_during_a_load_change_the_fingerprint() -> None:
+    registry = MigrationRegistry()
+
+    def loader(target: MigrationRegistry) -> None:
+        other = threading.Thread(
+            target=registry.register_migration, args=("crm.customer", 1, 2, _v1_to_v2)
+        )
+        other.start()
+        other.join()
+        _register_invoices(target)
+
+    registry.declare_schema("billing.invoice", 2, loader)
+    fingerprint = registry.fingerprint
+
+    registry.load_schema("billing.invoice")
+
+    assert registry.fingerprint != fingerprint
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import pickle
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from schemalution_core import (
+    MigrationRegistry,
+    RegistrySnapshot,
+    UpcastContext,
+    compile_ops,
+    mark_pure,
+    ops,
+    upcast,
+)
+from schemalution_core.ops import CompiledOps
+
+
+@mark_pure
+def _v2_to_v3(record: Mapping[str, Any], ctx: UpcastContext | None = None) -> dict[str, Any]:
+    updated = dict(record)
+    updated["tier"] = "gold"
+    return updated
+
+
+def _build_registry(backend: str = "interpreted") -> MigrationRegistry:
+    registry = MigrationRegistry()
+    registry.register_migration(
+        "crm.customer",
+        1,
+        2,
+        compile_ops(
+            [ops.Rename("name", "full_name"), ops.Cast("age", int, on_error="warn")],
+            backend=backend,  # type: ignore[arg-type]
+        ),
+    )
+    registry.register_migration("crm.customer", 2, 3, _v2_to_v3)
+    registry.set_latest_version("crm.customer", 3)
+    return registry
+
+
+@pytest.mark.parametrize("backend", ["interpreted", "codegen"])
+def test_snapshot_round_trip_rebuilds_equivalent_registry(backend: str) -> None:
+    registry = _build_registry(backend)
+
+    data = RegistrySnapshot.from_registry(registry).to_bytes()
+    rebuilt = RegistrySnapshot.from_bytes(data).to_registry()
+
+    record = {"schema_version": 1, "name": "Ada", "age": "x"}
+    contexts = [UpcastContext(), UpcastContext()]
+    assert upcast(record, "crm.customer", rebuilt, context=contexts[0]) == upcast(
+        record, "crm.customer", registry, context=contexts[1]
+    )
+    assert contexts[0].warnings == contexts[1].warnings
+    assert rebuilt.list_migrations() == registry.list_migrations()
+    assert rebuilt.latest_versions() == registry.latest_versions()
+    step = rebuilt.edge("crm.customer", 1, 2)
+    assert step is not None and isinstance(step.fn, CompiledOps)
+    assert step.fn.backend == backend and step.fn.ops == registry.edge("crm.customer", 1, 2).fn.ops  # type: ignore[union-attr]
+    assert rebuilt.plan("crm.customer", 1, 3).pure
+
+
+def test_compiled_ops_pickle_as_op_data() -> None:
+    compiled = compile_ops([ops.SetDefault("a.b", 1)], backend="codegen")
+
+    restored = pickle.loads(pickle.dumps(compiled))
+
+    assert restored.ops == compiled.ops
+    assert restored.source == compiled.source
+    assert restored({"x": 1}) == {"x": 1, "a": {"b": 1}}
+
+
+def test_snapshot_rejects_closures_and_lambdas() -> None:
+    registry = MigrationRegistry()
+    registry.register_migration("crm.customer", 1, 2, lambda record: dict(record))
+
+    with pytest.raises(ValueError, match="not a module-level function"):
+        RegistrySnapshot.from_registry(registry)
+
+    registry = MigrationRegistry()
+    registry.register_migration("crm.customer", 1, 2, compile_ops([ops.Cast("a", lambda v: v)]))
+
+    with pytest.raises(ValueError, match="cannot be pickled"):
+        RegistrySnapshot.from_registry(registry)
+
+
+def _from_main(value: Any) -> Any:
+    return value
+
+
+def test_snapshot_rejects_functions_defined_in_main(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_from_main, "__module__", "__main__")
+    registry = MigrationRegistry()
+    registry.register_migration("crm.customer", 1, 2, _from_main)
+
+    with pytest.raises(ValueError, match="defined in __main__"):
+        RegistrySnapshot.from_registry(registry)
+
+    registry = MigrationRegistry()
+    registry.register_migration("crm.customer", 1, 2, compile_ops([ops.Cast("a", _from_main)]))
+
+    with pytest.raises(ValueError, match="defined in __main__"):
+        RegistrySnapshot.from_registry(registry)
+
+
+def test_snapshot_format_is_checked() -> None:
+    snapshot = RegistrySnapshot.from_registry(_build_registry())
+
+    with pytest.raises(ValueError, match="snapshot format"):
+        RegistrySnapshot.from_bytes(pickle.dumps((0, snapshot)))
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from schemalution_core import (
+    MigrationRegistry,
+    UpcastContext,
+    compile_ops,
+    ops,
+    squash_migrations,
+    upcast,
+    upcast_many,
+    verify_squashed_edge,
+)
+from schemalution_core.errors import NoMigrationPathError
+
+FIXTURES = [
+    {"schema_version": 1, "name": "Ada", "age": "36"},
+    {"schema_version": 1, "fullName": "Grace", "age": "x"},
+    {"schema_version": 1},
+]
+
+
+def _plain_step(record: Mapping[str, Any]) -> dict[str, Any]:
+    updated = dict(record)
+    updated["plain"] = True
+    return updated
+
+
+def _build_registry(backend: str = "interpreted") -> MigrationRegistry:
+    registry = MigrationRegistry()
+    steps = [
+        [ops.Coalesce("full_name", ["fullName", "name"]), ops.Drop("fullName")],
+        [ops.Drop("name"), ops.Cast("age", int, on_error="warn")],
+        [ops.Move("full_name", "profile.name")],
+        [ops.SetDefault("profile.tier", "basic")],
+    ]
+    for from_version, step in enumerate(steps, start=1):
+        fn = compile_ops(step, backend=backend)  # type: ignore[arg-type]
+        registry.register_migration("crm.customer", from_version, from_version + 1, fn)
+    registry.set_latest_version("crm.customer", 5)
+    return registry
+
+
+def test_planner_prefers_fewest_edges() -> None:
+    registry = _build_registry()
+    registry.register_migration("crm.customer", 1, 3, compile_ops([]))
+    registry.register_migration("crm.customer", 2, 5, compile_ops([]))
+
+    plan = registry.plan("crm.customer", 1, 5)
+
+    assert [(step.from_version, step.to_version) for step in plan.steps] == [(1, 2), (2, 5)]
+    assert [
+        (step.from_version, step.to_version) for step in registry.plan("crm.customer", 1, 4).steps
+    ] == [
+        (1, 3),
+        (3, 4),
+    ]
+
+
+def test_register_migration_rejects_backward_edges() -> None:
+    registry = MigrationRegistry()
+
+    with pytest.raises(ValueError, match="greater than"):
+        registry.register_migration("crm.customer", 3, 3, _plain_step)
+
+
+def test_missing_step_reports_furthest_reachable_version() -> None:
+    registry = MigrationRegistry()
+    registry.register_migration("crm.customer", 1, 3, _plain_step)
+    registry.set_latest_version("crm.customer", 5)
+
+    with pytest.raises(NoMigrationPathError, match="v3 -> v4"):
+        registry.plan("crm.customer", 1, 5)
+
+
+@pytest.mark.parametrize("backend", ["interpreted", "codegen"])
+def test_squash_migrations_derives_equivalent_edges(backend: str) -> None:
+    registry = _build_registry(backend)
+
+    edges = squash_migrations(registry, "crm.customer")
+
+    assert [(edge.from_version, edge.to_version) for edge in edges] == [(1, 5), (2, 5), (3, 5)]
+    assert len(registry.plan("crm.customer", 1, 5).steps) == 1
+    for edge in edges:
+        assert verify_squashed_edge(registry, "crm.customer", edge.from_version, 5, FIXTURES) == []
+
+    sequential = _build_registry(backend)
+    contexts = [UpcastContext(), UpcastContext()]
+    for record in FIXTURES:
+        assert upcast(record, "crm.customer", registry, context=contexts[0]) == upcast(
+            record, "crm.customer", sequential, context=contexts[1]
+        )
+    assert contexts[0].warnings == contexts[1].warnings
+    assert contexts[0].applied_steps == [(1, 5)] * len(FIXTURES)
+    assert upcast_many(FIXTURES, "crm.customer", registry) == upcast_many(
+        FIXTURES, "crm.customer", sequential
+    )
+
+
+def test_squash_stops_at_plain_functions_and_version_ops() -> None:
+    registry = _build_registry()
+    registry.register_migration("crm.customer", 2, 3, _plain_step)
+    registry.register_migration(
+        "crm.customer", 4, 5, compile_ops([ops.SetDefault("schema_version", 0)])
+    )
+
+    assert squash_migrations(registry, "crm.customer") == []
+
+
+def test_verify_reports_mismatches() -> None:
+    registry = _build_registry()
+    registry.register_migration("crm.customer", 1, 3, compile_ops([ops.Drop("name")]))
+
+    mismatches = verify_squashed_edge(registry, "crm.customer", 1, 3, FIXTURES)
+
+    assert [mismatch.index for mismatch in mismatches] == [0, 1]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Mapping
+from typing import Any
+
+import pytest
+from schemalution_core import (
+    MigrationRegistry,
+    UpcastFailure,
+    compile_ops,
+    ops,
+    upcast_many,
+    upcast_stream,
+)
+
+
+def _build_registry() -> MigrationRegistry:
+    registry = MigrationRegistry()
+    registry.register_migration(
+        "crm.customer", 1, 2, compile_ops([ops.Cast("age", int, on_error="raise")])
+    )
+    registry.register_migration("crm.customer", 2, 3, compile_ops([ops.Rename("name", "n")]))
+    registry.set_latest_version("crm.customer", 3)
+    return registry
+
+
+def _records(count: int) -> list[dict[str, Any]]:
+    return [
+        {"schema_version": 1 + index % 3, "name": f"c-{index}", "age": str(index)}
+        for index in range(count)
+    ]
+
+
+async def _source(
+    records: list[dict[str, Any]], pulled: list[int] | None = None, delay: float = 0
+) -> AsyncIterator[Mapping[str, Any]]:
+    for record in records:
+        if pulled is not None:
+            pulled.append(1)
+        if delay:
+            await asyncio.sleep(delay)
+        yield record
+
+
+async def _collect(stream: AsyncIterator[dict[str, Any] | None]) -> list[dict[str, Any] | None]:
+    return [result async for result in stream]
+
+
+def test_stream_matches_upcast_many_in_order() -> None:
+    registry = _build_registry()
+    records = _records(103)
+
+    results = asyncio.run(
+        _collect(upcast_stream(_source(records), "crm.customer", registry, batch_size=10))
+    )
+
+    assert results == upcast_many(records, "crm.customer", registry)
+
+
+def test_stream_applies_backpressure() -> None:
+    registry = _build_registry()
+    pulled: list[int] = []
+
+    async def _first_only() -> dict[str, Any] | None:
+        stream = upcast_stream(
+            _source(_records(1000), pulled),
+            "crm.customer",
+            registry,
+            batch_size=8,
+            max_in_flight=2,
+        )
+        first = await stream.__anext__()
+        await asyncio.sleep(0.05)
+        await stream.aclose()
+        return first
+
+    first = asyncio.run(_first_only())
+
+    assert first == {"schema_version": 3, "n": "c-0", "age": 0}
+    assert len(pulled) <= 8 * 3 + 1
+
+
+def test_stream_flushes_partial_batches_from_slow_sources() -> None:
+    registry = _build_registry()
+
+    async def _first_latency() -> float:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        stream = upcast_stream(
+            _source(_records(3), delay=0.2),
+            "crm.customer",
+            registry,
+            batch_size=100,
+            max_batch_delay=0.01,
+        )
+        await stream.__anext__()
+        elapsed = loop.time() - started
+        await stream.aclose()
+        return elapsed
+
+    assert asyncio.run(_first_latency()) < 0.35
+
+
+def test_stream_collects_or_raises_failures() -> None:
+    registry = _build_registry()
+    records = _records(30)
+    records[12]["age"] = "x"
+
+    failures: list[UpcastFailure] = []
+    results = asyncio.run(
+        _collect(
+            upcast_stream(
+                _source(records), "crm.customer", registry, batch_size=5, failures=failures
+            )
+        )
+    )
+
+    assert [failure.index for failure in failures] == [12]
+    assert results[12] is None and len(results) == 30
+    with pytest.raises(ValueError, match="cast failed"):
+        asyncio.run(_collect(upcast_stream(_source(records), "crm.customer", registry)))
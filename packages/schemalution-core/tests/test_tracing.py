@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from schemalution_core import (
+    MigrationRegistry,
+    UpcastContext,
+    UpcastTracer,
+    compile_ops,
+    ops,
+)
+
+
+def _slow_step(record: Mapping[str, Any]) -> dict[str, Any]:
+    if record.get("slow"):
+        time.sleep(0.01)
+    return dict(record)
+
+
+def _build_registry() -> MigrationRegistry:
+    registry = MigrationRegistry()
+    registry.register_migration(
+        "crm.customer", 1, 2, compile_ops([ops.Cast("age", int, on_error="warn")])
+    )
+    registry.register_migration("crm.customer", 2, 3, _slow_step)
+    registry.set_latest_version("crm.customer", 3)
+    return registry
+
+
+def test_tracer_samples_one_in_n_and_slow_records() -> None:
+    registry = _build_registry()
+    tracer = UpcastTracer(sample_every=3, slow_threshold=0.005, record_key=lambda r: r.get("id"))
+
+    for index in range(6):
+        record = {"schema_version": 1, "id": index, "age": "x", "slow": index == 4}
+        assert tracer.upcast_to_latest(record, "crm.customer", registry)["schema_version"] == 3
+
+    traces = tracer.dump()
+    assert [(trace.record_key, trace.reason) for trace in traces] == [
+        (0, "sampled"),
+        (3, "sampled"),
+        (4, "slow"),
+    ]
+    slow = traces[2]
+    assert (slow.from_version, slow.to_version) == (1, 3)
+    assert [(from_v, to_v) for from_v, to_v, _ in slow.steps] == [(1, 2), (2, 3)]
+    assert slow.steps[1][2] >= 0.005
+    assert slow.warnings and slow.warnings[0].startswith("cast failed for path 'age'")
+    assert slow.record_bytes == len(
+        json.dumps({"schema_version": 1, "id": 4, "age": "x", "slow": True})
+    )
+    assert json.loads(tracer.dump_json())[2]["reason"] == "slow"
+
+
+def test_tracer_ring_buffer_and_caller_context() -> None:
+    registry = _build_registry()
+    tracer = UpcastTracer(sample_every=1, slow_threshold=None, capacity=2)
+    context = UpcastContext()
+
+    for index in range(4):
+        tracer.upcast({"schema_version": 2, "id": index}, "crm.customer", registry, context=context)
+
+    assert len(tracer.dump()) == 2
+    assert context.applied_steps == [(2, 3)] * 4
+    tracer.clear()
+    assert tracer.dump() == []
+
+
+def test_tracer_captures_errors() -> None:
+    tracer = UpcastTracer(sample_every=0, slow_threshold=None)
+
+    with pytest.raises(Exception, match="schema_version"):
+        tracer.upcast({"id": 1}, "crm.customer", _build_registry())
+
+    (trace,) = tracer.dump()
+    assert trace.reason == "error" and trace.from_version is None
+    assert trace.error is not None and "schema_version" in trace.error
+
+
+def test_tracer_survives_records_that_cannot_be_sized() -> None:
+    tracer = UpcastTracer(sample_every=1, slow_threshold=None)
+    record: dict[Any, Any] = {"schema_version": 1, "name": "Ada", (1, 2): "tuple key"}
+
+    result = tracer.upcast(record, "crm.customer", _build_registry())
+
+    assert (1, 2) in result
+    (trace,) = tracer.dump()
+    assert trace.record_bytes is None
+
+    cyclic: dict[str, Any] = {"id": 1}
+    cyclic["self"] = cyclic
+    with pytest.raises(Exception, match="schema_version"):
+        tracer.upcast(cyclic, "crm.customer", _build_registry())
+    assert tracer.dump()[-1].record_bytes is None
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from schemalution_core import (
+    MigrationRegistry,
+    UpcastContext,
+    UpcastFailure,
+    upcast_many,
+    upcast_to_latest,
+)
+from schemalution_core.errors import (
+    MissingSchemaVersionError,
+    NoMigrationPathError,
+    UnsupportedSchemaIdError,
+)
+
+
+def _v1_to_v2(record: Mapping[str, Any]) -> dict[str, Any]:
+    updated = dict(record)
+    updated["full_name"] = updated.pop("name")
+    return updated
+
+
+def _v2_to_v3(record: Mapping[str, Any]) -> dict[str, Any]:
+    updated = dict(record)
+    updated["email"] = f"{updated['full_name']}@example.com"
+    return updated
+
+
+def _build_registry() -> MigrationRegistry:
+    registry = MigrationRegistry()
+    registry.register_migration("crm.customer", 1, 2, _v1_to_v2)
+    registry.register_migration("crm.customer", 2, 3, _v2_to_v3)
+    registry.set_latest_version("crm.customer", 3)
+    return registry
+
+
+def test_upcast_many_matches_single_upcast_in_input_order() -> None:
+    registry = _build_registry()
+    records = [
+        {"schema_version": 2, "full_name": "Grace"},
+        {"schema_version": 1, "name": "Ada"},
+        {"schema_version": 3, "full_name": "Lin", "email": "lin@example.com"},
+        {"schema_version": 1, "name": "Kai"},
+    ]
+
+    results = upcast_many(records, "crm.customer", registry)
+
+    assert results == [upcast_to_latest(record, "crm.customer", registry) for record in records]
+    assert results[2] is not records[2]
+
+
+def test_upcast_many_runs_each_step_once_per_group() -> None:
+    registry = _build_registry()
+    context = UpcastContext()
+    records = [
+        {"schema_version": 1, "name": "Ada"},
+        {"schema_version": 2, "full_name": "Grace"},
+        {"schema_version": 1, "name": "Kai"},
+    ]
+
+    upcast_many(records, "crm.customer", registry, context=context)
+
+    assert context.applied_steps == [(1, 2), (2, 3)]
+
+
+def test_upcast_many_to_explicit_version() -> None:
+    registry = _build_registry()
+
+    results = upcast_many([{"schema_version": 1, "name": "Ada"}], "crm.customer", registry, 2)
+
+    assert results == [{"schema_version": 2, "full_name": "Ada"}]
+
+
+def test_upcast_many_collects_failures() -> None:
+    registry = _build_registry()
+    failures: list[UpcastFailure] = []
+    records = [
+        {"schema_version": 1, "name": "Ada"},
+        {"name": "missing version"},
+        {"schema_version": 1},
+        {"schema_version": 4},
+    ]
+
+    results = upcast_many(records, "crm.customer", registry, failures=failures)
+
+    assert results[0] is not None
+    assert results[0]["email"] == "Ada@example.com"
+    assert results[1:] == [None, None, None]
+    assert [failure.index for failure in failures] == [1, 3, 2]
+    assert isinstance(failures[0].error, MissingSchemaVersionError)
+    assert isinstance(failures[1].error, NoMigrationPathError)
+    assert isinstance(failures[2].error, KeyError)
+
+
+def test_upcast_many_collects_missing_path_per_group() -> None:
+    registry = MigrationRegistry()
+    registry.register_migration("crm.customer", 2, 3, _v2_to_v3)
+    registry.set_latest_version("crm.customer", 3)
+    failures: list[UpcastFailure] = []
+
+    results = upcast_many(
+        [{"schema_version": 1, "name": "Ada"}, {"schema_version": 2, "full_name": "Grace"}],
+        "crm.customer",
+        registry,
+        failures=failures,
+    )
+
+    assert results[0] is None
+    assert results[1] == {
+        "schema_version": 3,
+        "full_name": "Grace",
+        "email": "Grace@example.com",
+    }
+    assert [failure.index for failure in failures] == [0]
+
+
+def test_upcast_many_raises_without_failure_list() -> None:
+    registry = _build_registry()
+
+    with pytest.raises(KeyError):
+        upcast_many([{"schema_version": 1}], "crm.customer", registry)
+
+
+def test_upcast_many_unknown_schema_id_raises() -> None:
+    with pytest.raises(UnsupportedSchemaIdError):
+        upcast_many([{"schema_version": 1}], "crm.customer", MigrationRegistry(), failures=[])
@@ -5,8 +5,22 @@ Only the symbols exported here are considered public and stable.
 
 from __future__ import annotations
 
-from .adapter import backfill_to_latest, read_latest, write_latest
+from .adapter import backfill_to_latest, outdated_filter, read_latest, write_latest
+from .diff import diff_update, guarded_update
+from .partitioned import backfill_partitioned, split_points
+from .throttle import RateController
 
-__all__ = ["backfill_to_latest", "read_latest", "write_latest", "__version__"]
+__all__ = [
+    "RateController",
+    "backfill_partitioned",
+    "backfill_to_latest",
+    "diff_update",
+    "guarded_update",
+    "outdated_filter",
+    "read_latest",
+    "split_points",
+    "write_latest",
+    "__version__",
+]
 
 __version__ = "0.0.1"
@@ -3,11 +3,16 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
-from typing import Any
+from typing import Any, Literal
 
+from pymongo import ReplaceOne, UpdateOne
 from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
 from schemalution_core import MigrationRegistry, UpcastContext, upcast_to_latest
 
+from .diff import guarded_update
+from .throttle import RateController
+
 
 def read_latest(
     collection: Collection,
@@ -32,7 +37,17 @@ def write_latest(
     upsert: bool = True,
     id_field: str = "_id",
     context: UpcastContext | None = None,
+    diff: bool = False,
+    stored: Mapping[str, Any] | None = None,
 ) -> Any:
+    """Write record at the latest version, upcasting it first when it is older.
+
+    With diff=True, a record with an id is written as a minimal $set/$unset update against
+    the stored document (stored, or loaded with find_one when None), guarded by the stored
+    schema_version (see guarded_update). When no stored document exists the record is
+    written as without diff; otherwise upsert does not apply and a result matching nothing
+    means the document changed since it was read.
+    """
     latest_version = registry.latest_version(schema_id)
     doc: dict[str, Any] = dict(record)
     if "schema_version" not in doc:
@@ -50,10 +65,21 @@ def write_latest(
 
     if id_field in doc:
         value = doc[id_field]
+        if diff:
+            if stored is None:
+                stored = collection.find_one({id_field: value})
+            if stored is not None:
+                guard, update = guarded_update(stored, doc, id_field=id_field)
+                if update is None:
+                    return collection.replace_one(guard, doc, upsert=False)
+                return collection.update_one(guard, update, upsert=False)
         return collection.replace_one({id_field: value}, doc, upsert=upsert)
     return collection.insert_one(doc)
 
 
+_MAX_FAILURE_SAMPLES = 20
+
+
 def backfill_to_latest(
     collection: Collection,
     schema_id: str,
@@ -61,28 +87,175 @@ def backfill_to_latest(
     query: Mapping[str, Any],
     *,
     batch_size: int = 500,
+    write_batch_size: int = 1000,
+    outdated_only: bool = False,
+    index: Literal["create", "verify"] | None = None,
+    diff: bool = False,
+    throttle: RateController | None = None,
 ) -> dict[str, Any]:
-    totals = {
+    """Upcast every document matching query and write back the ones that changed.
+
+    Changed documents are buffered as ReplaceOne operations and flushed with unordered
+    bulk_write calls of up to write_batch_size; per-document write errors are counted in
+    failures and sampled (with the document _id) in failure_samples.
+
+    outdated_only=True adds a schema_version != latest predicate to query so current
+    documents are never sent over the network; skipped reports how many documents matching
+    query the server left out because they are at latest. index="create" builds a
+    schema_version index first and index="verify" raises ValueError unless one exists.
+
+    diff=True writes minimal $set/$unset updates guarded by each document's original
+    schema_version (see guarded_update); conflicts counts writes that matched nothing
+    because the document changed or disappeared since it was read.
+
+    throttle paces the writes and sizes the batches (write_batch_size is then unused) from
+    the latency and error rate of each bulk_write; see RateController.
+    """
+    if write_batch_size < 1:
+        raise ValueError("write_batch_size must be positive.")
+    if index == "create":
+        collection.create_index("schema_version")
+    elif index == "verify" and not _has_version_index(collection):
+        raise ValueError(f"collection '{collection.name}' has no schema_version index.")
+    backfill = _Backfill(collection, schema_id, registry, write_batch_size, diff, throttle=throttle)
+    find_query = backfill.scan_query(query, outdated_only)
+    for doc in collection.find(find_query, batch_size=batch_size):
+        backfill.add(doc)
+    backfill.flush()
+    return backfill.totals
+
+
+def _new_totals() -> dict[str, Any]:
+    return {
         "total": 0,
         "changed": 0,
         "unchanged": 0,
+        "skipped": 0,
+        "conflicts": 0,
         "failures": 0,
         "failure_samples": [],
     }
-    for doc in collection.find(dict(query), batch_size=batch_size):
+
+
+class _Backfill:
+    """Upcasts documents one by one and writes the changed ones in bulk_write batches."""
+
+    def __init__(
+        self,
+        collection: Collection,
+        schema_id: str,
+        registry: MigrationRegistry,
+        write_batch_size: int,
+        diff: bool,
+        totals: dict[str, Any] | None = None,
+        throttle: RateController | None = None,
+    ) -> None:
+        self.collection = collection
+        self.schema_id = schema_id
+        self.registry = registry
+        self.write_batch_size = write_batch_size
+        self.diff = diff
+        self.totals = _new_totals() if totals is None else totals
+        self.throttle = throttle
+        self.pending: list[ReplaceOne | UpdateOne] = []
+        self.pending_ids: list[Any] = []
+
+    def scan_query(
+        self, query: Mapping[str, Any], outdated_only: bool, *, count_skipped: bool = True
+    ) -> dict[str, Any]:
+        """Return the query to scan, counting server-side skips when outdated_only."""
+        if not outdated_only:
+            return dict(query)
+        latest_version = self.registry.latest_version(self.schema_id)
+        if count_skipped:
+            self.totals["skipped"] += self.collection.count_documents(
+                _with_predicate(query, {"schema_version": latest_version})
+            )
+        return _with_predicate(query, outdated_filter(latest_version))
+
+    def add(self, doc: Mapping[str, Any]) -> None:
+        totals = self.totals
         totals["total"] += 1
         try:
             if "_id" not in doc:
                 raise ValueError("document missing _id.")
             context = UpcastContext()
-            upcasted = upcast_to_latest(doc, schema_id, registry, context=context)
-            if doc != upcasted:
-                collection.replace_one({"_id": doc["_id"]}, upcasted, upsert=False)
-                totals["changed"] += 1
-            else:
-                totals["unchanged"] += 1
+            upcasted = upcast_to_latest(doc, self.schema_id, self.registry, context=context)
         except Exception as exc:  # noqa: BLE001 - summarize failures for backfill
-            totals["failures"] += 1
-            if len(totals["failure_samples"]) < 20:
-                totals["failure_samples"].append(str(exc))
-    return totals
+            _add_failure(totals, str(exc))
+            return
+        if doc == upcasted:
+            totals["unchanged"] += 1
+            return
+        if not self.diff:
+            self.pending.append(ReplaceOne({"_id": doc["_id"]}, upcasted, upsert=False))
+        else:
+            guard, update = guarded_update(doc, upcasted)
+            if update is None:
+                self.pending.append(ReplaceOne(guard, upcasted, upsert=False))
+            else:
+                self.pending.append(UpdateOne(guard, update, upsert=False))
+        self.pending_ids.append(doc["_id"])
+        throttle = self.throttle
+        limit = self.write_batch_size if throttle is None else throttle.batch_size
+        if len(self.pending) >= limit:
+            self.flush()
+
+    def flush(self) -> None:
+        pending = self.pending
+        if not pending:
+            return
+        totals = self.totals
+        errors: list[dict[str, Any]] = []
+        throttle = self.throttle
+        started = 0.0 if throttle is None else throttle.acquire(len(pending))
+        # A batch interrupted before bulk_write returns counts as failed throughout.
+        failed = len(pending)
+        try:
+            try:
+                matched = self.collection.bulk_write(pending, ordered=False).matched_count
+            except BulkWriteError as exc:
+                matched = exc.details.get("nMatched", 0)
+                errors = exc.details.get("writeErrors", [])
+            except Exception as exc:  # noqa: BLE001 - a failed batch fails each of its documents
+                matched = 0
+                errors = [{"index": index, "errmsg": str(exc)} for index in range(len(pending))]
+            failed = len(errors)
+        finally:
+            if throttle is not None:
+                throttle.release(len(pending), started, failed)
+        totals["changed"] += matched
+        totals["conflicts"] += len(pending) - len(errors) - matched
+        for error in errors:
+            doc_id = self.pending_ids[error["index"]]
+            _add_failure(totals, f"_id {doc_id!r}: {error.get('errmsg')}")
+        pending.clear()
+        self.pending_ids.clear()
+
+
+def outdated_filter(latest_version: int) -> dict[str, Any]:
+    """Return a query matching every document not at latest_version.
+
+    That includes older versions as well as missing, null, non-numeric, and newer ones, so
+    the backfill still reports the invalid ones as failures.
+    """
+    return {"schema_version": {"$ne": latest_version}}
+
+
+def _with_predicate(query: Mapping[str, Any], predicate: dict[str, Any]) -> dict[str, Any]:
+    if not predicate:
+        return dict(query)
+    return {"$and": [dict(query), predicate]} if query else predicate
+
+
+def _has_version_index(collection: Collection) -> bool:
+    # Only an index leading with schema_version can serve the range predicate.
+    return any(
+        info["key"][0][0] == "schema_version" for info in collection.index_information().values()
+    )
+
+
+def _add_failure(totals: dict[str, Any], message: str) -> None:
+    totals["failures"] += 1
+    if len(totals["failure_samples"]) < _MAX_FAILURE_SAMPLES:
+        totals["failure_samples"].append(message)
@@ -0,0 +1,94 @@
+"""Minimal $set/$unset updates between a stored document and its upcast."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import bson
+
+
+def diff_update(stored: Mapping[str, Any], updated: Mapping[str, Any]) -> dict[str, Any] | None:
+    """Return the $set/$unset update turning stored into updated, or None if none can.
+
+    Nested documents are diffed field by field using dotted paths; lists and other values
+    are set whole. Values compare by type as well as equality, so 1 -> True is a change.
+    A level whose keys cannot be addressed with a dotted path (containing '.', starting
+    with '$', or empty) is set whole; at the top level that makes the diff impossible.
+    """
+    if not _addressable(stored) or not _addressable(updated):
+        return None
+    to_set: dict[str, Any] = {}
+    to_unset: dict[str, Any] = {}
+    _diff(stored, updated, "", to_set, to_unset)
+    update: dict[str, Any] = {}
+    if to_set:
+        update["$set"] = to_set
+    if to_unset:
+        update["$unset"] = to_unset
+    return update
+
+
+def guarded_update(
+    stored: Mapping[str, Any],
+    updated: Mapping[str, Any],
+    *,
+    id_field: str = "_id",
+) -> tuple[dict[str, Any], dict[str, Any] | None]:
+    """Return (filter, update) for writing updated over stored; update None means replace.
+
+    The filter matches stored's id and original schema_version (or a missing one), so if a
+    concurrent writer upgraded the document first the write matches nothing. update is the
+    minimal diff unless it would encode larger than updated itself.
+    """
+    guard: dict[str, Any] = {id_field: stored[id_field]}
+    guard["schema_version"] = stored.get("schema_version", {"$exists": False})
+    update = diff_update(stored, updated)
+    if not update or len(bson.encode(update)) >= len(bson.encode(updated)):
+        return guard, None
+    return guard, update
+
+
+def _addressable(doc: Mapping[str, Any]) -> bool:
+    return all(key and "." not in key and not key.startswith("$") for key in doc)
+
+
+def _diff(
+    stored: Mapping[str, Any],
+    updated: Mapping[str, Any],
+    prefix: str,
+    to_set: dict[str, Any],
+    to_unset: dict[str, Any],
+) -> None:
+    for key, value in updated.items():
+        path = prefix + key
+        if key not in stored:
+            to_set[path] = value
+            continue
+        previous = stored[key]
+        if _same(previous, value):
+            continue
+        if (
+            isinstance(previous, Mapping)
+            and isinstance(value, Mapping)
+            and value
+            and _addressable(previous)
+            and _addressable(value)
+        ):
+            _diff(previous, value, path + ".", to_set, to_unset)
+        else:
+            to_set[path] = value
+    for key in stored:
+        if key not in updated:
+            to_unset[prefix + key] = ""
+
+
+def _same(left: Any, right: Any) -> bool:
+    if type(left) is not type(right):
+        return False
+    if isinstance(left, Mapping):
+        # Field order is significant for BSON documents.
+        return list(left) == list(right) and all(_same(left[key], right[key]) for key in left)
+    if isinstance(left, (list, tuple)):
+        return len(left) == len(right) and all(map(_same, left, right))
+    return left == right
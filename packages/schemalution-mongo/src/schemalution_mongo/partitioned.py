@@ -0,0 +1,214 @@
+"""Parallel, resumable backfills over _id partitions with checkpoints."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any
+
+from bson import ObjectId, json_util
+from pymongo.collection import Collection
+from schemalution_core import MigrationRegistry
+
+from .adapter import _MAX_FAILURE_SAMPLES, _Backfill, _new_totals, _with_predicate
+from .throttle import RateController
+
+
+def split_points(
+    collection: Collection,
+    query: Mapping[str, Any],
+    partitions: int,
+    *,
+    samples_per_partition: int = 32,
+) -> list[Any]:
+    """Return up to partitions - 1 ascending _id values splitting query into even ranges.
+
+    Ids are drawn with $sample (a random cursor, not a collection scan, for small samples)
+    and the quantiles of the sorted sample are used. Range predicates only match _id values
+    of their own BSON type, so when the sample mixes types, or any document matching query
+    has an _id of another type than the sample, no split points are returned and the query
+    is covered by a single unbounded range.
+    """
+    if partitions <= 1:
+        return []
+    pipeline = [
+        {"$match": dict(query)},
+        {"$sample": {"size": partitions * samples_per_partition}},
+        {"$project": {"_id": 1}},
+    ]
+    sampled = {doc["_id"] for doc in collection.aggregate(pipeline)}
+    types = {_id_type(value) for value in sampled}
+    if len(types) != 1 or None in types:
+        return []
+    other_type = {"_id": {"$not": {"$type": types.pop()}}}
+    if collection.find_one(_with_predicate(query, other_type), {"_id": 1}) is not None:
+        return []
+    ids = sorted(sampled)
+    points: list[Any] = []
+    for index in range(1, partitions):
+        if not ids:
+            break
+        point = ids[len(ids) * index // partitions]
+        if not points or point != points[-1]:
+            points.append(point)
+    return points
+
+
+def backfill_partitioned(
+    collection: Collection,
+    schema_id: str,
+    registry: MigrationRegistry,
+    query: Mapping[str, Any],
+    *,
+    progress: Collection,
+    run_id: str,
+    partitions: int = 8,
+    max_workers: int = 4,
+    batch_size: int = 500,
+    write_batch_size: int = 1000,
+    outdated_only: bool = False,
+    diff: bool = False,
+    throttle: RateController | None = None,
+) -> dict[str, Any]:
+    """Run backfill_to_latest over _id ranges concurrently, resuming run_id if it exists.
+
+    The first run splits query into partitions (see split_points) and records one progress
+    document per range in progress. Each range is scanned in _id order on a worker thread;
+    after every write_batch_size documents its pending writes are flushed and the last _id
+    and running totals are checkpointed, so a later call with the same run_id skips finished
+    ranges and restarts the others after their checkpoint. Documents after a checkpoint may
+    be read twice; upcasting is idempotent, so they are simply found unchanged. Returns the
+    merged totals plus partitions and resumed (ranges already started before this call).
+    Every progress document records schema_id, query and the partition bounds; resuming
+    with a different schema_id or query, or over progress documents whose ranges do not
+    match their recorded bounds, raises ValueError.
+    A shared throttle sizes every range's batches and bounds how many of the max_workers
+    threads write at once.
+    """
+    if partitions < 1 or max_workers < 1 or write_batch_size < 1:
+        raise ValueError("partitions, max_workers and write_batch_size must be positive.")
+    query_key = _query_key(query)
+    states = sorted(progress.find({"run_id": run_id}), key=lambda state: state["index"])
+    if states:
+        _check_resume(run_id, states, schema_id, query_key)
+    resumed = sum(1 for state in states if state["done"] or "last_id" in state)
+    if not states:
+        bounds = [None, *split_points(collection, query, partitions), None]
+        for index in range(len(bounds) - 1):
+            state = {
+                "_id": f"{run_id}:{index}",
+                "run_id": run_id,
+                "schema_id": schema_id,
+                "query": query_key,
+                "bounds": bounds,
+                "index": index,
+                "lower": bounds[index],
+                "upper": bounds[index + 1],
+                "done": False,
+                "totals": _new_totals(),
+            }
+            progress.replace_one({"_id": state["_id"]}, state, upsert=True)
+            states.append(state)
+
+    def run(state: dict[str, Any]) -> None:
+        backfill = _Backfill(
+            collection, schema_id, registry, write_batch_size, diff, state["totals"], throttle
+        )
+        # A started range already counted its skipped documents.
+        scan = backfill.scan_query(
+            _with_predicate(query, _range(state)),
+            outdated_only,
+            count_skipped="last_id" not in state,
+        )
+        scanned = 0
+        for doc in collection.find(scan, batch_size=batch_size, sort=[("_id", 1)]):
+            backfill.add(doc)
+            scanned += 1
+            if scanned >= write_batch_size:
+                backfill.flush()
+                state["last_id"] = doc["_id"]
+                progress.replace_one({"_id": state["_id"]}, state)
+                scanned = 0
+        backfill.flush()
+        state["done"] = True
+        progress.replace_one({"_id": state["_id"]}, state)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(run, state) for state in states if not state["done"]]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            # Ranges that have not started stay resumable; running ones checkpoint as usual.
+            for future in futures:
+                future.cancel()
+            raise
+
+    totals = _merge([state["totals"] for state in states])
+    totals["partitions"] = len(states)
+    totals["resumed"] = resumed
+    return totals
+
+
+def _id_type(value: Any) -> str | None:
+    """Return the $type alias under which value orders against its peers, if supported."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, ObjectId):
+        return "objectId"
+    if isinstance(value, datetime):
+        return "date"
+    return None
+
+
+def _query_key(query: Mapping[str, Any]) -> str:
+    # Extended JSON keeps BSON types apart (e.g. an ObjectId and its hex string).
+    return json_util.dumps(dict(query), json_options=json_util.CANONICAL_JSON_OPTIONS)
+
+
+def _check_resume(
+    run_id: str, states: list[dict[str, Any]], schema_id: str, query_key: str
+) -> None:
+    for key, value in (("schema_id", schema_id), ("query", query_key)):
+        if any(state.get(key) != value for state in states):
+            raise ValueError(f"run '{run_id}' was started with a different {key}.")
+    bounds = states[0].get("bounds")
+    if (
+        not isinstance(bounds, list)
+        or len(states) != len(bounds) - 1
+        or any(
+            state.get("bounds") != bounds
+            or state["index"] != index
+            or [state["lower"], state["upper"]] != bounds[index : index + 2]
+            for index, state in enumerate(states)
+        )
+    ):
+        raise ValueError(f"run '{run_id}' has progress documents that do not match its bounds.")
+
+
+def _range(state: Mapping[str, Any]) -> dict[str, Any]:
+    bounds: dict[str, Any] = {}
+    if "last_id" in state:
+        bounds["$gt"] = state["last_id"]
+    elif state["lower"] is not None:
+        bounds["$gte"] = state["lower"]
+    if state["upper"] is not None:
+        bounds["$lt"] = state["upper"]
+    return {"_id": bounds} if bounds else {}
+
+
+def _merge(parts: list[dict[str, Any]]) -> dict[str, Any]:
+    merged = _new_totals()
+    for totals in parts:
+        for key, value in totals.items():
+            if key == "failure_samples":
+                room = _MAX_FAILURE_SAMPLES - len(merged[key])
+                merged[key].extend(value[:room])
+            else:
+                merged[key] += value
+    return merged
@@ -0,0 +1,118 @@
+"""AIMD rate control for backfill writes."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+
+class RateController:
+    """Adapt backfill batch size and write concurrency to observed cluster latency.
+
+    Every bulk_write goes through acquire() and release(). A batch is a congestion signal
+    when it took longer than target_latency seconds or more than max_error_rate of its
+    operations failed; congestion multiplies batch_size and concurrency by backoff
+    (multiplicative decrease). A healthy batch grows batch_size by batch_step, and once
+    batch_size is at its maximum, grows concurrency by one (additive increase). Writes
+    are also paced so that operations never start faster than max_ops_per_second,
+    across every thread sharing the controller. rate reports the operations completed per
+    second over the last window seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_ops_per_second: float | None = None,
+        target_latency: float = 0.5,
+        max_error_rate: float = 0.01,
+        batch_size: int = 100,
+        min_batch_size: int = 10,
+        max_batch_size: int = 1000,
+        batch_step: int = 50,
+        concurrency: int = 1,
+        max_concurrency: int = 4,
+        backoff: float = 0.5,
+        window: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if not 1 <= min_batch_size <= batch_size <= max_batch_size:
+            raise ValueError("batch sizes must satisfy 1 <= min <= batch_size <= max.")
+        if not 1 <= concurrency <= max_concurrency:
+            raise ValueError("concurrency must satisfy 1 <= concurrency <= max_concurrency.")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1.")
+        if max_ops_per_second is not None and max_ops_per_second <= 0:
+            raise ValueError("max_ops_per_second must be positive.")
+        self.max_ops_per_second = max_ops_per_second
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.batch_size = batch_size
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.batch_step = batch_step
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.backoff = backoff
+        self.window = window
+        self._clock = clock
+        self._sleep = sleep
+        self._condition = threading.Condition()
+        self._active = 0
+        self._next_start: float | None = None
+        self._first_start: float | None = None
+        # (completion time, operations) of recent batches
+        self._completed: deque[tuple[float, int]] = deque()
+
+    def acquire(self, ops: int) -> float:
+        """Wait for a concurrency slot and the rate budget for ops; return the start time."""
+        with self._condition:
+            while self._active >= self.concurrency:
+                self._condition.wait()
+            self._active += 1
+            now = self._clock()
+            if self._first_start is None:
+                self._first_start = now
+            start = now
+            if self.max_ops_per_second is not None:
+                if self._next_start is not None:
+                    start = max(now, self._next_start)
+                self._next_start = start + ops / self.max_ops_per_second
+        if start > now:
+            self._sleep(start - now)
+        return self._clock()
+
+    def release(self, ops: int, started: float, errors: int = 0) -> None:
+        """Record a finished batch of ops (errors of them failed) and adapt."""
+        now = self._clock()
+        latency = now - started
+        with self._condition:
+            self._active -= 1
+            self._completed.append((now, ops))
+            congested = latency > self.target_latency or (
+                ops > 0 and errors / ops > self.max_error_rate
+            )
+            if congested:
+                self.batch_size = max(self.min_batch_size, int(self.batch_size * self.backoff))
+                self.concurrency = max(1, int(self.concurrency * self.backoff))
+            elif self.batch_size < self.max_batch_size:
+                self.batch_size = min(self.max_batch_size, self.batch_size + self.batch_step)
+            elif self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+            self._condition.notify_all()
+
+    @property
+    def rate(self) -> float:
+        """Operations completed per second over the last window seconds."""
+        now = self._clock()
+        with self._condition:
+            completed = self._completed
+            while completed and completed[0][0] < now - self.window:
+                completed.popleft()
+            if self._first_start is None:
+                return 0.0
+            span = min(self.window, now - self._first_start)
+            ops = sum(count for _, count in completed)
+        return ops / span if span > 0 else 0.0
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import copy
+import threading
 from collections.abc import Iterable, Mapping
 from typing import Any, cast
 
+import pytest
+from pymongo import ReplaceOne, UpdateOne
 from pymongo.collection import Collection
-from schemalution_core import MigrationRegistry
-from schemalution_mongo import backfill_to_latest, read_latest, write_latest
+from pymongo.errors import BulkWriteError
+from schemalution_core import MigrationRegistry, upcast_to_latest
+from schemalution_mongo import (
+    RateController,
+    backfill_partitioned,
+    backfill_to_latest,
+    read_latest,
+    split_points,
+    write_latest,
+)
 from schemalution_pack_example_crm import SCHEMA_ID, register
 
 
@@ -21,13 +33,88 @@ class FakeReplaceResult:
         self.upserted_id = upserted_id
 
 
+_MISSING = object()
+
+
+_BSON_TYPES = {
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "string": lambda value: isinstance(value, str),
+}
+
+
+def _matches(doc: Mapping[str, Any], query: Mapping[str, Any]) -> bool:
+    for key, value in query.items():
+        if key == "$and":
+            if not all(_matches(doc, part) for part in value):
+                return False
+        elif key == "$or":
+            if not any(_matches(doc, part) for part in value):
+                return False
+        elif isinstance(value, Mapping):
+            current = doc.get(key, _MISSING)
+            for operator, operand in value.items():
+                if operator == "$exists":
+                    matched = (current is not _MISSING) == operand
+                elif operator == "$ne":
+                    matched = current is _MISSING or current != operand
+                elif operator == "$not":
+                    matched = not _matches(doc, {key: operand})
+                elif operator == "$type":
+                    matched = current is not _MISSING and _BSON_TYPES[operand](current)
+                elif current is _MISSING:
+                    matched = False
+                elif operator == "$lt":
+                    matched = current < operand
+                elif operator == "$gt":
+                    matched = current > operand
+                else:
+                    assert operator == "$gte"
+                    matched = current >= operand
+                if not matched:
+                    return False
+        elif doc.get(key) != value:
+            return False
+    return True
+
+
 class FakeCollection:
-    def __init__(self, docs: Iterable[Mapping[str, Any]] | None = None) -> None:
+    name = "customers"
+
+    def __init__(
+        self,
+        docs: Iterable[Mapping[str, Any]] | None = None,
+        *,
+        reject_ids: Iterable[Any] = (),
+    ) -> None:
         self._docs: list[dict[str, Any]] = [dict(doc) for doc in (docs or [])]
-
-    def find_one(self, query: Mapping[str, Any]) -> dict[str, Any] | None:
+        self.reject_ids = set(reject_ids)
+        self.bulk_sizes: list[int] = []
+        self.indexes: dict[str, dict[str, Any]] = {"_id_": {"key": [("_id", 1)]}}
+        self.scanned = 0
+        self.updates: list[dict[str, Any]] = []
+
+    def create_index(self, key: str) -> str:
+        self.indexes[f"{key}_1"] = {"key": [(key, 1)]}
+        return f"{key}_1"
+
+    def index_information(self) -> dict[str, dict[str, Any]]:
+        return self.indexes
+
+    def aggregate(self, pipeline: list[dict[str, Any]]) -> Iterable[dict[str, Any]]:
+        match, sample, project = pipeline
+        assert "$sample" in sample and project == {"$project": {"_id": 1}}
+        docs = [doc for doc in self._docs if _matches(doc, match["$match"])]
+        return [{"_id": doc["_id"]} for doc in docs[: sample["$sample"]["size"]]]
+
+    def count_documents(self, query: Mapping[str, Any]) -> int:
+        return sum(1 for doc in self._docs if _matches(doc, query))
+
+    def find_one(
+        self, query: Mapping[str, Any], projection: Mapping[str, Any] | None = None
+    ) -> dict[str, Any] | None:
+        _ = projection
         for doc in self._docs:
-            if all(doc.get(key) == value for key, value in query.items()):
+            if _matches(doc, query):
                 return dict(doc)
         return None
 
@@ -37,22 +124,78 @@ class FakeCollection:
         return FakeInsertResult(doc.get("_id"))
 
     def replace_one(
-        self, query: Mapping[str, Any], record: Mapping[str, Any], *, upsert: bool
+        self, query: Mapping[str, Any], record: Mapping[str, Any], *, upsert: bool = False
     ) -> FakeReplaceResult:
         for index, doc in enumerate(self._docs):
-            if all(doc.get(key) == value for key, value in query.items()):
-                self._docs[index] = dict(record)
+            if _matches(doc, query):
+                self._docs[index] = copy.deepcopy(dict(record))
                 return FakeReplaceResult(1, 1, None)
         if upsert:
-            self._docs.append(dict(record))
+            self._docs.append(copy.deepcopy(dict(record)))
             return FakeReplaceResult(0, 0, record.get("_id"))
         return FakeReplaceResult(0, 0, None)
 
-    def find(self, query: Mapping[str, Any], *, batch_size: int = 500) -> Iterable[dict[str, Any]]:
-        _ = batch_size
+    def update_one(
+        self, query: Mapping[str, Any], update: Mapping[str, Any], *, upsert: bool
+    ) -> FakeReplaceResult:
+        assert not upsert
         for doc in self._docs:
-            if all(doc.get(key) == value for key, value in query.items()):
-                yield dict(doc)
+            if _matches(doc, query):
+                self.updates.append(dict(update))
+                for path, value in update.get("$set", {}).items():
+                    *parents, leaf = path.split(".")
+                    target = doc
+                    for part in parents:
+                        target = target.setdefault(part, {})
+                    target[leaf] = value
+                for path in update.get("$unset", {}):
+                    *parents, leaf = path.split(".")
+                    target = doc
+                    for part in parents:
+                        target = target[part]
+                    del target[leaf]
+                return FakeReplaceResult(1, 1, None)
+        return FakeReplaceResult(0, 0, None)
+
+    def bulk_write(
+        self, requests: list[ReplaceOne | UpdateOne], *, ordered: bool
+    ) -> FakeReplaceResult:
+        assert not ordered
+        self.bulk_sizes.append(len(requests))
+        errors = []
+        matched = 0
+        for index, request in enumerate(requests):
+            if request._filter.get("_id") in self.reject_ids:
+                errors.append({"index": index, "code": 121, "errmsg": "validation failed"})
+                continue
+            if isinstance(request, UpdateOne):
+                result = self.update_one(
+                    request._filter, cast(Mapping[str, Any], request._doc), upsert=False
+                )
+            else:
+                result = self.replace_one(request._filter, request._doc, upsert=False)
+            matched += result.matched_count
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nMatched": matched})
+        return FakeReplaceResult(matched, matched, None)
+
+    def find(
+        self,
+        query: Mapping[str, Any],
+        *,
+        batch_size: int = 500,
+        sort: list[tuple[str, int]] | None = None,
+    ) -> Iterable[dict[str, Any]]:
+        _ = batch_size
+        docs = self._docs
+        if sort is not None:
+            assert sort == [("_id", 1)]
+            # BSON order puts numbers before strings.
+            docs = sorted(docs, key=lambda doc: (isinstance(doc["_id"], str), doc["_id"]))
+        for doc in docs:
+            if _matches(doc, query):
+                self.scanned += 1
+                yield copy.deepcopy(doc)
 
     def all_docs(self) -> list[dict[str, Any]]:
         return [dict(doc) for doc in self._docs]
@@ -159,3 +302,328 @@ def test_backfill_updates_only_changed_docs() -> None:
     assert updated is not None
     assert updated["schema_version"] == 3
     assert updated["full_name"] == "Lee"
+
+
+def test_backfill_flushes_bulk_writes_and_maps_write_errors() -> None:
+    registry = _registry()
+    docs = [
+        {"_id": f"c-{index}", "schema_version": 1, "customerId": "c", "name": "N", "age": "1"}
+        for index in range(5)
+    ]
+    collection = FakeCollection(docs, reject_ids=["c-3"])
+
+    summary = backfill_to_latest(
+        _collection(collection), SCHEMA_ID, registry, {}, write_batch_size=2
+    )
+
+    assert collection.bulk_sizes == [2, 2, 1]
+    assert summary["changed"] == 4
+    assert summary["failures"] == 1
+    assert summary["failure_samples"] == ["_id 'c-3': validation failed"]
+    stored = {doc["_id"]: doc["schema_version"] for doc in collection.all_docs()}
+    assert stored == {"c-0": 3, "c-1": 3, "c-2": 3, "c-3": 1, "c-4": 3}
+
+
+def test_backfill_outdated_only_filters_on_the_server() -> None:
+    registry = _registry()
+    collection = FakeCollection(
+        [
+            {"_id": "c-6", "schema_version": 1, "customerId": "c-6", "name": "A", "age": "1"},
+            {"_id": "c-7", "schema_version": 3, "customer_id": "c-7", "full_name": "B"},
+            {"_id": "c-8", "schema_version": 3, "customer_id": "c-8", "full_name": "C"},
+            {"_id": "c-9", "customerId": "c-9"},
+            {"_id": "c-9a", "schema_version": 4, "customer_id": "c-9a"},
+            {"_id": "c-9b", "schema_version": None, "customer_id": "c-9b"},
+        ]
+    )
+    with pytest.raises(ValueError, match="no schema_version index"):
+        backfill_to_latest(_collection(collection), SCHEMA_ID, registry, {}, index="verify")
+
+    summary = backfill_to_latest(
+        _collection(collection), SCHEMA_ID, registry, {}, outdated_only=True, index="create"
+    )
+
+    assert "schema_version_1" in collection.indexes
+    # Missing, null and newer versions are scanned and reported, not skipped.
+    assert collection.scanned == 4
+    assert summary["skipped"] == 2
+    assert summary["changed"] == 1
+    assert summary["failures"] == 3
+    assert summary["total"] == 4
+    assert any("exceeds" in sample or "downcast" in sample for sample in summary["failure_samples"])
+
+
+class _RacingCollection(FakeCollection):
+    """Upgrades c-11 behind the backfill's back after it has been read."""
+
+    def find(
+        self,
+        query: Mapping[str, Any],
+        *,
+        batch_size: int = 500,
+        sort: list[tuple[str, int]] | None = None,
+    ) -> Iterable[dict[str, Any]]:
+        for doc in super().find(query, batch_size=batch_size, sort=sort):
+            yield doc
+            if doc["_id"] == "c-11":
+                self.update_one({"_id": "c-11"}, {"$set": {"schema_version": 3}}, upsert=False)
+
+
+def test_backfill_diff_writes_guarded_minimal_updates() -> None:
+    registry = _registry()
+    collection = _RacingCollection(
+        [
+            {"_id": "c-10", "schema_version": 2, "customer_id": "c-10", "name": "A"},
+            {"_id": "c-11", "schema_version": 2, "customer_id": "c-11", "name": "B"},
+        ]
+    )
+
+    summary = backfill_to_latest(_collection(collection), SCHEMA_ID, registry, {}, diff=True)
+
+    assert summary["changed"] == 1
+    assert summary["conflicts"] == 1
+    assert collection.updates[1] == {
+        "$set": {
+            "schema_version": 3,
+            "full_name": "A",
+            "contact": {"primary": {"verified": False}},
+        },
+        "$unset": {"name": ""},
+    }
+    stored = collection.find_one({"_id": "c-10"})
+    assert stored == upcast_to_latest(
+        {"_id": "c-10", "schema_version": 2, "customer_id": "c-10", "name": "A"},
+        SCHEMA_ID,
+        registry,
+    )
+
+
+def test_write_latest_diff_skips_documents_upgraded_concurrently() -> None:
+    registry = _registry()
+    stale = {"_id": "c-12", "schema_version": 2, "customer_id": "c-12", "name": "C"}
+    collection = FakeCollection([{**stale, "schema_version": 3, "full_name": "C"}])
+
+    result = write_latest(
+        _collection(collection), SCHEMA_ID, registry, stale, diff=True, stored=stale
+    )
+
+    assert result.matched_count == 0
+    assert collection.updates == []
+
+
+def test_write_latest_diff_keeps_caller_edits_against_the_stored_document() -> None:
+    registry = _registry()
+    stored = {"_id": "c-13", "schema_version": 2, "customer_id": "c-13", "name": "Old"}
+    collection = FakeCollection([stored])
+    edited = {**stored, "name": "New", "age": 7}
+
+    write_latest(_collection(collection), SCHEMA_ID, registry, edited, diff=True)
+
+    assert collection.updates[0]["$set"]["full_name"] == "New"
+    assert collection.find_one({"_id": "c-13"}) == upcast_to_latest(edited, SCHEMA_ID, registry)
+
+
+def _v1_docs(count: int) -> list[dict[str, Any]]:
+    return [
+        {"_id": index, "schema_version": 1, "customerId": f"c-{index}", "name": "N", "age": "1"}
+        for index in range(count)
+    ]
+
+
+def test_split_points_returns_sample_quantiles() -> None:
+    collection = FakeCollection(_v1_docs(12))
+
+    assert split_points(_collection(collection), {}, 3) == [4, 8]
+    assert split_points(_collection(collection), {"_id": 99}, 3) == []
+    assert split_points(_collection(collection), {}, 1) == []
+
+
+def test_partitioned_backfill_covers_mixed_id_types_with_one_range() -> None:
+    registry = _registry()
+    docs = _v1_docs(8) + [{**doc, "_id": f"s-{doc['_id']}"} for doc in _v1_docs(2)]
+    collection = FakeCollection(docs)
+
+    # The sample holds only ints, but the collection also has string ids.
+    assert split_points(_collection(collection), {}, 4, samples_per_partition=1) == []
+    summary = backfill_partitioned(
+        _collection(collection),
+        SCHEMA_ID,
+        registry,
+        {},
+        progress=_collection(FakeCollection()),
+        run_id="run-mixed",
+        partitions=4,
+    )
+
+    assert summary["partitions"] == 1
+    assert summary["changed"] == 10
+    assert all(doc["schema_version"] == 3 for doc in collection.all_docs())
+
+
+class _CrashingCollection(FakeCollection):
+    """Stops the scan with an error after crash_after documents."""
+
+    def __init__(self, docs: list[dict[str, Any]], crash_after: int) -> None:
+        super().__init__(docs)
+        self.crash_after = crash_after
+
+    def find(
+        self,
+        query: Mapping[str, Any],
+        *,
+        batch_size: int = 500,
+        sort: list[tuple[str, int]] | None = None,
+    ) -> Iterable[dict[str, Any]]:
+        for doc in super().find(query, batch_size=batch_size, sort=sort):
+            if self.scanned > self.crash_after:
+                raise RuntimeError("connection lost")
+            yield doc
+
+
+def test_backfill_partitioned_resumes_from_checkpoints() -> None:
+    registry = _registry()
+    progress = FakeCollection()
+    crashing = _CrashingCollection(_v1_docs(10), crash_after=5)
+
+    with pytest.raises(RuntimeError, match="connection lost"):
+        backfill_partitioned(
+            _collection(crashing),
+            SCHEMA_ID,
+            registry,
+            {},
+            progress=_collection(progress),
+            run_id="run-1",
+            partitions=1,
+            write_batch_size=2,
+        )
+    checkpoint = progress.find_one({"_id": "run-1:0"})
+    assert checkpoint is not None
+    assert checkpoint["last_id"] == 3
+    assert not checkpoint["done"]
+
+    collection = FakeCollection(crashing.all_docs())
+    summary = backfill_partitioned(
+        _collection(collection),
+        SCHEMA_ID,
+        registry,
+        {},
+        progress=_collection(progress),
+        run_id="run-1",
+        partitions=1,
+        write_batch_size=2,
+    )
+
+    assert collection.scanned == 6
+    assert summary["resumed"] == 1
+    assert summary["total"] == 10
+    assert summary["changed"] == 10
+    assert all(doc["schema_version"] == 3 for doc in collection.all_docs())
+
+
+def test_backfill_partitioned_covers_every_range_once() -> None:
+    registry = _registry()
+    progress = FakeCollection()
+    collection = FakeCollection(_v1_docs(20) + [{"_id": 20, "schema_version": 3}])
+
+    summary = backfill_partitioned(
+        _collection(collection),
+        SCHEMA_ID,
+        registry,
+        {},
+        progress=_collection(progress),
+        run_id="run-2",
+        partitions=4,
+        max_workers=4,
+        write_batch_size=3,
+        outdated_only=True,
+    )
+
+    assert summary["partitions"] == 4
+    assert summary["resumed"] == 0
+    assert summary["total"] == 20
+    assert summary["changed"] == 20
+    assert summary["skipped"] == 1
+    assert collection.scanned == 20
+    assert all(state["done"] for state in progress.all_docs())
+    again = backfill_partitioned(
+        _collection(collection),
+        SCHEMA_ID,
+        registry,
+        {},
+        progress=_collection(progress),
+        run_id="run-2",
+    )
+    assert again == {**summary, "resumed": 4}
+
+
+def test_backfill_partitioned_rejects_a_resume_with_other_inputs() -> None:
+    registry = _registry()
+    progress = FakeCollection()
+    collection = FakeCollection(_v1_docs(6))
+
+    def run(query: Mapping[str, Any]) -> dict[str, Any]:
+        return backfill_partitioned(
+            _collection(collection),
+            SCHEMA_ID,
+            registry,
+            query,
+            progress=_collection(progress),
+            run_id="run-3",
+            partitions=2,
+        )
+
+    run({"_id": {"$gte": 0}})
+    state = progress.find_one({"_id": "run-3:0"})
+    assert state is not None
+    assert state["bounds"] == [None, 3, None]
+
+    with pytest.raises(ValueError, match="different query"):
+        run({"_id": {"$gte": 1}})
+    with pytest.raises(ValueError, match="different schema_id"):
+        backfill_partitioned(
+            _collection(collection),
+            "crm.other",
+            registry,
+            {"_id": {"$gte": 0}},
+            progress=_collection(progress),
+            run_id="run-3",
+        )
+    progress.replace_one({"_id": "run-3:1"}, {**state, "_id": "run-3:1", "index": 1})
+    with pytest.raises(ValueError, match="do not match its bounds"):
+        run({"_id": {"$gte": 0}})
+
+
+def test_backfill_batches_follow_the_throttle() -> None:
+    registry = _registry()
+    collection = FakeCollection(_v1_docs(30))
+    throttle = RateController(batch_size=4, min_batch_size=2, max_batch_size=8, batch_step=2)
+
+    summary = backfill_to_latest(
+        _collection(collection), SCHEMA_ID, registry, {}, throttle=throttle
+    )
+
+    assert collection.bulk_sizes == [4, 6, 8, 8, 4]
+    assert summary["changed"] == 30
+    assert throttle.rate > 0
+
+
+def test_backfill_releases_the_throttle_when_a_write_is_interrupted() -> None:
+    class InterruptedCollection(FakeCollection):
+        def bulk_write(
+            self, requests: list[ReplaceOne | UpdateOne], *, ordered: bool
+        ) -> FakeReplaceResult:
+            raise KeyboardInterrupt
+
+    registry = _registry()
+    collection = InterruptedCollection(_v1_docs(4))
+    throttle = RateController(batch_size=4, min_batch_size=2, max_batch_size=8)
+
+    with pytest.raises(KeyboardInterrupt):
+        backfill_to_latest(_collection(collection), SCHEMA_ID, registry, {}, throttle=throttle)
+
+    # The interrupted batch counted as failed and gave its slot back.
+    assert throttle.batch_size == 2
+    acquired = threading.Thread(target=throttle.acquire, args=(1,), daemon=True)
+    acquired.start()
+    acquired.join(timeout=5)
+    assert not acquired.is_alive()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from schemalution_mongo import diff_update, guarded_update
+
+
+def test_diff_update_sets_changed_paths_and_unsets_removed_ones() -> None:
+    stored = {"_id": 1, "a": 1, "n": {"x": 1, "y": [1, 2]}, "old": True}
+    updated = {"_id": 1, "a": True, "n": {"x": 1, "y": [1, 2, 3]}, "new": {"z": 0}}
+
+    assert diff_update(stored, updated) == {
+        "$set": {"a": True, "n.y": [1, 2, 3], "new": {"z": 0}},
+        "$unset": {"old": ""},
+    }
+    assert diff_update(updated, updated) == {}
+
+
+def test_diff_update_sets_levels_with_unaddressable_keys_whole() -> None:
+    stored = {"m": {"a.b": 1}}
+
+    assert diff_update(stored, {"m": {"a.b": 2}}) == {"$set": {"m": {"a.b": 2}}}
+    assert diff_update({"a.b": 1}, {"a.b": 2}) is None
+
+
+def test_guarded_update_falls_back_to_replace_for_large_diffs() -> None:
+    stored = {"_id": 7, "a": 1, "b": 2}
+
+    guard, update = guarded_update(stored, {"_id": 7, "schema_version": 2, "a": 1, "b": 2})
+    assert guard == {"_id": 7, "schema_version": {"$exists": False}}
+    assert update == {"$set": {"schema_version": 2}}
+
+    guard, update = guarded_update({**stored, "schema_version": 1}, {"_id": 7, "c": 3})
+    assert guard == {"_id": 7, "schema_version": 1}
+    assert update is None
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from schemalution_mongo import RateController
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _controller(clock: FakeClock, **kwargs: Any) -> RateController:
+    return RateController(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def _batch(controller: RateController, clock: FakeClock, latency: float, errors: int = 0) -> None:
+    ops = controller.batch_size
+    started = controller.acquire(ops)
+    clock.now += latency
+    controller.release(ops, started, errors)
+
+
+def test_rate_controller_increases_additively_and_backs_off_multiplicatively() -> None:
+    clock = FakeClock()
+    controller = _controller(
+        clock, batch_size=100, max_batch_size=200, batch_step=50, max_concurrency=3
+    )
+
+    for _ in range(3):
+        _batch(controller, clock, latency=0.1)
+    assert (controller.batch_size, controller.concurrency) == (200, 2)
+
+    _batch(controller, clock, latency=2.0)
+    assert (controller.batch_size, controller.concurrency) == (100, 1)
+
+    _batch(controller, clock, latency=0.1, errors=5)
+    assert (controller.batch_size, controller.concurrency) == (50, 1)
+
+
+def test_rate_controller_honors_the_ops_ceiling() -> None:
+    clock = FakeClock()
+    controller = _controller(clock, max_ops_per_second=100.0, batch_size=50, max_batch_size=50)
+
+    for _ in range(4):
+        _batch(controller, clock, latency=0.0)
+
+    assert clock.slept == [0.5, 0.5, 0.5]
+    assert controller.rate == pytest.approx(200 / 1.5)
+    clock.now += 60
+    assert controller.rate == 0.0
@@ -16,6 +16,7 @@ SCHEMA_SPEC = SchemaSpec(
     schema_id=SCHEMA_ID,
     latest_version=LATEST_VERSION,
     description="Example CRM customer schema.",
+    fields=("customer_id", "full_name", "age", "contact"),
 )
 
 
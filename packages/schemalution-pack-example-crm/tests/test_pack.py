@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from schemalution_core import MigrationRegistry, UpcastContext, upcast
+from schemalution_core import MigrationRegistry, RegistrySnapshot, UpcastContext, upcast
 from schemalution_pack_example_crm import LATEST_VERSION, SCHEMA_ID, register
 
 
@@ -98,3 +98,13 @@ def test_v1_preserves_existing_contact_email() -> None:
 
     assert result["contact"]["primary"]["email"] == "primary@example.com"
     assert result["email"] == "legacy@example.com"
+
+
+def test_registry_snapshot_ships_pack_as_module_reference_and_ops() -> None:
+    record = {"schema_version": 1, "customerId": "c-5", "name": "Lin", "age": "30"}
+    by_module = RegistrySnapshot.from_pack_modules(["schemalution_pack_example_crm"])
+    by_edges = RegistrySnapshot.from_registry(_setup_registry())
+
+    for snapshot in (by_module, by_edges):
+        registry = RegistrySnapshot.from_bytes(snapshot.to_bytes()).to_registry()
+        assert upcast(record, SCHEMA_ID, registry) == upcast(record, SCHEMA_ID, _setup_registry())
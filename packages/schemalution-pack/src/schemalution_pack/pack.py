@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Iterable, Mapping
 from dataclasses import dataclass, field
 from typing import Any, Protocol
 
@@ -12,6 +12,10 @@ MigrationFn = (
     Callable[[Mapping[str, Any]], dict[str, Any]]
     | Callable[[Mapping[str, Any], UpcastContext | None], dict[str, Any]]
 )
+MigrationList = list[tuple[int, int, MigrationFn]]
+# A migration list, or a factory building it; factories let lazy registration skip the
+# construction of migrations for schemas a process never uses.
+Migrations = MigrationList | Callable[[], MigrationList]
 
 
 @dataclass(frozen=True, slots=True)
@@ -20,6 +24,8 @@ class SchemaSpec:
     latest_version: int
     min_supported_version: int | None = None
     description: str | None = None
+    # Top-level fields of the latest shape; registers a slotted record class for as_record.
+    fields: tuple[str, ...] | None = None
 
 
 class Pack(Protocol):
@@ -38,32 +44,64 @@ _MIN_SUPPORTED: dict[str, int] = {}
 def register_schema(
     registry: MigrationRegistry,
     spec: SchemaSpec,
-    migrations: list[tuple[int, int, MigrationFn]],
+    migrations: Migrations,
+    *,
+    lazy: bool = False,
+    edges: Iterable[tuple[int, int]] | None = None,
 ) -> None:
-    registry.set_latest_version(spec.schema_id, spec.latest_version)
-    for from_version, to_version, fn in migrations:
-        registry.register_migration(spec.schema_id, from_version, to_version, fn)
+    """Register spec and its migrations, or with lazy=True only declare them.
+
+    Lazy schemas are materialized on first use (see MigrationRegistry.declare_schema).
+    edges lets list_migrations() answer without building a migration factory; it defaults
+    to the edges of a migration list. spec.fields, when set, is registered eagerly with
+    MigrationRegistry.set_record_fields.
+    """
     if spec.min_supported_version is not None:
         _MIN_SUPPORTED[spec.schema_id] = spec.min_supported_version
+    if spec.fields is not None:
+        registry.set_record_fields(spec.schema_id, spec.fields)
+    if not lazy:
+        registry.set_latest_version(spec.schema_id, spec.latest_version)
+        _register_migrations(registry, spec.schema_id, migrations)
+        return
+    if edges is None and not callable(migrations):
+        edges = [(from_version, to_version) for from_version, to_version, _ in migrations]
+
+    def load(target: MigrationRegistry) -> None:
+        _register_migrations(target, spec.schema_id, migrations)
+
+    registry.declare_schema(spec.schema_id, spec.latest_version, load, edges=edges)
+
+
+def _register_migrations(
+    registry: MigrationRegistry, schema_id: str, migrations: Migrations
+) -> None:
+    for from_version, to_version, fn in migrations() if callable(migrations) else migrations:
+        registry.register_migration(schema_id, from_version, to_version, fn)
 
 
 @dataclass(slots=True)
 class BasePack:
+    """Pack of schemas; with lazy=True, register() only declares them (see register_schema)."""
+
     pack_id: str
-    _entries: list[tuple[SchemaSpec, list[tuple[int, int, MigrationFn]]]] = field(
+    lazy: bool = False
+    _entries: list[tuple[SchemaSpec, Migrations, tuple[tuple[int, int], ...] | None]] = field(
         default_factory=list
     )
 
     def add_schema(
         self,
         spec: SchemaSpec,
-        migrations: list[tuple[int, int, MigrationFn]],
+        migrations: Migrations,
+        *,
+        edges: Iterable[tuple[int, int]] | None = None,
     ) -> None:
-        self._entries.append((spec, migrations))
+        self._entries.append((spec, migrations, None if edges is None else tuple(edges)))
 
     def schemas(self) -> list[SchemaSpec]:
-        return [spec for spec, _ in self._entries]
+        return [spec for spec, _, _ in self._entries]
 
     def register(self, registry: MigrationRegistry) -> None:
-        for spec, migrations in self._entries:
-            register_schema(registry, spec, migrations)
+        for spec, migrations, edges in self._entries:
+            register_schema(registry, spec, migrations, lazy=self.lazy, edges=edges)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any
 
-from schemalution_core import MigrationRegistry, upcast
+from schemalution_core import MigrationRegistry, upcast, upcast_to_latest
 from schemalution_pack import BasePack, SchemaSpec, register_schema
 
 
@@ -38,3 +38,54 @@ def test_basepack_registers_all_schemas() -> None:
     result = upcast({"schema_version": 1, "value": "ok"}, "example.first", registry, 2)
     assert result["schema_version"] == 2
     assert result["value"] == "ok"
+
+
+def test_lazy_basepack_builds_migrations_on_first_use() -> None:
+    registry = MigrationRegistry()
+    built: list[str] = []
+
+    def migrations(name: str) -> list[tuple[int, int, Any]]:
+        built.append(name)
+        return [(1, 2, _noop)]
+
+    pack = BasePack("example", lazy=True)
+    pack.add_schema(
+        SchemaSpec(schema_id="example.first", latest_version=2),
+        lambda: migrations("first"),
+        edges=[(1, 2)],
+    )
+    pack.add_schema(SchemaSpec(schema_id="example.second", latest_version=2), [(1, 2, _noop)])
+    pack.register(registry)
+
+    assert registry.schema_ids() == ["example.first", "example.second"]
+    assert [(edge.schema_id, edge.to_version) for edge in registry.list_migrations()] == [
+        ("example.first", 2),
+        ("example.second", 2),
+    ]
+    assert built == []
+
+    result = upcast({"schema_version": 1, "value": "ok"}, "example.first", registry, 2)
+
+    assert result == {"schema_version": 2, "value": "ok"}
+    assert built == ["first"]
+
+
+def test_register_schema_accepts_a_migration_factory() -> None:
+    registry = MigrationRegistry()
+
+    register_schema(registry, SchemaSpec("example.schema", 2), lambda: [(1, 2, _noop)])
+
+    assert registry.edge("example.schema", 1, 2) is not None
+
+
+def test_schema_spec_fields_register_a_record_class() -> None:
+    registry = MigrationRegistry()
+    spec = SchemaSpec(schema_id="example.schema", latest_version=2, fields=("value",))
+
+    register_schema(registry, spec, lambda: [(1, 2, _noop)], lazy=True)
+
+    assert registry.record_class("example.schema")._fields == ("schema_version", "value")
+    result = upcast_to_latest(
+        {"schema_version": 1, "value": "ok"}, "example.schema", registry, as_record=True
+    )
+    assert result == {"schema_version": 2, "value": "ok"}
@@ -2,21 +2,29 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any
 
-from schemalution_core import MigrationRegistry
+from schemalution_core import MigrationRegistry, RegistrySnapshot
 
 from .json import upcast_record_to_latest_json
 
 
+@lru_cache(maxsize=8)
+def _executor_registry(payload: bytes) -> MigrationRegistry:
+    # Rebuilt once per executor process and snapshot, then reused for every row.
+    return RegistrySnapshot.from_bytes(payload).to_registry()
+
+
 def make_upcast_to_latest_json_udf(
     schema_id: str,
-    registry: MigrationRegistry,
+    registry: MigrationRegistry | RegistrySnapshot,
 ) -> Any:
     """Return a Spark UDF that upcasts records to latest JSON.
 
-    The registry is captured in the closure; for large production jobs,
-    consider broadcasting it to executors.
+    The registry is shipped to executors as a RegistrySnapshot (op data and function
+    references) and rebuilt once per executor process. Registries holding closures or
+    lambdas cannot be snapshotted and are captured in the UDF closure instead.
     """
 
     try:
@@ -28,7 +36,18 @@ def make_upcast_to_latest_json_udf(
             "with the pyspark extra (e.g. `pip install schemalution-spark[spark]`)."
         ) from exc
 
+    captured: MigrationRegistry | None = None
+    payload = b""
+    if isinstance(registry, RegistrySnapshot):
+        payload = registry.to_bytes()
+    else:
+        try:
+            payload = RegistrySnapshot.from_registry(registry).to_bytes()
+        except ValueError:
+            captured = registry
+
     def _apply(record: Any) -> str:
-        return upcast_record_to_latest_json(record, schema_id, registry)
+        active = captured if captured is not None else _executor_registry(payload)
+        return upcast_record_to_latest_json(record, schema_id, active)
 
     return udf(_apply, StringType())